@@ -10,21 +10,22 @@ from datetime import datetime, timedelta
 import threading
 import time
 
+from signal_store import signal_store
+from pnl_engine import pnl_pips
+
 class AdvancedSignalAnalytics:
-    def __init__(self):
-        self.signals_file = "advanced_signals.json"
+    def __init__(self, store=None):
+        # Signals and outcomes live in the SQLite store; only the small stats
+        # summary is still written as JSON for the control panel
+        self.store = store or signal_store
         self.performance_file = "performance_stats.json"
         self.load_data()
         self.lock = threading.Lock()
         
     def load_data(self):
         """Load existing data"""
-        # Load signals
-        if os.path.exists(self.signals_file):
-            with open(self.signals_file, 'r') as f:
-                self.signals = json.load(f)
-        else:
-            self.signals = []
+        # Running pip totals for the profit factor
+        self.winning_pips, self.losing_pips = self.store.pnl_totals()
             
         # Load performance stats
         if os.path.exists(self.performance_file):
@@ -45,9 +46,7 @@ class AdvancedSignalAnalytics:
             }
     
     def save_data(self):
-        """Save all data"""
-        with open(self.signals_file, 'w') as f:
-            json.dump(self.signals, f, indent=2)
+        """Save the stats summary; signals are written to the store as they happen"""
         with open(self.performance_file, 'w') as f:
             json.dump(self.stats, f, indent=2)
     
@@ -55,7 +54,6 @@ class AdvancedSignalAnalytics:
         """Add a new signal with enhanced data"""
         with self.lock:
             signal = {
-                'id': len(self.signals) + 1,
                 'symbol': symbol,
                 'side': side.lower(),
                 'entry_price': float(entry_price),
@@ -65,10 +63,6 @@ class AdvancedSignalAnalytics:
                 'confidence': float(confidence),
                 'timestamp': datetime.now().isoformat(),
                 'status': 'active',
-                'outcome': None,
-                'exit_price': None,
-                'pnl_pips': None,
-                'duration_minutes': None,
                 'risk_reward_ratio': None,
                 'market_condition': self._analyze_market_condition(symbol, entry_price)
             }
@@ -83,7 +77,7 @@ class AdvancedSignalAnalytics:
             
             signal['risk_reward_ratio'] = round(reward_pips / risk_pips, 2) if risk_pips > 0 else 0
             
-            self.signals.append(signal)
+            signal['id'] = self.store.add_signal(signal)
             self.stats['total_signals'] += 1
             self.save_data()
             
@@ -110,52 +104,57 @@ class AdvancedSignalAnalytics:
     def update_signal_outcome(self, signal_id, outcome, exit_price, current_price=None):
         """Update signal outcome with enhanced analytics"""
         with self.lock:
-            for signal in self.signals:
-                if signal['id'] == signal_id and signal['status'] == 'active':
-                    signal['status'] = 'closed'
-                    signal['outcome'] = outcome
-                    signal['exit_price'] = float(exit_price)
-                    
-                    # Calculate duration
-                    start_time = datetime.fromisoformat(signal['timestamp'])
-                    signal['duration_minutes'] = int((datetime.now() - start_time).total_seconds() / 60)
-                    
-                    # Calculate P&L in pips
-                    if signal['side'] == 'buy':
-                        pnl = (signal['exit_price'] - signal['entry_price']) * 10000
-                    else:
-                        pnl = (signal['entry_price'] - signal['exit_price']) * 10000
-                    
-                    signal['pnl_pips'] = round(pnl, 1)
-                    
-                    # Update global stats
-                    if outcome in ['tp_hit', 'manual_profit']:
-                        self.stats['winning_signals'] += 1
-                        if signal['pnl_pips'] > self.stats['best_trade_pips']:
-                            self.stats['best_trade_pips'] = signal['pnl_pips']
-                    else:
-                        self.stats['losing_signals'] += 1
-                        if signal['pnl_pips'] < self.stats['worst_trade_pips']:
-                            self.stats['worst_trade_pips'] = signal['pnl_pips']
-                    
-                    self.stats['total_pips'] += signal['pnl_pips']
-                    self._update_performance_metrics()
-                    self.save_data()
-                    
-                    # Print outcome
-                    status_emoji = {
-                        'tp_hit': '🎯',
-                        'sl_hit': '❌', 
-                        'manual_profit': '💰',
-                        'manual_loss': '⏹️'
-                    }.get(outcome, '📊')
-                    
-                    print(f"{status_emoji} SIGNAL #{signal_id} CLOSED:")
-                    print(f"   Outcome: {outcome.upper()} | P&L: {pnl:+.1f} pips")
-                    print(f"   Duration: {signal['duration_minutes']} minutes")
-                    print(f"   Updated Win Rate: {self.stats['win_rate']:.1f}%")
-                    
-                    return signal
+            signal = self.store.get_signal(signal_id)
+            if signal is not None and signal['status'] == 'active':
+                signal['status'] = 'closed'
+                signal['outcome'] = outcome
+                signal['exit_price'] = float(exit_price)
+                
+                # Calculate duration
+                start_time = datetime.fromisoformat(signal['timestamp'])
+                signal['duration_minutes'] = int((datetime.now() - start_time).total_seconds() / 60)
+                
+                # Calculate P&L in the symbol's pips, same as the scanner's exit log
+                pnl = pnl_pips(signal['symbol'], signal['side'], signal['entry_price'], signal['exit_price'])
+                
+                signal['pnl_pips'] = round(pnl, 1)
+                if not self.store.record_outcome(signal_id, outcome, signal['exit_price'], signal['pnl_pips'],
+                                                 signal['duration_minutes'], datetime.now().isoformat()):
+                    print(f"❌ Signal #{signal_id} not found or already closed")
+                    return None
+                
+                # Update global stats
+                if outcome in ['tp_hit', 'manual_profit', 'trailed_profit']:
+                    self.stats['winning_signals'] += 1
+                    if signal['pnl_pips'] > self.stats['best_trade_pips']:
+                        self.stats['best_trade_pips'] = signal['pnl_pips']
+                else:
+                    self.stats['losing_signals'] += 1
+                    if signal['pnl_pips'] < self.stats['worst_trade_pips']:
+                        self.stats['worst_trade_pips'] = signal['pnl_pips']
+                if signal['pnl_pips'] > 0:
+                    self.winning_pips += signal['pnl_pips']
+                else:
+                    self.losing_pips -= signal['pnl_pips']
+                
+                self.stats['total_pips'] += signal['pnl_pips']
+                self._update_performance_metrics()
+                self.save_data()
+                
+                # Print outcome
+                status_emoji = {
+                    'tp_hit': '🎯',
+                    'sl_hit': '❌', 
+                    'manual_profit': '💰',
+                    'manual_loss': '⏹️'
+                }.get(outcome, '📊')
+                
+                print(f"{status_emoji} SIGNAL #{signal_id} CLOSED:")
+                print(f"   Outcome: {outcome.upper()} | P&L: {pnl:+.1f} pips")
+                print(f"   Duration: {signal['duration_minutes']} minutes")
+                print(f"   Updated Win Rate: {self.stats['win_rate']:.1f}%")
+                
+                return signal
             
             print(f"❌ Signal #{signal_id} not found or already closed")
             return None
@@ -169,24 +168,18 @@ class AdvancedSignalAnalytics:
             self.stats['win_rate'] = (self.stats['winning_signals'] / closed) * 100
             self.stats['avg_pips_per_trade'] = self.stats['total_pips'] / closed
         
-        # Calculate profit factor
-        winning_pips = sum([s['pnl_pips'] for s in self.signals 
-                           if s.get('pnl_pips', 0) > 0 and s['status'] == 'closed'])
-        losing_pips = abs(sum([s['pnl_pips'] for s in self.signals 
-                              if s.get('pnl_pips', 0) < 0 and s['status'] == 'closed']))
-        
-        self.stats['profit_factor'] = (winning_pips / losing_pips) if losing_pips > 0 else 0
+        # Calculate profit factor from the running totals
+        self.stats['profit_factor'] = (self.winning_pips / self.losing_pips) if self.losing_pips > 0 else 0
         self.stats['last_updated'] = datetime.now().isoformat()
     
     def get_performance_report(self):
         """Generate comprehensive performance report"""
-        closed_signals = [s for s in self.signals if s['status'] == 'closed']
-        active_signals = [s for s in self.signals if s['status'] == 'active']
+        closed_count = self.store.count('closed')
+        active_count = self.store.count('active')
         
         # Recent performance (last 24 hours)
         recent_cutoff = datetime.now() - timedelta(hours=24)
-        recent_signals = [s for s in closed_signals 
-                         if datetime.fromisoformat(s['timestamp']) > recent_cutoff]
+        recent_signals = self.store.signals(status='closed', since=recent_cutoff.isoformat())
         
         report = f"""
 🎯 BITCOIN SIGNAL ANALYTICS REPORT
@@ -194,8 +187,8 @@ class AdvancedSignalAnalytics:
 
 📊 OVERALL PERFORMANCE:
 • Total Signals Generated: {self.stats['total_signals']}
-• Closed Signals: {len(closed_signals)}
-• Active Signals: {len(active_signals)}
+• Closed Signals: {closed_count}
+• Active Signals: {active_count}
 • Win Rate: {self.stats['win_rate']:.1f}%
 • Total P&L: {self.stats['total_pips']:+.1f} pips
 • Average per Trade: {self.stats['avg_pips_per_trade']:+.1f} pips
@@ -207,24 +200,19 @@ class AdvancedSignalAnalytics:
 
 ⚡ RECENT PERFORMANCE (24h):
 • Recent Signals: {len(recent_signals)}
-• Recent P&L: {sum([s.get('pnl_pips', 0) for s in recent_signals]):+.1f} pips
+• Recent P&L: {sum([s.get('pnl_pips') or 0 for s in recent_signals]):+.1f} pips
 
 🔥 ACTIVE SIGNALS:
 """
         
-        for signal in active_signals[-5:]:  # Show last 5 active
+        for signal in reversed(self.store.signals(status='active', limit=5, newest_first=True)):  # Show last 5 active
             report += f"• #{signal['id']}: {signal['side'].upper()} {signal['symbol']} @ {signal['entry_price']}\n"
         
         return report
     
     def get_signal_by_entry_price(self, symbol, entry_price, tolerance=0.1):
         """Find signal by entry price (for automated tracking)"""
-        for signal in self.signals:
-            if (signal['symbol'] == symbol and 
-                signal['status'] == 'active' and
-                abs(signal['entry_price'] - entry_price) < tolerance):
-                return signal['id']
-        return None
+        return self.store.find_active(symbol, entry_price, tolerance)
 
 # Demo usage function
 def demo_usage():
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Analysis Memoization
+Skips feature and signal recomputation for a (symbol, timeframe) until a bar
+closes or the in-progress bar changes, so higher timeframes cost almost
+nothing between bar closes
+"""
+
+import logging
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def memo_key(df: pd.DataFrame) -> Optional[Tuple]:
+    """(last closed bar time, in-progress bar hash); the frame's last row is the
+    bar still forming"""
+    if df is None or len(df) == 0:
+        return None
+    time_column = 'open_time' if 'open_time' in df.columns else 'time' if 'time' in df.columns else None
+    times = df[time_column].values if time_column else df.index.values
+    last_closed = times[-2] if len(df) > 1 else None
+    in_progress = df.iloc[-1]
+    return last_closed, hash(tuple(float(in_progress[f]) for f in IN_PROGRESS_FIELDS if f in df.columns))
+
+
+class AnalysisMemo:
+    def __init__(self):
+        self.keys: Dict[Tuple[str, Hashable], Tuple] = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def unchanged(self, symbol: str, tf: Hashable, df: pd.DataFrame) -> bool:
+        """True when the frame matches the last one analysed for (symbol, tf);
+        otherwise records it as the new reference and returns False"""
+        key = memo_key(df)
+        with self.lock:
+            if key is not None and self.keys.get((symbol, tf)) == key:
+                self.stats['hits'] += 1
+                return True
+            self.keys[(symbol, tf)] = key
+            self.stats['misses'] += 1
+            return False
+
+    def invalidate(self, symbol: str = None):
+        with self.lock:
+            if symbol is None:
+                self.keys.clear()
+            else:
+                self.keys = {k: v for k, v in self.keys.items() if k[0] != symbol}
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            total = self.stats['hits'] + self.stats['misses']
+            return dict(self.stats, hit_rate=round(self.stats['hits'] / total, 3) if total else None)
+
+
+# Global analysis memo instance
+analysis_memo = AnalysisMemo()
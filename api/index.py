@@ -1,5 +1,6 @@
 from flask import Flask, jsonify, request
-import requests
+import os
+import sys
 import json
 from datetime import datetime
 import random
@@ -15,6 +16,13 @@ try:
 except ImportError:
     talib = None
 
+# Shared bot modules live in the repository root, one level above api/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_transport import http_get, http_post
+from source_router import SourceRouter
+from quote_cache import QuoteCache
+from feature_engine import get_features
+
 app = Flask(__name__)
 
 # Environment variables (will be set in Vercel)
@@ -44,7 +52,7 @@ def send_telegram_alert_to_users(message, chat_ids=None):
                 'text': message,
                 'parse_mode': 'Markdown'
             }
-            response = requests.post(url, data=data, timeout=10)
+            response = http_post(url, data=data, timeout=10)
             if response.status_code == 200:
                 success_count += 1
                 print(f"✅ Message sent to {chat_id}")
@@ -77,50 +85,36 @@ def initialize_mt5():
         return False
 
 def get_mt5_professional_data(symbol, timeframe='M5', count=100):
-    """Get REAL professional market data from multiple sources - PRIORITIZE MT5 FIRST"""
-    real_data_found = False
-    
+    """Get REAL professional market data, shared by concurrent requests for the same symbol"""
+    return quote_cache.get_or_fetch(('market', symbol, timeframe, count),
+                                    lambda: load_professional_data(symbol, timeframe, count))
+
+def load_professional_data(symbol, timeframe='M5', count=100):
+    """Fetch market data from the fastest healthy source - MT5, Alpha Vantage, Yahoo.
+    Returns (data, source name) for the quote cache."""
     try:
-        # 🥇 FIRST PRIORITY: MT5 Real Data (Most Accurate)
-        if mt5:
-            mt5_data = get_mt5_real_data(symbol, timeframe, count)
-            if mt5_data and mt5_data.get('real_data'):
-                print(f"✅ REAL MT5 data for {symbol}")
-                return mt5_data
-        
-        # 🥈 SECOND PRIORITY: Alpha Vantage for REAL forex data
-        if symbol in ['XAUUSD', 'BTCUSD']:  # ONLY BTC and GOLD
-            real_data = get_alpha_vantage_real_data(symbol)
-            if real_data:
-                print(f"✅ REAL Alpha Vantage data for {symbol}")
-                return real_data
-        
-        # 🥉 THIRD PRIORITY: Yahoo Finance for REAL data
-        # 🥉 THIRD PRIORITY: Yahoo Finance for REAL data
-        yahoo_data = get_yahoo_finance_real_data(symbol)
-        if yahoo_data:
-            print(f"✅ REAL Yahoo Finance data for {symbol}")
-            return yahoo_data
+        real_data, source = data_router.fetch(symbol, timeframe, count)
+        if real_data:
+            print(f"✅ REAL {source} data for {symbol}")
+            return real_data, source
         
         # ❌ FALLBACK: Enhanced simulation if NO real data found
         print(f"❌ NO REAL DATA for {symbol} - using enhanced simulation")
         simulation_data = get_enhanced_professional_data(symbol)
         simulation_data['real_data'] = False
         simulation_data['source'] = 'Enhanced Simulation (NO REAL DATA)'
-        return simulation_data
+        return simulation_data, 'Simulation'
         
     except Exception as e:
         print(f"❌ Real data error for {symbol}: {e}")
         simulation_data = get_enhanced_professional_data(symbol)
         simulation_data['real_data'] = False
         simulation_data['source'] = 'Fallback Simulation'
-        return simulation_data
+        return simulation_data, 'Simulation'
 
 def get_alpha_vantage_real_data(symbol):
     """Get REAL-TIME forex data from Alpha Vantage API - FORCE REAL DATA"""
     try:
-        import requests
-        
         # Use FREE Alpha Vantage API
         API_KEY = "demo"  # Free tier
         
@@ -133,7 +127,7 @@ def get_alpha_vantage_real_data(symbol):
             url = f"https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency={base_currency}&to_currency={quote_currency}&apikey={API_KEY}"
             
             print(f"📡 Fetching REAL data for {symbol} from Alpha Vantage...")
-            response = requests.get(url, timeout=15)
+            response = http_get(url, timeout=15)
             
             if response.status_code == 200:
                 data = response.json()
@@ -187,8 +181,6 @@ def get_alpha_vantage_real_data(symbol):
 def get_yahoo_finance_real_data(symbol):
     """Get REAL-TIME market data from Yahoo Finance - FORCE REAL DATA"""
     try:
-        import requests
-        
         # Yahoo Finance symbol mapping for REAL data
         yahoo_symbols = {
             'EURUSD': 'EURUSD=X',
@@ -210,7 +202,7 @@ def get_yahoo_finance_real_data(symbol):
             url = f"https://query1.finance.yahoo.com/v8/finance/chart/{yahoo_symbol}"
             
             print(f"📡 Fetching REAL data for {symbol} ({yahoo_symbol}) from Yahoo Finance...")
-            response = requests.get(url, timeout=15, headers={
+            response = http_get(url, timeout=15, headers={
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
             })
             
@@ -345,6 +337,25 @@ def get_mt5_real_data(symbol, timeframe='M5', count=100):
         print(f"MT5 real data error: {e}")
         return None
 
+# Real data sources, tried fastest-healthy-first; a source that keeps failing is
+# skipped until a background probe sees it recover
+data_router = SourceRouter()
+if mt5:
+    data_router.register('MT5', lambda symbol, timeframe, count: get_mt5_real_data(symbol, timeframe, count))
+data_router.register('Alpha Vantage', lambda symbol, timeframe, count: get_alpha_vantage_real_data(symbol),
+                     supports=lambda symbol: symbol in ['XAUUSD', 'BTCUSD'])  # ONLY BTC and GOLD
+data_router.register('Yahoo Finance', lambda symbol, timeframe, count: get_yahoo_finance_real_data(symbol))
+
+# Market data is reused for a few seconds per source (Alpha Vantage's free tier
+# is heavily rate limited) and concurrent requests for a symbol share one fetch
+quote_cache = QuoteCache(default_ttl=5, source_ttls={
+    'MT5': 1,
+    'Alpha Vantage': 60,
+    'Yahoo Finance': 15,
+    'Simulation': 5,
+    'Status': 60
+})
+
 def get_enhanced_professional_data(symbol):
     """Enhanced professional simulation with market hours and real price movements"""
     import random
@@ -524,7 +535,8 @@ def calculate_real_technical_indicators(data, symbol):
             
             # Calculate REAL RSI using TA-Lib or manual calculation
             if talib is not None:
-                # Professional TA-Lib indicators
+                # Professional TA-Lib indicators (Wilder RSI, BBANDS(5)) - these
+                # definitions differ from the feature engine's and are kept as is
                 rsi = talib.RSI(df['close'].values, timeperiod=14)[-1]
                 macd, macd_signal, macd_hist = talib.MACD(df['close'].values)
                 bb_upper, bb_middle, bb_lower = talib.BBANDS(df['close'].values)
@@ -562,9 +574,10 @@ def calculate_real_technical_indicators(data, symbol):
                     rs = avg_gain / avg_loss
                     rsi = 100 - (100 / (1 + rs))
                 
-                # Simple moving average for trend
-                sma_20 = np.mean(closes[-20:])
-                sma_50 = np.mean(closes[-50:]) if len(closes) >= 50 else sma_20
+                # Moving averages for trend from the shared feature engine
+                features = get_features(symbol, 'api', df)
+                sma_20 = features['ma20']
+                sma_50 = features['ma50'] if len(closes) >= 50 else sma_20
                 
                 signal_strength = 0.8 if abs(rsi - 50) > 20 else 0.6
                 market_condition = 'trending' if sma_20 > sma_50 else 'ranging'
@@ -811,10 +824,8 @@ def generate_mt5_professional_signal(symbol, data):
         print(f"REAL signal generation error: {e}")
         return None
 
-@app.route('/api/status')
-def status():
-    """Health check endpoint with real-time data source status"""
-    # Test data sources
+def check_data_sources():
+    """Probe each data source once - cached by the status endpoint"""
     data_sources = {}
     
     # Test Alpha Vantage
@@ -838,12 +849,21 @@ def status():
     except:
         data_sources['MetaTrader 5'] = '❌ Error'
     
+    return data_sources, 'Status'
+
+@app.route('/api/status')
+def status():
+    """Health check endpoint with real-time data source status"""
+    data_sources = quote_cache.get_or_fetch('status', check_data_sources)
+    
     return jsonify({
         'status': 'online',
         'message': 'Real-Time Trading Bot API is running',
         'timestamp': datetime.now().isoformat(),
         'version': '2.1-REAL-DATA',
         'data_sources': data_sources,
+        'source_health': data_router.get_stats(),
+        'quote_cache': quote_cache.get_stats(),
         'signal_generators': {
             '3-minute': 'Running',
             '5-minute': 'Running', 
@@ -887,7 +907,8 @@ def get_signals():
         for timeframe in timeframes:
             for symbol in symbols:
                 # Get ENHANCED professional data with REAL market sources
-                market_data = get_enhanced_professional_data(symbol)  # Remove timeframe parameter
+                market_data = quote_cache.get_or_fetch(
+                    ('enhanced', symbol), lambda: (get_enhanced_professional_data(symbol), 'Simulation'))
                 
                 if market_data:
                     # Generate REAL signal with accurate technical analysis
@@ -1175,15 +1196,13 @@ def start_15min():
 @app.route('/api/start-all-live')
 def start_all_live():
     """Start all live signal generators"""
-    import requests
-    
     try:
         # Start all timeframe generators
         base_url = request.host_url
         
-        r1 = requests.get(f"{base_url}api/start-3min")
-        r2 = requests.get(f"{base_url}api/start-5min") 
-        r3 = requests.get(f"{base_url}api/start-15min")
+        r1 = http_get(f"{base_url}api/start-3min")
+        r2 = http_get(f"{base_url}api/start-5min") 
+        r3 = http_get(f"{base_url}api/start-15min")
         
         return jsonify({
             'success': True,
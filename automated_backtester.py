@@ -13,6 +13,8 @@ from itertools import product
 import os
 from concurrent.futures import ThreadPoolExecutor
 import copy
+from bar_store import bar_store
+from pnl_engine import pnl_pips
 
 logger = logging.getLogger(__name__)
 
@@ -121,9 +123,57 @@ class AutomatedBacktester:
         
         return None
     
+    def get_market_history(self, signal, tf_minutes=1):
+        """Stored bars from the signal time onwards (zero-copy from the local bar store)"""
+        try:
+            start = int(datetime.fromisoformat(signal["timestamp"]).timestamp() * 1000)
+        except (KeyError, TypeError, ValueError):
+            return None
+        bars = bar_store.read(signal.get("symbol"), tf_minutes, start_time=start)
+        return bars if len(bars) else None
+    
+    def resolve_signal_outcome(self, signal, market_data):
+        """Replay stored bars to find whether TP or SL was touched first"""
+        tp = signal.get("tp")
+        if isinstance(tp, (list, tuple)):
+            tp = tp[0] if tp else None
+        sl = signal.get("sl")
+        entry = signal.get("entry")
+        if market_data is None or tp is None or sl is None or entry is None:
+            return None
+        
+        if signal.get("side") == "buy":
+            tp_hits = np.flatnonzero(market_data["high"] >= tp)
+            sl_hits = np.flatnonzero(market_data["low"] <= sl)
+        else:
+            tp_hits = np.flatnonzero(market_data["low"] <= tp)
+            sl_hits = np.flatnonzero(market_data["high"] >= sl)
+        first_tp = tp_hits[0] if len(tp_hits) else None
+        first_sl = sl_hits[0] if len(sl_hits) else None
+        if first_tp is None and first_sl is None:
+            return None
+        
+        # Both inside one bar: assume the stop was hit first
+        if first_sl is not None and (first_tp is None or first_sl <= first_tp):
+            outcome, exit_price, index = "sl_hit", sl, first_sl
+        else:
+            outcome, exit_price, index = "tp_hit", tp, first_tp
+        return {
+            "outcome": outcome,
+            # Same pip units as the simulated outcomes it is summed with
+            "pips": pnl_pips(signal.get("symbol"), signal.get("side"), entry, exit_price),
+            "probability_used": signal.get("tp_probability", 50) / 100,
+            "exit_time": datetime.fromtimestamp(int(market_data["open_time"][index]) / 1000)
+        }
+    
     def simulate_signal_outcome(self, signal, market_data=None):
         """Simulate the outcome of a signal based on probability"""
         try:
+            # Replay real bars when the store covers the signal
+            resolved = self.resolve_signal_outcome(signal, market_data)
+            if resolved:
+                return resolved
+            
             # Use probability to determine outcome
             tp_prob = signal.get("tp_probability", 50) / 100
             
@@ -233,7 +283,7 @@ class AutomatedBacktester:
                 daily_signal_count[signal_date] = daily_count + 1
                 
                 # Simulate the trade
-                outcome = self.simulate_signal_outcome(signal)
+                outcome = self.simulate_signal_outcome(signal, self.get_market_history(signal))
                 
                 trade_result = {
                     "signal": signal,
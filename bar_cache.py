@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Incremental OHLCV Bar Cache
+Keeps kline history in memory per (symbol, timeframe) and only asks the data
+source for bars newer than the last closed bar
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class BarCache:
+    def __init__(self, fetcher: Callable, max_bars: int = 500, page_size: int = 1000, store=None):
+        """fetcher(symbol, tf_minutes, bars, start_time=None, end_time=None) must return
+        a DataFrame with an 'open_time' column in milliseconds (Binance layout).
+        page_size is the provider's per-request kline limit (1000 on Binance).
+        store is an optional BarStore: cold caches are seeded from it and closed
+        bars are persisted to it, so restarts only fetch what is missing."""
+        self.fetcher = fetcher
+        self.max_bars = max_bars
+        self.page_size = page_size
+        self.store = store
+        self.frames: Dict[Tuple[str, int], pd.DataFrame] = {}
+        self.persisted: Dict[Tuple[str, int], Optional[int]] = {}  # last stored open_time
+        self.lock = threading.Lock()
+        self.key_locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self.stats = {
+            'full_fetches': 0,
+            'incremental_fetches': 0,
+            'bars_received': 0,
+            'warm_starts': 0
+        }
+
+    def _key_lock(self, key: Tuple[str, int]) -> threading.Lock:
+        with self.lock:
+            if key not in self.key_locks:
+                self.key_locks[key] = threading.Lock()
+            return self.key_locks[key]
+
+    def _count(self, name: str, n: int = 1):
+        # Fetches run on worker threads, so counters are updated under the cache lock
+        with self.lock:
+            self.stats[name] += n
+
+    def get_bars(self, symbol: str, tf_minutes: int, bars: int) -> Optional[pd.DataFrame]:
+        """Return the latest `bars` bars, fetching only what changed since the last call"""
+        key = (symbol, tf_minutes)
+        with self._key_lock(key):
+            cached = self.frames.get(key)
+            if cached is None and self.store is not None:
+                cached = self._warm_start(symbol, tf_minutes, bars)
+
+            if cached is None or len(cached) < bars:
+                frame = self._full_fetch(symbol, tf_minutes, bars)
+            else:
+                frame = self._incremental_fetch(symbol, tf_minutes, bars, cached)
+
+            if frame is None or len(frame) == 0:
+                return None
+
+            self.frames[key] = frame.tail(max(bars, self.max_bars)).reset_index(drop=True)
+            if self.store is not None:
+                self._persist(key, frame)
+            return self.frames[key].tail(bars).reset_index(drop=True)
+
+    def _persist(self, key: Tuple[str, int], frame: pd.DataFrame):
+        """Append only the bars that closed since the last persisted one; the last
+        row is the in-progress bar and is written once it has closed"""
+        symbol, tf_minutes = key
+        try:
+            if key not in self.persisted:
+                self.persisted[key] = self.store.last_time(symbol, tf_minutes)
+            last = self.persisted[key]
+            closed = frame.iloc[:-1]
+            if last is not None:
+                closed = closed[closed['open_time'] > last]
+            if len(closed) == 0:
+                return
+            self.store.append(symbol, tf_minutes, closed)
+            self.persisted[key] = self.store.last_time(symbol, tf_minutes)
+        except Exception as e:
+            logger.warning(f"Bar store append failed for {symbol} {tf_minutes}m: {e}")
+
+    def _warm_start(self, symbol: str, tf_minutes: int, bars: int) -> Optional[pd.DataFrame]:
+        """Seed a cold cache from the on-disk store; the incremental fetch fills the rest"""
+        try:
+            stored = self.store.read_frame(symbol, tf_minutes, last=max(bars, self.max_bars))
+        except Exception as e:
+            logger.warning(f"Bar store read failed for {symbol} {tf_minutes}m: {e}")
+            return None
+        if stored is None or len(stored) < bars:
+            return None
+        self._count('warm_starts')
+        return stored
+
+    def _full_fetch(self, symbol: str, tf_minutes: int, bars: int) -> Optional[pd.DataFrame]:
+        data = self.fetcher(symbol, tf_minutes, min(bars, self.page_size))
+        self._count('full_fetches')
+        if data is None or len(data) == 0:
+            return data
+        self._count('bars_received', len(data))
+
+        # Windows larger than one page are filled by walking backwards with end_time
+        pages = [data]
+        fetched = len(data)
+        while fetched < bars:
+            oldest = int(pages[0]['open_time'].iloc[0])
+            limit = min(bars - fetched, self.page_size)
+            page = self.fetcher(symbol, tf_minutes, limit, end_time=oldest - 1)
+            if page is None or len(page) == 0:
+                break
+            self._count('bars_received', len(page))
+            pages.insert(0, page)
+            fetched += len(page)
+            if len(page) < limit:
+                break  # reached the start of the provider's history
+
+        if len(pages) == 1:
+            return data
+        return pd.concat(pages, ignore_index=True)
+
+    def _incremental_fetch(self, symbol: str, tf_minutes: int, bars: int,
+                           cached: pd.DataFrame) -> Optional[pd.DataFrame]:
+        # The last cached bar is the in-progress one - refetch from it so it is
+        # replaced in place and any bars that closed since are appended
+        since = int(cached['open_time'].iloc[-1])
+        limit = min(bars, self.page_size)
+        new_bars = self.fetcher(symbol, tf_minutes, limit, start_time=since)
+        self._count('incremental_fetches')
+
+        if new_bars is None:
+            return None
+        if len(new_bars) == 0:
+            return cached  # nothing new yet - the cached bars are still current
+
+        self._count('bars_received', len(new_bars))
+
+        # A full page means we may have missed bars after it - resync from scratch
+        if len(new_bars) >= limit:
+            logger.info(f"Bar cache gap for {symbol} {tf_minutes}m - refetching full window")
+            return self._full_fetch(symbol, tf_minutes, bars)
+
+        first_new = int(new_bars['open_time'].iloc[0])
+        kept = cached[cached['open_time'] < first_new]
+        return pd.concat([kept, new_bars], ignore_index=True)
+
+    def get_history(self, symbol: str, tf_minutes: int) -> Optional[pd.DataFrame]:
+        """Full cached history (up to max_bars) without touching the data source"""
+        return self.frames.get((symbol, tf_minutes))
+
+    def invalidate(self, symbol: str = None, tf_minutes: int = None):
+        """Drop cached history (all, per symbol, or per symbol/timeframe)"""
+        with self.lock:
+            for key in list(self.frames):
+                if symbol is not None and key[0] != symbol:
+                    continue
+                if tf_minutes is not None and key[1] != tf_minutes:
+                    continue
+                del self.frames[key]
+                self.persisted.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        """Fetch statistics for monitoring"""
+        with self.lock:
+            return dict(self.stats, cached_series=len(self.frames))
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Bar-Close Event Scheduler
+Wakes the scanner for each (symbol, timeframe) exactly when its bar closes and
+whenever price crosses a watched level, with a fixed-interval scan kept as a
+fallback, instead of re-evaluating everything on a fixed polling cadence
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+BAR_CLOSE_DELAY = float(os.getenv('BAR_CLOSE_DELAY', 1.0))  # let the exchange finalise the bar
+LEVEL_POLL_INTERVAL = float(os.getenv('LEVEL_POLL_INTERVAL', 5.0))
+
+BAR_CLOSE = 'bar_close'
+LEVEL_CROSS = 'level_cross'
+FALLBACK = 'fallback'
+
+ScanEvent = namedtuple('ScanEvent', ['symbol', 'tf', 'reason', 'detail'])
+
+
+class BarScheduler:
+    def __init__(self, symbols: Iterable[str], timeframes: Dict[str, float], fallback_interval: float = 60,
+                 close_delay: float = BAR_CLOSE_DELAY, clock: Callable[[], float] = time.time):
+        """timeframes maps tf name to bar length in minutes; bars close on multiples
+        of their length since the epoch"""
+        self.symbols = list(symbols)
+        self.timeframes = dict(timeframes)
+        self.fallback_interval = fallback_interval
+        self.close_delay = close_delay
+        self.clock = clock
+        self.levels: Dict[str, Dict[str, float]] = {}  # symbol -> {name: price}
+        self.last_prices: Dict[str, float] = {}
+        self.triggered: List[ScanEvent] = []
+        self.last_fallback = clock()
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.poller = None
+        self.stats = {BAR_CLOSE: 0, LEVEL_CROSS: 0, FALLBACK: 0, 'polls': 0}
+
+    def watch_levels(self, symbol: str, levels: Dict[str, float]):
+        """Replace the intrabar trigger levels for a symbol"""
+        with self.condition:
+            self.levels[symbol] = {name: price for name, price in levels.items() if price}
+
+    def on_price(self, symbol: str, price: float):
+        """Feed a price tick; crossing a watched level wakes the scanner"""
+        with self.condition:
+            previous = self.last_prices.get(symbol)
+            self.last_prices[symbol] = price
+            if previous is None or previous == price:
+                return
+            low, high = min(previous, price), max(previous, price)
+            crossed = [name for name, level in self.levels.get(symbol, {}).items() if low < level <= high]
+            if crossed:
+                self.triggered.extend(ScanEvent(symbol, None, LEVEL_CROSS, name) for name in crossed)
+                self.condition.notify_all()
+
+    def on_quote(self, symbol: str, quote: Dict):
+        """price_bus subscriber"""
+        self.on_price(symbol, quote['price'])
+
+    def start_price_poll(self, fetch: Callable[[str], Optional[float]], interval: float = LEVEL_POLL_INTERVAL):
+        """Poll fetch(symbol) for every symbol with watched levels in a background
+        thread, so level crosses fire while the scanner waits even when no price
+        stream is publishing ticks"""
+        if self.poller is not None:
+            return
+
+        def poll():
+            while True:
+                with self.condition:
+                    if self.stopped:
+                        return
+                    symbols = [symbol for symbol, levels in self.levels.items() if levels]
+                for symbol in symbols:
+                    try:
+                        price = fetch(symbol)
+                    except Exception as e:
+                        logger.warning(f"Level poll price error for {symbol}: {e}")
+                        continue
+                    if price:
+                        self.on_price(symbol, price)
+                with self.condition:
+                    self.stats['polls'] += 1
+                    if not self.stopped:
+                        self.condition.wait(interval)
+
+        self.poller = threading.Thread(target=poll, daemon=True, name='level-poll')
+        self.poller.start()
+
+    def next_bar_close(self, now: Optional[float] = None):
+        """(time, [tfs]) of the next bar close across all timeframes"""
+        now = self.clock() if now is None else now
+        closes = {}
+        for tf, minutes in self.timeframes.items():
+            period = minutes * 60
+            close = (math.floor((now - self.close_delay) / period) + 1) * period + self.close_delay
+            closes.setdefault(close, []).append(tf)
+        at = min(closes)
+        return at, closes[at]
+
+    def wait_for_events(self, timeout: Optional[float] = None) -> List[ScanEvent]:
+        """Block until a bar closes, a level is crossed or the fallback interval
+        passes; returns the events that are due, or [] after `timeout` seconds"""
+        with self.condition:
+            close_at, closing = self.next_bar_close()
+            wake_by = self.clock() + timeout if timeout is not None else float('inf')
+            while not self.stopped:
+                if self.triggered:
+                    events, self.triggered = self.triggered, []
+                    break
+                now = self.clock()
+                if now >= close_at:
+                    events = [ScanEvent(symbol, tf, BAR_CLOSE, None) for symbol in self.symbols for tf in closing]
+                    break
+                if now - self.last_fallback >= self.fallback_interval:
+                    events = [ScanEvent(symbol, None, FALLBACK, None) for symbol in self.symbols]
+                    break
+                if now >= wake_by:
+                    return []
+                self.condition.wait(min(close_at, self.last_fallback + self.fallback_interval, wake_by) - now)
+            else:
+                return []
+            self.last_fallback = self.clock()
+            for event in events:
+                self.stats[event.reason] += 1
+        return events
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def get_stats(self) -> Dict:
+        with self.condition:
+            return dict(self.stats, watched_levels=sum(len(v) for v in self.levels.values()))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped Bar Store
+Append-only columnar history on local disk, one fixed-width record file per
+(symbol, timeframe), read back zero-copy through numpy memmaps
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+BAR_DTYPE = np.dtype([
+    ('open_time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8')
+])
+BAR_STORE_DIR = os.getenv('BAR_STORE_DIR', 'market_data')
+
+
+class BarStore:
+    def __init__(self, root: str = BAR_STORE_DIR):
+        self.root = root
+        self.lock = threading.Lock()
+        self.key_locks: Dict[Tuple[str, int], threading.Lock] = {}
+        self.maps: Dict[Tuple[str, int], np.memmap] = {}
+        self.stats = {'appended': 0, 'reads': 0}
+
+    def path(self, symbol: str, tf_minutes: int) -> str:
+        return os.path.join(self.root, f"{symbol}_{tf_minutes}m.bars")
+
+    def _key_lock(self, key: Tuple[str, int]) -> threading.Lock:
+        with self.lock:
+            if key not in self.key_locks:
+                self.key_locks[key] = threading.Lock()
+            return self.key_locks[key]
+
+    def _records(self, symbol: str, tf_minutes: int) -> np.ndarray:
+        """Memmap of every stored record, remapped only when the file has grown"""
+        key = (symbol, tf_minutes)
+        path = self.path(symbol, tf_minutes)
+        try:
+            count = os.path.getsize(path) // BAR_DTYPE.itemsize
+        except OSError:
+            return np.empty(0, dtype=BAR_DTYPE)
+        if count == 0:
+            return np.empty(0, dtype=BAR_DTYPE)
+        records = self.maps.get(key)
+        if records is None or len(records) != count:
+            records = np.memmap(path, dtype=BAR_DTYPE, mode='r', shape=(count,))
+            self.maps[key] = records
+        return records
+
+    def count(self, symbol: str, tf_minutes: int) -> int:
+        return len(self._records(symbol, tf_minutes))
+
+    def last_time(self, symbol: str, tf_minutes: int) -> Optional[int]:
+        """open_time of the newest stored bar"""
+        records = self._records(symbol, tf_minutes)
+        return int(records['open_time'][-1]) if len(records) else None
+
+    def append(self, symbol: str, tf_minutes: int, bars, now_ms: Optional[int] = None) -> int:
+        """Append closed bars newer than the last stored one; returns the count written.
+
+        bars may be a DataFrame or anything indexable by the BAR_DTYPE field names.
+        Bars still in progress at now_ms are skipped so the file only holds final values."""
+        if bars is None or len(bars) == 0:
+            return 0
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        key = (symbol, tf_minutes)
+        with self._key_lock(key):
+            open_time = np.asarray(bars['open_time'], dtype=np.int64)
+            last = self.last_time(symbol, tf_minutes)
+            mask = open_time + tf_minutes * 60_000 <= now_ms
+            if last is not None:
+                mask &= open_time > last
+            if not mask.any():
+                return 0
+
+            records = np.empty(int(mask.sum()), dtype=BAR_DTYPE)
+            for field in BAR_DTYPE.names:
+                records[field] = np.asarray(bars[field])[mask]
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.path(symbol, tf_minutes), 'ab') as f:
+                f.write(records.tobytes())
+            self.stats['appended'] += len(records)
+            return len(records)
+
+    def read(self, symbol: str, tf_minutes: int, start_time: Optional[int] = None,
+             end_time: Optional[int] = None, last: Optional[int] = None) -> np.ndarray:
+        """Zero-copy record slice with start_time <= open_time <= end_time (ms),
+        optionally limited to the newest `last` bars"""
+        records = self._records(symbol, tf_minutes)
+        self.stats['reads'] += 1
+        if len(records) == 0:
+            return records
+        times = records['open_time']
+        lo = 0 if start_time is None else int(np.searchsorted(times, start_time, side='left'))
+        hi = len(records) if end_time is None else int(np.searchsorted(times, end_time, side='right'))
+        if last is not None:
+            lo = max(lo, hi - last)
+        return records[lo:hi]
+
+    def read_frame(self, symbol: str, tf_minutes: int, start_time: Optional[int] = None,
+                   end_time: Optional[int] = None, last: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """Same as read() as a DataFrame in the scanner's kline layout"""
+        records = self.read(symbol, tf_minutes, start_time, end_time, last)
+        if len(records) == 0:
+            return None
+        df = pd.DataFrame({field: records[field] for field in BAR_DTYPE.names})
+        df['close_time'] = df['open_time'] + tf_minutes * 60_000 - 1
+        return df
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, open_series=len(self.maps))
+
+
+# Global bar store instance
+bar_store = BarStore()
+
+
+def _is_recent(df: Optional[pd.DataFrame], tf_minutes: int, now_ms: int) -> bool:
+    return df is not None and int(df['open_time'].iloc[-1]) + 2 * tf_minutes * 60_000 >= now_ms
+
+
+def load_recent_bars(symbol: str, tf_minutes: int, bars: int,
+                     base_tf_minutes: int = 1) -> Optional[pd.DataFrame]:
+    """Helper function for the newest `bars` bars from disk. Timeframes that are not
+    stored themselves are derived from the base series. Returns None when the store
+    cannot serve them up to date, so callers fall back to the network."""
+    from timeframe_resampler import resample_bars
+    now_ms = int(time.time() * 1000)
+    df = bar_store.read_frame(symbol, tf_minutes, last=bars)
+    if _is_recent(df, tf_minutes, now_ms) and len(df) >= bars:
+        return df
+    if tf_minutes > base_tf_minutes and tf_minutes % base_tf_minutes == 0:
+        base = bar_store.read_frame(symbol, base_tf_minutes,
+                                    last=(bars + 1) * tf_minutes // base_tf_minutes)
+        if _is_recent(base, base_tf_minutes, now_ms):
+            derived = resample_bars(base, tf_minutes, base_tf_minutes)
+            if len(derived) >= bars:
+                return derived.tail(bars).reset_index(drop=True)
+    return None
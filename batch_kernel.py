@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Batched Multi-Symbol Indicator Kernel
+Computes the signal-gating features (MA crossover, RSI, ATR and proximity to
+support/resistance) for every symbol of one timeframe in a single vectorized
+call on (symbols x bars) matrices, so only symbols that pass the gates go on
+to the per-signal pipeline
+"""
+
+import logging
+from typing import Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from feature_engine import SR_WINDOW
+
+logger = logging.getLogger(__name__)
+
+# The longest window (MA50) plus one bar for the first price change / true range
+KERNEL_BARS = 51
+GATE_PROXIMITY = 0.03
+
+
+def stack_frames(frames: Sequence[pd.DataFrame], bars: int = KERNEL_BARS) -> Dict[str, np.ndarray]:
+    """Right-align the last `bars` rows of each frame into (symbols x bars) close,
+    high and low matrices; shorter histories are NaN-padded on the left"""
+    matrices = {name: np.full((len(frames), bars), np.nan) for name in ('close', 'high', 'low')}
+    for row, df in enumerate(frames):
+        tail = df.iloc[-bars:]
+        for name, matrix in matrices.items():
+            matrix[row, bars - len(tail):] = tail[name].values
+    return matrices
+
+
+def _mean_last(matrix: np.ndarray, n: int) -> np.ndarray:
+    # Any NaN in the window (history too short) makes the result NaN
+    return matrix[:, -n:].mean(axis=1)
+
+
+def compute_gate_features(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Dict[str, np.ndarray]:
+    """Latest gating features per row, with the same definitions as
+    feature_engine.compute_features"""
+    prev_close = np.concatenate((np.full((len(close), 1), np.nan), close[:, :-1]), axis=1)
+
+    # RSI with simple 14-bar averages; the first bar of each history has zero change
+    delta = close - prev_close
+    delta[np.isnan(prev_close) & ~np.isnan(close)] = 0.0
+    avg_gain = _mean_last(np.maximum(delta, 0.0), 14)  # np.maximum keeps padding NaN
+    avg_loss = _mean_last(np.maximum(-delta, 0.0), 14)
+    rsi = 100 - (100 / (1 + avg_gain / (avg_loss + 1e-9)))
+
+    # True range; fmax skips the missing previous close of the first bar
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+    return {
+        'close': close[:, -1],
+        'ma20': _mean_last(close, 20),
+        'ma50': _mean_last(close, 50),
+        'rsi14': rsi,
+        'atr14': _mean_last(true_range, 14),
+        'support': low[:, -SR_WINDOW:].min(axis=1),
+        'resistance': high[:, -SR_WINDOW:].max(axis=1)
+    }
+
+
+def evaluate_gates(features: Dict[str, np.ndarray], proximity: float = GATE_PROXIMITY) -> Dict[str, np.ndarray]:
+    """Boolean bullish/bearish gate per row: MA trend and RSI agree and price is
+    within `proximity` of support (bullish) or resistance (bearish)"""
+    close = features['close']
+    with np.errstate(invalid='ignore'):
+        bullish = ((features['ma20'] > features['ma50']) & (features['rsi14'] > 50)
+                   & (np.abs(close - features['support']) < close * proximity))
+        bearish = (~bullish & (features['ma20'] < features['ma50']) & (features['rsi14'] < 50)
+                   & (np.abs(close - features['resistance']) < close * proximity))
+    return {'bullish': bullish, 'bearish': bearish, 'passed': bullish | bearish}
+
+
+def gate_frames(frames: Sequence[pd.DataFrame], proximity: float = GATE_PROXIMITY) -> List[bool]:
+    """Helper function: which frames of one timeframe pass the signal gates"""
+    if not frames:
+        return []
+    matrices = stack_frames(frames)
+    features = compute_gate_features(matrices['close'], matrices['high'], matrices['low'])
+    return evaluate_gates(features, proximity)['passed'].tolist()
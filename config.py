@@ -35,12 +35,15 @@ LOG_LEVEL = 'INFO'
 # Additional config for smc_utils.py compatibility
 EMA_PERIOD = 20
 SYMBOL_SETTINGS = {
-    'BTCUSD': {'min_tp': 200, 'min_sl': 50, 'atr_multiplier_sl': 2.0, 'atr_multiplier_tp': 4.0, 'max_sl_distance': 300, 'min_tp_distance': 200},
-    'ETHUSD': {'min_tp': 80, 'min_sl': 40, 'atr_multiplier_sl': 2.0, 'atr_multiplier_tp': 3.0, 'max_sl_distance': 160, 'min_tp_distance': 80},
-    'EURUSD': {'min_tp': 30, 'min_sl': 15, 'atr_multiplier_sl': 1.5, 'atr_multiplier_tp': 2.0, 'max_sl_distance': 60, 'min_tp_distance': 30},
-    'GBPUSD': {'min_tp': 30, 'min_sl': 15, 'atr_multiplier_sl': 1.5, 'atr_multiplier_tp': 2.0, 'max_sl_distance': 60, 'min_tp_distance': 30},
-    'USDJPY': {'min_tp': 20, 'min_sl': 10, 'atr_multiplier_sl': 1.2, 'atr_multiplier_tp': 1.8, 'max_sl_distance': 40, 'min_tp_distance': 20},
-    'XAUUSD': {'min_tp': 100, 'min_sl': 25, 'atr_multiplier_sl': 1.8, 'atr_multiplier_tp': 3.5, 'max_sl_distance': 200, 'min_tp_distance': 100}
+    'BTCUSD': {'min_tp': 200, 'min_sl': 50, 'atr_multiplier_sl': 2.0, 'atr_multiplier_tp': 4.0, 'max_sl_distance': 300, 'min_tp_distance': 200, 'point': 1.0},
+    'ETHUSD': {'min_tp': 80, 'min_sl': 40, 'atr_multiplier_sl': 2.0, 'atr_multiplier_tp': 3.0, 'max_sl_distance': 160, 'min_tp_distance': 80, 'point': 0.1},
+    'EURUSD': {'min_tp': 30, 'min_sl': 15, 'atr_multiplier_sl': 1.5, 'atr_multiplier_tp': 2.0, 'max_sl_distance': 60, 'min_tp_distance': 30, 'point': 0.0001},
+    'GBPUSD': {'min_tp': 30, 'min_sl': 15, 'atr_multiplier_sl': 1.5, 'atr_multiplier_tp': 2.0, 'max_sl_distance': 60, 'min_tp_distance': 30, 'point': 0.0001},
+    'USDJPY': {'min_tp': 20, 'min_sl': 10, 'atr_multiplier_sl': 1.2, 'atr_multiplier_tp': 1.8, 'max_sl_distance': 40, 'min_tp_distance': 20, 'point': 0.01},
+    'XAUUSD': {'min_tp': 100, 'min_sl': 25, 'atr_multiplier_sl': 1.8, 'atr_multiplier_tp': 3.5, 'max_sl_distance': 200, 'min_tp_distance': 100, 'point': 0.1},
+    # Indices keep the default TP/SL sizing and quote P&L in index points
+    'US30': {'atr_multiplier_sl': 1.0, 'atr_multiplier_tp': 1.5, 'max_sl_distance': 100, 'min_tp_distance': 50, 'point': 1.0},
+    'NAS100': {'atr_multiplier_sl': 1.0, 'atr_multiplier_tp': 1.5, 'max_sl_distance': 100, 'min_tp_distance': 50, 'point': 1.0}
 }
 
 # Telegram configuration for telegram_utils.py
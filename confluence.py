@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Multi-Timeframe Confluence Evaluator
+Evaluates all timeframes of a symbol together and merges agreeing signals into
+one ranked signal with per-timeframe evidence, so one move runs the delivery
+pipeline once instead of once per timeframe
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TF_MINUTES = {"M1": 1, "M3": 3, "M5": 5, "M15": 15, "M30": 30, "H1": 60, "H4": 240, "D1": 1440}
+EVIDENCE_FIELDS = ('side', 'entry', 'sl', 'tp', 'confidence', 'atr', 'support', 'resistance')
+# A candidate stays evidence while its bar is in progress and for about one bar
+# after it, so a timeframe that stops being scanned (failed or deferred fetch)
+# cannot keep supporting or vetoing signals
+MAX_EVIDENCE_AGE_BARS = 2
+
+
+def tf_weight(tf: str) -> float:
+    """Higher timeframes carry more weight"""
+    return 1 + math.log10(TF_MINUTES.get(tf, 1))
+
+
+class ConfluenceEvaluator:
+    def __init__(self):
+        # Latest candidate per (symbol, tf) with the open time (ms) of the bar it
+        # came from, so a timeframe skipped this scan because its bars did not
+        # change still counts as evidence until it goes stale
+        self.latest: Dict[tuple, Tuple[int, Optional[Dict]]] = {}
+        self.lock = threading.Lock()
+        self.stats = {'candidates': 0, 'merged_signals': 0, 'expired': 0}
+
+    def evaluate(self, symbol: str, fresh: Dict[str, List[Dict]], bar_times: Optional[Dict[str, int]] = None,
+                 now_ms: Optional[int] = None) -> List[Dict]:
+        """Merge this scan's candidates ({tf: [signals]}) per side with the latest
+        candidates of the symbol's other timeframes.
+
+        bar_times gives the open time of the bar each fresh timeframe was evaluated
+        on (defaults to now). Stored candidates older than MAX_EVIDENCE_AGE_BARS of
+        their timeframe are evicted. Returns one signal per side that has a fresh
+        candidate, ranked by score. The highest contributing timeframe's signal is
+        the base; the other timeframes are attached as evidence."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        bar_times = bar_times or {}
+        with self.lock:
+            for tf, signals in fresh.items():
+                self.latest[(symbol, tf)] = (bar_times.get(tf, now_ms), signals[0] if signals else None)
+            known = {}
+            for (sym, tf), (bar_time, signal) in list(self.latest.items()):
+                if sym != symbol:
+                    continue
+                if now_ms - bar_time > MAX_EVIDENCE_AGE_BARS * TF_MINUTES.get(tf, 1) * 60_000:
+                    del self.latest[(sym, tf)]
+                    self.stats['expired'] += 1
+                elif signal:
+                    known[tf] = signal
+
+        merged = []
+        for side in {signal['side'] for signals in fresh.values() for signal in signals}:
+            agreeing = {tf: s for tf, s in known.items() if s['side'] == side}
+            opposing = {tf: s for tf, s in known.items() if s['side'] != side}
+            fresh_tfs = [tf for tf, signals in fresh.items() if any(s['side'] == side for s in signals)]
+            base_tf = max(fresh_tfs, key=lambda tf: TF_MINUTES.get(tf, 0))
+            base = dict(next(s for s in fresh[base_tf] if s['side'] == side))
+
+            total = sum(tf_weight(tf) for tf in known) or 1.0
+            score = (sum(tf_weight(tf) for tf in agreeing) - sum(tf_weight(tf) for tf in opposing)) / total
+            base['confluence_score'] = round(score, 3)
+            base['confluence'] = {
+                'timeframes': sorted(agreeing, key=lambda tf: TF_MINUTES.get(tf, 0)),
+                'opposing_timeframes': sorted(opposing, key=lambda tf: TF_MINUTES.get(tf, 0)),
+                'evidence': {tf: {f: s.get(f) for f in EVIDENCE_FIELDS}
+                             for tf, s in {**agreeing, **opposing}.items()}
+            }
+            merged.append(base)
+
+        merged.sort(key=lambda s: s['confluence_score'], reverse=True)
+        with self.lock:
+            self.stats['candidates'] += sum(len(signals) for signals in fresh.values())
+            self.stats['merged_signals'] += len(merged)
+        for signal in merged:
+            if len(signal['confluence']['timeframes']) > 1:
+                logger.info(f"🧩 CONFLUENCE: {symbol} {signal['side'].upper()} on "
+                            f"{', '.join(signal['confluence']['timeframes'])} (score {signal['confluence_score']})")
+        return merged
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats)
+
+
+# Global confluence evaluator instance
+confluence_evaluator = ConfluenceEvaluator()
@@ -12,6 +12,7 @@ from datetime import datetime, timedelta
 import json
 import os
 from mt5_data import fetch_market_data
+from bar_store import load_recent_bars
 
 logger = logging.getLogger(__name__)
 
@@ -53,8 +54,13 @@ class MarketCorrelationAnalyzer:
         """Calculate correlation between two symbols"""
         try:
             # Fetch data for both symbols
-            df1 = fetch_market_data(symbol1, timeframe, periods)
-            df2 = fetch_market_data(symbol2, timeframe, periods)
+            # Local history first, network only for what the store can't serve
+            df1 = load_recent_bars(symbol1, timeframe, periods)
+            if df1 is None:
+                df1 = fetch_market_data(symbol1, timeframe, periods)
+            df2 = load_recent_bars(symbol2, timeframe, periods)
+            if df2 is None:
+                df2 = fetch_market_data(symbol2, timeframe, periods)
             
             if df1 is None or df2 is None or len(df1) < 20 or len(df2) < 20:
                 return None
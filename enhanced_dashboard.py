@@ -15,6 +15,7 @@ from risk_manager import get_portfolio_risk_report
 from enhanced_session_manager import get_trading_recommendation
 from correlation_analyzer import assess_portfolio_correlation
 from performance_monitor import performance_monitor
+from signal_store import signal_store
 
 app = Flask(__name__)
 logger = logging.getLogger(__name__)
@@ -35,10 +36,7 @@ def load_trading_data():
             performance_data = performance_monitor.get_session_stats()
         
         # Load analytics data
-        analytics_data = {}
-        if os.path.exists('advanced_signals.json'):
-            with open('advanced_signals.json', 'r') as f:
-                analytics_data = json.load(f)
+        analytics_data = signal_store.signals()
         
         return {
             'trades': trades_data,
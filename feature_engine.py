@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Shared Feature Engine
+Computes the indicator set for a bar once and hands the same result to every
+consumer (scanner, smc_utils, pre-signal alerts and the API). Series are kept
+up to date incrementally with streaming indicators
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from streaming_indicators import EMA, RollingMax, RollingMean, RollingMin, RollingStd
+
+logger = logging.getLogger(__name__)
+
+FEATURES = (
+    'close', 'ma5', 'ma10', 'ma20', 'ma50', 'std10', 'high10', 'low10', 'rsi14', 'atr14',
+    'support', 'resistance', 'bb_upper', 'bb_middle', 'bb_lower',
+    'macd', 'macd_signal', 'macd_hist', 'macd_hist_std10'
+)
+SR_WINDOW = 20
+BB_WINDOW = 20
+BB_STD = 2.0
+
+
+def _mean_last(values: np.ndarray, n: int) -> float:
+    return float(values[-n:].mean()) if len(values) >= n else np.nan
+
+
+def compute_features(df: pd.DataFrame) -> Dict[str, float]:
+    """Latest value of every feature in FEATURES for an OHLC frame.
+
+    Features whose window is longer than the frame are NaN, matching the
+    pandas rolling() results they replace."""
+    close = np.asarray(df['close'], dtype=np.float64)
+    high = np.asarray(df['high'], dtype=np.float64)
+    low = np.asarray(df['low'], dtype=np.float64)
+    n = len(close)
+
+    # RSI with simple 14-bar averages; the first delta counts as zero
+    delta = np.diff(close, prepend=close[0]) if n else close
+    avg_gain = _mean_last(np.where(delta > 0, delta, 0.0), 14)
+    avg_loss = _mean_last(np.where(delta < 0, -delta, 0.0), 14)
+    rsi = 100 - (100 / (1 + avg_gain / (avg_loss + 1e-9)))
+
+    # True range; the first bar has no previous close
+    prev_close = np.concatenate(([np.nan], close[:-1])) if n else close
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+    ma20 = _mean_last(close, 20)
+    bb_dev = float(close[-BB_WINDOW:].std()) * BB_STD if n >= BB_WINDOW else np.nan
+
+    series = pd.Series(close)
+    macd_line = (series.ewm(span=12, adjust=False).mean() - series.ewm(span=26, adjust=False).mean()).values
+    macd_signal = pd.Series(macd_line).ewm(span=9, adjust=False).mean().values
+    macd_hist = macd_line - macd_signal
+
+    return {
+        'close': float(close[-1]) if n else np.nan,
+        'ma5': _mean_last(close, 5),
+        'ma10': _mean_last(close, 10),
+        'ma20': ma20,
+        'ma50': _mean_last(close, 50),
+        'std10': float(close[-10:].std()) if n >= 10 else np.nan,
+        'high10': float(high[-10:].max()) if n >= 10 else np.nan,
+        'low10': float(low[-10:].min()) if n >= 10 else np.nan,
+        'rsi14': float(rsi),
+        'atr14': _mean_last(true_range, 14),
+        'support': float(low[-SR_WINDOW:].min()) if n >= SR_WINDOW else np.nan,
+        'resistance': float(high[-SR_WINDOW:].max()) if n >= SR_WINDOW else np.nan,
+        'bb_upper': ma20 + bb_dev,
+        'bb_middle': ma20,
+        'bb_lower': ma20 - bb_dev,
+        'macd': float(macd_line[-1]) if n else np.nan,
+        'macd_signal': float(macd_signal[-1]) if n else np.nan,
+        'macd_hist': float(macd_hist[-1]) if n else np.nan,
+        'macd_hist_std10': float(np.std(macd_hist[-10:])) if n else np.nan
+    }
+
+
+class StreamingFeatures:
+    """The FEATURES set maintained incrementally: each new or revised bar costs
+    O(1) instead of a pass over the whole window"""
+
+    def __init__(self):
+        self.bar_time = None
+        self.prev_close = None  # close of the last committed bar
+        self.pending_close = None
+        self.means = {n: RollingMean(n) for n in (5, 10, 20, 50)}
+        self.gain = RollingMean(14)
+        self.loss = RollingMean(14)
+        self.true_range = RollingMean(14)
+        self.std10 = RollingStd(10)
+        self.std_bb = RollingStd(BB_WINDOW)
+        self.high10 = RollingMax(10)
+        self.low10 = RollingMin(10)
+        self.resistance = RollingMax(SR_WINDOW)
+        self.support = RollingMin(SR_WINDOW)
+        self.ema12 = EMA(12)
+        self.ema26 = EMA(26)
+        self.macd_signal = EMA(9)
+        self.macd_hist_std = RollingStd(10)
+
+    def indicators(self) -> Dict:
+        named = {f'ma{n}': ind for n, ind in self.means.items()}
+        named.update({
+            'gain': self.gain, 'loss': self.loss, 'true_range': self.true_range,
+            'std10': self.std10, 'std_bb': self.std_bb, 'high10': self.high10, 'low10': self.low10,
+            'resistance': self.resistance, 'support': self.support, 'ema12': self.ema12,
+            'ema26': self.ema26, 'macd_signal': self.macd_signal, 'macd_hist_std': self.macd_hist_std
+        })
+        return named
+
+    def update(self, bar_time, high: float, low: float, close: float):
+        """Add a new bar or revise the in-progress one"""
+        if self.bar_time is not None and bar_time != self.bar_time:
+            self.prev_close = self.pending_close
+        self.bar_time = bar_time
+        self.pending_close = close
+
+        # The first bar has no previous close: zero change, true range is high - low
+        change = 0.0 if self.prev_close is None else close - self.prev_close
+        true_range = high - low if self.prev_close is None else max(
+            high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+        for indicator in self.means.values():
+            indicator.update(bar_time, close)
+        self.gain.update(bar_time, max(change, 0.0))
+        self.loss.update(bar_time, max(-change, 0.0))
+        self.true_range.update(bar_time, true_range)
+        self.std10.update(bar_time, close)
+        self.std_bb.update(bar_time, close)
+        self.high10.update(bar_time, high)
+        self.low10.update(bar_time, low)
+        self.resistance.update(bar_time, high)
+        self.support.update(bar_time, low)
+        macd = self.ema12.update(bar_time, close) - self.ema26.update(bar_time, close)
+        self.macd_hist_std.update(bar_time, macd - self.macd_signal.update(bar_time, macd))
+
+    def features(self) -> Dict[str, float]:
+        ma20 = self.means[20].value
+        bb_dev = self.std_bb.value * BB_STD
+        avg_gain, avg_loss = self.gain.value, self.loss.value
+        macd = self.ema12.value - self.ema26.value
+        return {
+            'close': self.pending_close,
+            'ma5': self.means[5].value,
+            'ma10': self.means[10].value,
+            'ma20': ma20,
+            'ma50': self.means[50].value,
+            'std10': self.std10.value,
+            'high10': self.high10.value,
+            'low10': self.low10.value,
+            'rsi14': 100 - (100 / (1 + avg_gain / (avg_loss + 1e-9))),
+            'atr14': self.true_range.value,
+            'support': self.support.value,
+            'resistance': self.resistance.value,
+            'bb_upper': ma20 + bb_dev,
+            'bb_middle': ma20,
+            'bb_lower': ma20 - bb_dev,
+            'macd': macd,
+            'macd_signal': self.macd_signal.value,
+            'macd_hist': macd - self.macd_signal.value,
+            'macd_hist_std10': self.macd_hist_std.value
+        }
+
+    def snapshot(self) -> Dict:
+        return {'bar_time': self.bar_time, 'prev_close': self.prev_close,
+                'pending_close': self.pending_close,
+                'indicators': {name: ind.snapshot() for name, ind in self.indicators().items()}}
+
+    def restore(self, snapshot: Dict):
+        self.bar_time = snapshot['bar_time']
+        self.prev_close = snapshot['prev_close']
+        self.pending_close = snapshot['pending_close']
+        for name, indicator in self.indicators().items():
+            indicator.restore(snapshot['indicators'][name])
+        return self
+
+
+def _bar_times(df: pd.DataFrame) -> Optional[np.ndarray]:
+    for column in ('open_time', 'time'):
+        if column in df.columns:
+            times = df[column].values
+            return times.astype('datetime64[ms]').astype(np.int64) if times.dtype.kind == 'M' else times
+    return None
+
+
+def bar_key(df: pd.DataFrame) -> Tuple:
+    """Identifies the exact bars a frame holds, including in-progress revisions"""
+    time_column = 'open_time' if 'open_time' in df.columns else 'time' if 'time' in df.columns else None
+    times = df[time_column].values if time_column else df.index.values
+    return (len(df), times[0], times[-1], float(df['close'].iat[-1]),
+            float(df['high'].iat[-1]), float(df['low'].iat[-1]))
+
+
+class FeatureEngine:
+    def __init__(self):
+        self.latest: Dict[Tuple[str, Hashable], Tuple[Tuple, Dict]] = {}
+        self.streams: Dict[Tuple[str, Hashable], StreamingFeatures] = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'computed': 0, 'incremental': 0, 'rebuilt': 0}
+
+    def get_features(self, symbol: str, tf: Hashable, df: pd.DataFrame) -> Optional[Dict[str, float]]:
+        """Feature dict for the frame's latest bar, computed once per (symbol, tf, bar).
+        The returned dict is shared between consumers and must not be modified."""
+        if df is None or len(df) == 0:
+            return None
+        key = bar_key(df)
+        with self.lock:
+            cached = self.latest.get((symbol, tf))
+            if cached is not None and cached[0] == key:
+                self.stats['hits'] += 1
+                return cached[1]
+            features = self._advance(symbol, tf, df)
+            self.latest[(symbol, tf)] = (key, features)
+            self.stats['computed'] += 1
+        return features
+
+    def _advance(self, symbol: str, tf: Hashable, df: pd.DataFrame) -> Dict[str, float]:
+        """Feed only the revised in-progress bar and anything newer into the stream;
+        frames that don't continue the stream rebuild it"""
+        times = _bar_times(df)
+        if times is None:
+            return compute_features(df)
+        stream = self.streams.get((symbol, tf))
+        start = None
+        if stream is not None and stream.bar_time is not None:
+            start = int(np.searchsorted(times, stream.bar_time))
+            if start >= len(times) or times[start] != stream.bar_time:
+                start = None
+        if start is None:
+            stream = StreamingFeatures()
+            self.streams[(symbol, tf)] = stream
+            start = 0
+            self.stats['rebuilt'] += 1
+        else:
+            self.stats['incremental'] += 1
+
+        high = df['high'].values
+        low = df['low'].values
+        close = df['close'].values
+        for i in range(start, len(times)):
+            stream.update(times[i].item(), float(high[i]), float(low[i]), float(close[i]))
+        return stream.features()
+
+    def save_state(self, path: str):
+        """Persist streaming indicator state so a restart resumes incrementally"""
+        with self.lock:
+            state = [{'symbol': symbol, 'tf': tf, 'stream': stream.snapshot()}
+                     for (symbol, tf), stream in self.streams.items()]
+        with open(path, 'w') as f:
+            json.dump(state, f)
+
+    def load_state(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r') as f:
+                state = json.load(f)
+            with self.lock:
+                for entry in state:
+                    self.streams[(entry['symbol'], entry['tf'])] = StreamingFeatures().restore(entry['stream'])
+            return True
+        except Exception as e:
+            logger.warning(f"Could not restore indicator state: {e}")
+            return False
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats, series=len(self.latest))
+
+
+# Global feature engine instance
+feature_engine = FeatureEngine()
+
+
+def get_features(symbol: str, tf: Hashable, df: pd.DataFrame) -> Optional[Dict[str, float]]:
+    """Helper function for the shared per-bar feature set"""
+    return feature_engine.get_features(symbol, tf, df)
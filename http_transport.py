@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP Transport
+One keep-alive connection pool per host with default timeouts, retry/backoff
+and per-host concurrency limits for every outbound call the bot makes
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', 10))
+DEFAULT_RETRIES = int(os.getenv('HTTP_RETRIES', 2))
+DEFAULT_BACKOFF = float(os.getenv('HTTP_BACKOFF', 0.5))
+DEFAULT_MAX_PER_HOST = int(os.getenv('HTTP_MAX_PER_HOST', 8))
+
+
+class HttpTransport:
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, max_per_host: int = DEFAULT_MAX_PER_HOST):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_per_host = max_per_host
+        self.host_settings: Dict[str, Dict] = {}
+        self.sessions: Dict[str, requests.Session] = {}
+        self.semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self.lock = threading.Lock()
+        self.headers = {'User-Agent': 'TradingBot/1.0'}
+
+    def configure_host(self, host: str, timeout: Optional[float] = None,
+                       max_concurrency: Optional[int] = None, retries: Optional[int] = None):
+        """Override defaults for one host (must be called before its first request)"""
+        settings = self.host_settings.setdefault(host, {})
+        if timeout is not None:
+            settings['timeout'] = timeout
+        if max_concurrency is not None:
+            settings['max_concurrency'] = max_concurrency
+        if retries is not None:
+            settings['retries'] = retries
+
+    def _setting(self, host: str, name: str, default):
+        return self.host_settings.get(host, {}).get(name, default)
+
+    def _pool(self, host: str):
+        with self.lock:
+            if host not in self.sessions:
+                max_concurrency = self._setting(host, 'max_concurrency', self.max_per_host)
+                # Only idempotent requests are retried automatically; connection
+                # errors are retried for every method since nothing was sent
+                retry = Retry(
+                    total=self._setting(host, 'retries', self.retries),
+                    backoff_factor=self.backoff,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET', 'HEAD']),
+                    respect_retry_after_header=True,
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency,
+                                      max_retries=retry)
+                session = requests.Session()
+                session.headers.update(self.headers)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.sessions[host] = session
+                self.semaphores[host] = threading.BoundedSemaphore(max_concurrency)
+            return self.sessions[host], self.semaphores[host]
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the host's pooled session"""
+        host = urlparse(url).netloc
+        session, semaphore = self._pool(host)
+        kwargs.setdefault('timeout', self._setting(host, 'timeout', self.timeout))
+        with semaphore:
+            return session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """Close every pooled connection"""
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+            self.semaphores.clear()
+
+
+# Global transport instance shared by all modules
+http_transport = HttpTransport()
+http_transport.configure_host('api.binance.com', max_concurrency=10)
+# telegram_utils runs its own retry loop across endpoints, so no transport retries here
+http_transport.configure_host('api.telegram.org', timeout=15, max_concurrency=4, retries=0)
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    """Helper function for pooled GET requests"""
+    return http_transport.get(url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    """Helper function for pooled POST requests"""
+    return http_transport.post(url, **kwargs)
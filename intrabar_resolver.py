@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Intrabar TP/SL Resolver
+Resolves open trades against every bar high/low range since the last check
+instead of a single sampled price, so wicks between polls are not missed and
+the order of level hits does not depend on how often the loop runs
+"""
+
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from level_index import LEVEL_PRECEDENCE, TRACKED_TPS
+
+logger = logging.getLogger(__name__)
+
+NO_HIT = -1
+
+
+def _epoch_ms(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+def first_hits(sides: np.ndarray, levels: np.ndarray, opened: np.ndarray,
+               bar_times: np.ndarray, highs: np.ndarray, lows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Earliest bar and level hit for each trade, in one pass over (trades x levels x bars).
+
+    sides is +1 for buys and -1 for sells, levels is (n, 4) in LEVEL_PRECEDENCE order
+    with NaN for missing levels, opened is each trade's open time in ms. Only bars
+    that start after a trade opened count, since an earlier part of the bar may
+    predate the entry. Returns (bar index, level index) per trade, bar index
+    NO_HIT when nothing was reached. Several levels inside one bar resolve by
+    LEVEL_PRECEDENCE, so a bar touching both SL and TP counts as a stop."""
+    buy = (sides > 0)[:, None, None]
+    stop = np.zeros(levels.shape[1], dtype=bool)
+    stop[0] = True
+    # Buy SL and sell TPs trigger on the low; buy TPs and sell SL on the high
+    falling = buy == stop[None, :, None]
+    level = levels[:, :, None]
+    touched = np.where(falling, lows[None, None, :] <= level, highs[None, None, :] >= level)
+    touched &= (bar_times[None, :] > opened[:, None])[:, None, :]
+
+    # Earliest bar first, then level precedence within the bar
+    n_levels = levels.shape[1]
+    bar_index = np.where(touched.any(axis=2), touched.argmax(axis=2), len(bar_times))
+    best_level = (bar_index * n_levels + np.arange(n_levels)).argmin(axis=1)
+    best_bar = bar_index[np.arange(len(levels)), best_level]
+    best_bar[best_bar == len(bar_times)] = NO_HIT
+    return best_bar, best_level
+
+
+class IntrabarResolver:
+    def __init__(self, bar_ms: int = 60_000):
+        """bar_ms is the duration of the bars passed to resolve()"""
+        self.bar_ms = bar_ms
+        self.last_checked: Dict[str, int] = {}  # symbol -> open time of the newest bar seen
+        self.lock = threading.Lock()
+        self.stats = {'checks': 0, 'bars': 0, 'resolved': 0}
+
+    def resolve(self, symbol: str, trades: Sequence, bars: Optional[pd.DataFrame]) -> List[Tuple[object, str, float]]:
+        """Outcomes for the trades whose levels the bars since the last check reached,
+        as (trade, 'sl_hit' | 'tpN_hit', level price) in the order they were hit.
+
+        The newest bar seen last time is checked again because it may have been
+        in progress; that is safe since a still-open trade cannot have been hit in
+        the part of the range that was already checked."""
+        if bars is None or len(bars) == 0:
+            return []
+        bar_times = bars['open_time'].to_numpy(dtype=np.int64)
+        with self.lock:
+            since = self.last_checked.get(symbol)
+            self.last_checked[symbol] = int(bar_times[-1])
+        start = int(np.searchsorted(bar_times, since)) if since is not None else 0
+        trades = [t for t in trades if t.get('status', 'open') == 'open']
+        if not trades or start >= len(bar_times):
+            return []
+
+        bar_times = bar_times[start:]
+        highs = bars['high'].to_numpy(dtype=float)[start:]
+        lows = bars['low'].to_numpy(dtype=float)[start:]
+
+        levels = np.full((len(trades), len(LEVEL_PRECEDENCE)), np.nan)
+        sides = np.empty(len(trades))
+        opened = np.empty(len(trades), dtype=np.int64)
+        for i, trade in enumerate(trades):
+            tps = trade['tp'] if isinstance(trade['tp'], (list, tuple)) else [trade['tp']]
+            row = [trade['sl']] + list(tps[:TRACKED_TPS])
+            levels[i, :len(row)] = [np.nan if v is None else v for v in row]
+            sides[i] = 1 if trade['side'] == 'buy' else -1
+            opened_at = _epoch_ms(trade.get('opened_at'))
+            # Bars are compared by open time, so a trade opened mid-bar waits for the next one
+            opened[i] = opened_at if opened_at is not None else bar_times[0] - 1
+
+        best_bar, best_level = first_hits(sides, levels, opened, bar_times, highs, lows)
+        hit = np.flatnonzero(best_bar != NO_HIT)
+        hit = hit[np.argsort(best_bar[hit], kind='stable')]
+        outcomes = [(trades[i], f"{LEVEL_PRECEDENCE[best_level[i]]}_hit", float(levels[i, best_level[i]]))
+                    for i in hit]
+
+        with self.lock:
+            self.stats['checks'] += 1
+            self.stats['bars'] += len(bar_times)
+            self.stats['resolved'] += len(outcomes)
+        return outcomes
+
+    def forget(self, symbol: str):
+        with self.lock:
+            self.last_checked.pop(symbol, None)
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats, symbols=len(self.last_checked))
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Price-Level Index for Open Trades
+Keeps every open trade's SL and TP1-TP3 trigger prices in sorted per-symbol
+arrays, so each price update finds exactly the triggered levels with a bisect
+in O(log n + hits) instead of scanning every open trade
+"""
+
+import itertools
+import logging
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Outcome precedence when one price update triggers several levels of a trade,
+# matching the order the per-trade checks used to run in
+LEVEL_PRECEDENCE = ('sl', 'tp1', 'tp2', 'tp3')
+TRACKED_TPS = 3
+
+
+class LevelIndex:
+    def __init__(self):
+        # symbol -> sorted [(price, seq, trade_id, level)]; 'falling' levels trigger
+        # when price <= level (buy SL, sell TP), 'rising' ones when price >= level
+        self.falling: Dict[str, List[Tuple]] = {}
+        self.rising: Dict[str, List[Tuple]] = {}
+        self.trades: Dict[int, Dict] = {}
+        self.entries: Dict[int, List[Tuple[str, Tuple]]] = {}  # trade_id -> [(side list, entry)]
+        self.seq = itertools.count()
+        self.lock = threading.Lock()
+
+    def add(self, trade: Dict):
+        """Index an open trade's SL and first TP levels"""
+        if trade.get('status', 'open') != 'open':
+            return
+        trade_id = id(trade)
+        tps = trade.get('tp') if isinstance(trade.get('tp'), (list, tuple)) else [trade.get('tp')]
+        levels = [('sl', trade.get('sl'))] + [(f"tp{i + 1}", tp) for i, tp in enumerate(tps[:TRACKED_TPS])]
+        buy = trade['side'] == 'buy'
+        with self.lock:
+            if trade_id in self.trades:
+                return
+            self.trades[trade_id] = trade
+            self.entries[trade_id] = []
+            for level, price in levels:
+                if price is None or price != price:
+                    continue
+                falling = (level == 'sl') == buy
+                book = (self.falling if falling else self.rising).setdefault(trade['symbol'], [])
+                entry = (price, next(self.seq), trade_id, level)
+                insort(book, entry)
+                self.entries[trade_id].append(('falling' if falling else 'rising', entry))
+
+    def remove(self, trade: Dict):
+        with self.lock:
+            self._remove(id(trade))
+
+    def _remove(self, trade_id: int):
+        trade = self.trades.pop(trade_id, None)
+        if trade is None:
+            return
+        for side, entry in self.entries.pop(trade_id):
+            book = (self.falling if side == 'falling' else self.rising)[trade['symbol']]
+            i = bisect_left(book, entry)
+            if i < len(book) and book[i] == entry:
+                del book[i]
+
+    def update(self, symbol: str, price: float) -> List[Tuple[Dict, str]]:
+        """Trades whose levels this price reaches, as (trade, 'sl_hit' | 'tpN_hit').
+        Triggered trades are removed from the index."""
+        with self.lock:
+            falling = self.falling.get(symbol, [])
+            rising = self.rising.get(symbol, [])
+            hits = falling[bisect_left(falling, (price,)):] + rising[:bisect_right(rising, (price, float('inf')))]
+            if not hits:
+                return []
+            by_trade = {}
+            for _, _, trade_id, level in hits:
+                best = by_trade.get(trade_id)
+                if best is None or LEVEL_PRECEDENCE.index(level) < LEVEL_PRECEDENCE.index(best):
+                    by_trade[trade_id] = level
+            outcomes = [(self.trades[trade_id], f"{level}_hit") for trade_id, level in by_trade.items()]
+            for trade_id in by_trade:
+                self._remove(trade_id)
+        return outcomes
+
+    def levels(self, symbol: str) -> List[Tuple[float, Dict, str]]:
+        """All indexed (price, trade, level) for a symbol"""
+        with self.lock:
+            return [(price, self.trades[trade_id], level)
+                    for price, _, trade_id, level in self.falling.get(symbol, []) + self.rising.get(symbol, [])]
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self.trades)
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Streaming Market Data Client
+Subscribes to Binance kline and bookTicker websocket streams and keeps live
+bars and last prices in memory, with automatic reconnect and REST backfill
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    import websocket  # websocket-client
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    websocket = None
+    WEBSOCKET_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+BINANCE_STREAM_URL = 'wss://stream.binance.com:9443/stream'
+BINANCE_SYMBOLS = {
+    'BTCUSD': 'BTCUSDT',
+    'XAUUSD': 'XAUUSDT'
+}
+STREAM_INTERVALS = {1: '1m', 3: '3m', 5: '5m', 15: '15m', 30: '30m', 60: '1h', 240: '4h', 1440: '1d'}
+BAR_COLUMNS = ['open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time']
+
+
+class WebSocketClientTransport:
+    """Default transport backed by the websocket-client package"""
+
+    def __init__(self, timeout: float = 30):
+        self.timeout = timeout
+
+    def connect(self, url: str):
+        if not WEBSOCKET_AVAILABLE:
+            raise RuntimeError("websocket-client is not installed")
+        return websocket.create_connection(url, timeout=self.timeout)
+
+
+class BinanceMarketStream:
+    def __init__(self, symbols: List[str], intervals: List[int] = None,
+                 backfill: Optional[Callable] = None, transport=None,
+                 url: str = BINANCE_STREAM_URL, max_bars: int = 1000,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 60.0):
+        """backfill(symbol, tf_minutes, bars, start_time=None) is the REST kline
+        fetcher used to seed history and fill gaps after a reconnect"""
+        self.symbols = [s for s in symbols if s in BINANCE_SYMBOLS]
+        self.intervals = intervals or [1]
+        self.backfill = backfill
+        self.transport = transport or WebSocketClientTransport()
+        self.url = url
+        self.max_bars = max_bars
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.lock = threading.Lock()
+        self.bars: Dict[Tuple[str, int], OrderedDict] = {
+            (symbol, tf): OrderedDict() for symbol in self.symbols for tf in self.intervals
+        }
+        self.quotes: Dict[str, Dict] = {}
+        self.price_listeners: List[Callable] = []
+        self.bar_close_listeners: List[Callable] = []
+        self.stream_map = {}
+        for symbol in self.symbols:
+            self.stream_map[BINANCE_SYMBOLS[symbol]] = symbol
+
+        self.running = False
+        self.connected = False
+        self.connection = None
+        self.thread = None
+        self.stats = {'messages': 0, 'reconnects': 0, 'backfilled_bars': 0}
+
+    # --- Subscription ---
+
+    def stream_names(self) -> List[str]:
+        names = []
+        for symbol in self.symbols:
+            pair = BINANCE_SYMBOLS[symbol].lower()
+            for tf in self.intervals:
+                names.append(f"{pair}@kline_{STREAM_INTERVALS[tf]}")
+            names.append(f"{pair}@bookTicker")
+        return names
+
+    def stream_url(self) -> str:
+        return f"{self.url}?streams={'/'.join(self.stream_names())}"
+
+    def add_price_listener(self, callback: Callable):
+        """callback(symbol, price, bid, ask, timestamp) on every book update"""
+        self.price_listeners.append(callback)
+
+    def add_bar_close_listener(self, callback: Callable):
+        """callback(symbol, tf_minutes, bar_dict) when a kline closes"""
+        self.bar_close_listeners.append(callback)
+
+    # --- Lifecycle ---
+
+    def start(self):
+        """Start streaming in a background thread"""
+        if self.running:
+            return self.thread
+        self.running = True
+        self.thread = threading.Thread(target=self.run_forever, daemon=True, name='market-stream')
+        self.thread.start()
+        logger.info(f"📡 Market stream started: {', '.join(self.stream_names())}")
+        return self.thread
+
+    def stop(self):
+        """Stop streaming and close the connection"""
+        self.running = False
+        self.connected = False
+        self._close()
+        logger.info("🛑 Market stream stopped")
+
+    def run_forever(self):
+        """Connect, consume, and reconnect with exponential backoff until stopped"""
+        delay = self.reconnect_delay
+        first_connect = True
+        while self.running:
+            try:
+                self.connection = self.transport.connect(self.stream_url())
+                if not first_connect:
+                    self.stats['reconnects'] += 1
+                    logger.info("📡 Market stream reconnected")
+                first_connect = False
+                # Anything that closed while we were away is filled in over REST;
+                # until that succeeds the in-memory bars have a gap and are not served
+                if not self.backfill_gaps():
+                    raise ConnectionError("gap backfill failed")
+                self.connected = True
+                delay = self.reconnect_delay
+                while self.running:
+                    message = self.connection.recv()
+                    if not message:
+                        raise ConnectionError("stream closed by server")
+                    self.handle_message(message)
+            except Exception as e:
+                if self.running:
+                    logger.warning(f"Market stream error: {e} - reconnecting in {delay:.0f}s")
+            finally:
+                self.connected = False
+                self._close()
+            if self.running:
+                time.sleep(delay)
+                delay = min(self.max_reconnect_delay, delay * 2)
+
+    def _close(self):
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    # --- Message handling ---
+
+    def handle_message(self, message):
+        """Apply one combined-stream message to the in-memory state"""
+        payload = json.loads(message) if isinstance(message, (str, bytes)) else message
+        data = payload.get('data', payload)
+        self.stats['messages'] += 1
+
+        if data.get('e') == 'kline':
+            self._apply_kline(data)
+        elif 'b' in data and 'a' in data:
+            self._apply_book_ticker(data)
+
+    def _apply_kline(self, data: Dict):
+        symbol = self.stream_map.get(data.get('s'))
+        k = data['k']
+        tf = next((m for m, name in STREAM_INTERVALS.items() if name == k['i']), None)
+        if symbol is None or (symbol, tf) not in self.bars:
+            return
+        bar = {
+            'open_time': int(k['t']), 'open': float(k['o']), 'high': float(k['h']),
+            'low': float(k['l']), 'close': float(k['c']), 'volume': float(k['v']),
+            'close_time': int(k['T'])
+        }
+        self._store_bar(symbol, tf, bar)
+        if k.get('x'):
+            for callback in self.bar_close_listeners:
+                try:
+                    callback(symbol, tf, bar)
+                except Exception as e:
+                    logger.warning(f"Bar close listener error: {e}")
+
+    def _apply_book_ticker(self, data: Dict):
+        symbol = self.stream_map.get(data.get('s'))
+        if symbol is None:
+            return
+        bid, ask = float(data['b']), float(data['a'])
+        quote = {'bid': bid, 'ask': ask, 'price': (bid + ask) / 2, 'timestamp': time.time()}
+        with self.lock:
+            self.quotes[symbol] = quote
+        for callback in self.price_listeners:
+            try:
+                callback(symbol, quote['price'], bid, ask, quote['timestamp'])
+            except Exception as e:
+                logger.warning(f"Price listener error: {e}")
+
+    def _store_bar(self, symbol: str, tf: int, bar: Dict):
+        with self.lock:
+            series = self.bars[(symbol, tf)]
+            series[bar['open_time']] = bar
+            if len(series) > 1 and next(reversed(series)) != bar['open_time']:
+                # Out-of-order arrival (backfill) - keep the series sorted
+                ordered = sorted(series.items())
+                series.clear()
+                series.update(ordered)
+            while len(series) > self.max_bars:
+                series.popitem(last=False)
+
+    # --- Backfill ---
+
+    def backfill_gaps(self) -> bool:
+        """Fetch bars missed while disconnected (or the initial history) over REST;
+        False when any series could not be filled"""
+        if self.backfill is None:
+            return True
+        ok = True
+        for (symbol, tf), series in self.bars.items():
+            try:
+                with self.lock:
+                    last_open = next(reversed(series)) if series else None
+                if last_open is None:
+                    df = self.backfill(symbol, tf, self.max_bars)
+                else:
+                    df = self.backfill(symbol, tf, self.max_bars, start_time=last_open)
+                if df is None:
+                    ok = False
+                    continue
+                for row in df[['open_time', 'open', 'high', 'low', 'close', 'volume']].itertuples(index=False):
+                    self._store_bar(symbol, tf, {
+                        'open_time': int(row.open_time), 'open': float(row.open),
+                        'high': float(row.high), 'low': float(row.low),
+                        'close': float(row.close), 'volume': float(row.volume),
+                        'close_time': int(row.open_time) + tf * 60_000 - 1
+                    })
+                self.stats['backfilled_bars'] += len(df)
+            except Exception as e:
+                logger.warning(f"Backfill error for {symbol} {tf}m: {e}")
+                ok = False
+        return ok
+
+    # --- Readers ---
+
+    def get_price(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Last mid price, or None when missing or older than max_age seconds"""
+        with self.lock:
+            quote = self.quotes.get(symbol)
+        if quote is None:
+            return None
+        if max_age is not None and time.time() - quote['timestamp'] > max_age:
+            return None
+        return quote['price']
+
+    def get_quote(self, symbol: str) -> Optional[Dict]:
+        with self.lock:
+            quote = self.quotes.get(symbol)
+        return dict(quote) if quote else None
+
+    def get_bars(self, symbol: str, tf_minutes: int, bars: int,
+                 start_time: Optional[int] = None) -> Optional[pd.DataFrame]:
+        """Live bars as a DataFrame in the same layout as the REST kline fetch"""
+        with self.lock:
+            series = self.bars.get((symbol, tf_minutes))
+            if not series:
+                return None
+            rows = list(series.values())
+        if start_time is not None:
+            rows = [r for r in rows if r['open_time'] >= start_time][:bars]
+        else:
+            rows = rows[-bars:]
+        return pd.DataFrame(rows, columns=BAR_COLUMNS)
+
+    def fetch_market_data(self, symbol: str, tf_minutes: int, bars: int,
+                          start_time=None, end_time=None) -> Optional[pd.DataFrame]:
+        """Drop-in kline fetcher: served from memory while the stream is live and
+        covers the request, otherwise delegated to the REST backfill fetcher"""
+        if self.connected and end_time is None and (symbol, tf_minutes) in self.bars:
+            with self.lock:
+                series = self.bars[(symbol, tf_minutes)]
+                first_open = next(iter(series)) if series else None
+            covered = first_open is not None and (
+                (start_time is not None and start_time >= first_open) or
+                (start_time is None and len(series) >= bars)
+            )
+            if covered:
+                return self.get_bars(symbol, tf_minutes, bars, start_time)
+        if self.backfill is None:
+            return None
+        return self.backfill(symbol, tf_minutes, bars, start_time=start_time, end_time=end_time)
@@ -103,7 +103,7 @@ class PerformanceMonitor:
     
     def record_trade_outcome(self, signal_id: int, outcome: str, exit_price: float):
         """Record the actual outcome of a trade"""
-        if outcome == 'tp_hit':
+        if outcome in ('tp_hit', 'trailed_profit'):
             self.tp_hits += 1
         elif outcome == 'sl_hit':
             self.sl_hits += 1
@@ -117,7 +117,7 @@ class PerformanceMonitor:
                 
                 # Calculate if probability prediction was accurate
                 predicted_success = prediction['predicted_probability'] > 50
-                actual_success = outcome == 'tp_hit'
+                actual_success = outcome in ('tp_hit', 'trailed_profit')
                 prediction['prediction_accurate'] = predicted_success == actual_success
                 
                 self.logger.info(f"📊 Trade outcome recorded: Signal {signal_id} - {outcome}")
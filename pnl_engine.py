@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Vectorized P&L Engine
+Marks every open trade to market from one price vector: unrealized P&L in
+each symbol's own pip/point units, trailing stops and net exposure are
+recomputed with NumPy instead of one trade dict at a time
+"""
+
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import SYMBOL_SETTINGS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POINT = 0.0001  # 5-digit FX pip, what P&L was hard-coded to before
+TRAIL_TRIGGER_PIPS = float(os.getenv('TRAIL_TRIGGER_PIPS', 20))
+TRAIL_DISTANCE_PIPS = float(os.getenv('TRAIL_DISTANCE_PIPS', 20))
+# Off by default: candidate stops are only reported. When on, moved stops are
+# written back to the trades and the caller must announce them
+TRAIL_STOPS_ENABLED = os.getenv('TRAIL_STOPS_ENABLED', 'false').lower() == 'true'
+
+
+def symbol_point(symbol: str) -> float:
+    """Price size of one pip/point for a symbol"""
+    return SYMBOL_SETTINGS.get(symbol, {}).get('point', DEFAULT_POINT)
+
+
+def pnl_pips(symbol: str, side: str, entry: float, price: float) -> float:
+    """Single-trade P&L in the symbol's pip/point units"""
+    direction = 1 if side == 'buy' else -1
+    return direction * (price - entry) / symbol_point(symbol)
+
+
+class PnLEngine:
+    def __init__(self, trail_trigger_pips: float = TRAIL_TRIGGER_PIPS,
+                 trail_distance_pips: float = TRAIL_DISTANCE_PIPS,
+                 apply_trailing: bool = TRAIL_STOPS_ENABLED):
+        """Candidate stops sit trail_distance_pips behind price once a trade is
+        trail_trigger_pips in profit (0 disables them). They only move the
+        trades' SL when apply_trailing is set."""
+        self.trail_trigger_pips = trail_trigger_pips
+        self.trail_distance_pips = trail_distance_pips
+        self.apply_trailing = apply_trailing
+        self.trades: List = []
+        self.trade_ids: Tuple = ()
+        self.symbols: List[str] = []
+        self.symbol_index = np.zeros(0, dtype=np.int64)
+        self.direction = np.zeros(0)
+        self.entry = np.zeros(0)
+        self.sl = np.zeros(0)
+        self.size = np.zeros(0)
+        self.point = np.zeros(0)
+        self.last: Optional[Dict] = None
+        self.lock = threading.Lock()
+        self.stats = {'marks': 0, 'rebuilds': 0, 'trailed': 0}
+
+    def _sync(self, trades: Sequence):
+        """Rebuild the column arrays only when the set of open trades changed"""
+        trade_ids = tuple(id(t) for t in trades)
+        if trade_ids == self.trade_ids:
+            return
+        self.trades = list(trades)
+        self.trade_ids = trade_ids
+        self.symbols = sorted({t['symbol'] for t in self.trades})
+        codes = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.symbol_index = np.array([codes[t['symbol']] for t in self.trades], dtype=np.int64)
+        self.direction = np.array([1.0 if t['side'] == 'buy' else -1.0 for t in self.trades])
+        self.entry = np.array([t['entry'] for t in self.trades], dtype=float)
+        self.sl = np.array([t['sl'] for t in self.trades], dtype=float)
+        self.size = np.array([t.get('position_size', 0.01) for t in self.trades], dtype=float)
+        self.point = np.array([symbol_point(s) for s in self.symbols], dtype=float)[self.symbol_index] \
+            if self.trades else np.zeros(0)
+        self.stats['rebuilds'] += 1
+
+    def mark(self, trades: Sequence, prices: Dict[str, Optional[float]]) -> Dict:
+        """Mark all trades to the given {symbol: price}; symbols without a price are
+        left out of the totals and never trail.
+
+        Stops that would trail are listed in 'candidates' as (trade, sl, candidate_sl).
+        With apply_trailing they are also written back to the trades and listed in
+        'trailed' as (trade, old_sl, new_sl) so callers can announce and re-index them."""
+        with self.lock:
+            self._sync(trades)
+            symbol_prices = np.array([np.nan if prices.get(s) is None else prices[s] for s in self.symbols],
+                                     dtype=float)
+            price = symbol_prices[self.symbol_index]
+            move = self.direction * (price - self.entry)
+            pips = move / self.point
+            value = move * self.size
+
+            candidates, trailed = [], []
+            if self.trail_trigger_pips > 0:
+                # Buys trail below price, sells above; stops only ever tighten
+                candidate = price - self.direction * self.trail_distance_pips * self.point
+                tighter = self.direction * (candidate - self.sl) > 0
+                moved = np.flatnonzero((pips > self.trail_trigger_pips) & tighter)
+                candidates = [(self.trades[i], float(self.sl[i]), float(candidate[i])) for i in moved]
+                if self.apply_trailing:
+                    for trade, old_sl, new_sl in candidates:
+                        trade['sl'] = new_sl
+                        trailed.append((trade, old_sl, new_sl))
+                    self.sl[moved] = candidate[moved]
+                    self.stats['trailed'] += len(moved)
+
+            priced = ~np.isnan(price)
+            n_symbols = len(self.symbols)
+            by_symbol_pips = np.bincount(self.symbol_index[priced], pips[priced], minlength=n_symbols)
+            by_symbol_value = np.bincount(self.symbol_index[priced], value[priced], minlength=n_symbols)
+            exposure = np.bincount(self.symbol_index[priced], (self.direction * self.size * price)[priced],
+                                   minlength=n_symbols)
+            self.last = {
+                'pnl_pips': pips,
+                'pnl_value': value,
+                'candidates': candidates,
+                'trailed': trailed,
+                'total_value': float(value[priced].sum()),
+                'by_symbol': {symbol: {'pips': float(by_symbol_pips[i]), 'value': float(by_symbol_value[i]),
+                                       'net_exposure': float(exposure[i])}
+                              for i, symbol in enumerate(self.symbols) if not np.isnan(symbol_prices[i])}
+            }
+            self.stats['marks'] += 1
+            return self.last
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats, open=len(self.trades))
+            if self.last is not None:
+                stats['total_value'] = round(self.last['total_value'], 5)
+                stats['by_symbol'] = self.last['by_symbol']
+            return stats
+
+
+# Global P&L engine instance
+pnl_engine = PnLEngine()
+
+
+def mark_to_market(trades: Sequence, prices: Dict[str, Optional[float]]) -> Dict:
+    """Helper function for the shared open-trade P&L engine"""
+    return pnl_engine.mark(trades, prices)
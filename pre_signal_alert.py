@@ -10,6 +10,8 @@ import time
 from datetime import datetime, timedelta
 from telegram_utils import send_telegram_message
 from mt5_data import get_current_price, fetch_market_data, initialize_mt5, shutdown_mt5
+from price_bus import get_bus_price
+from feature_engine import get_features
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -41,28 +43,27 @@ class PreSignalAlertSystem:
             if bars is None or len(bars) < 10:
                 return None
             
-            current_price = get_current_price(symbol)
+            current_price = get_bus_price(symbol, fetcher=get_current_price)
             if current_price is None:
                 return None
             
-            # Calculate technical indicators
+            # Technical indicators from the shared feature engine
+            features = get_features(symbol, timeframe, bars)
             prices = bars['close'].values
-            highs = bars['high'].values
-            lows = bars['low'].values
             volumes = bars['tick_volume'].values if 'tick_volume' in bars.columns else None
             
             # Price momentum analysis
             price_change = (current_price - prices[-5]) / prices[-5]
-            short_ma = np.mean(prices[-5:])
-            long_ma = np.mean(prices[-10:])
+            short_ma = features['ma5']
+            long_ma = features['ma10']
             ma_divergence = (short_ma - long_ma) / long_ma
             
             # Volatility analysis
-            volatility = np.std(prices[-10:]) / np.mean(prices[-10:])
+            volatility = features['std10'] / long_ma
             
             # Support/Resistance analysis
-            recent_high = np.max(highs[-10:])
-            recent_low = np.min(lows[-10:])
+            recent_high = features['high10']
+            recent_low = features['low10']
             price_position = (current_price - recent_low) / (recent_high - recent_low)
             
             # Volume analysis (if available)
@@ -214,7 +215,8 @@ Time: {datetime.now().strftime('%H:%M:%S')}
             return False
     
     def check_pre_signal_conditions(self, symbol):
-        """Check pre-signal conditions for a specific symbol (for integration with main scanner)"""
+        """Check pre-signal conditions for a specific symbol (for integration with main scanner).
+        Returns the analysed conditions so callers can reuse the formation probability"""
         try:
             # Only check if symbol is in monitoring list
             if symbol not in self.monitoring_symbols:
@@ -225,6 +227,7 @@ Time: {datetime.now().strftime('%H:%M:%S')}
             
             if conditions and self.should_send_alert(conditions):
                 self.send_pre_signal_alert(conditions)
+            return conditions
                 
         except Exception as e:
             logger.error(f"Error checking pre-signal conditions for {symbol}: {e}")
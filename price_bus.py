@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Central Price Bus
+Holds the latest quote per symbol so every component reads one shared price
+instead of fetching it independently
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PRICE_MAX_AGE = float(os.getenv('PRICE_MAX_AGE', 2))
+PRICE_MIN_INTERVAL = float(os.getenv('PRICE_MIN_INTERVAL', 1))
+
+
+class PriceBus:
+    def __init__(self, max_age: float = PRICE_MAX_AGE, min_interval: float = PRICE_MIN_INTERVAL):
+        """max_age: default staleness bound for reads
+        min_interval: a symbol is fetched at most once per this many seconds"""
+        self.max_age = max_age
+        self.min_interval = min_interval
+        self.quotes: Dict[str, Dict] = {}
+        self.subscribers: List[Callable] = []
+        self.source = None
+        self.source_name = None
+        self.source_supports = None
+        self.last_fetch: Dict[str, float] = {}
+        self.lock = threading.Lock()
+        self.fetch_locks: Dict[str, threading.Lock] = {}
+        self.stats = {'hits': 0, 'fetches': 0, 'published': 0}
+
+    def register_source(self, fetcher: Callable, name: str = 'rest', supports: Optional[Callable] = None):
+        """fetcher(symbol) -> price; tried before per-call fallbacks for the symbols
+        supports(symbol) accepts (all by default)"""
+        self.source = fetcher
+        self.source_name = name
+        self.source_supports = supports
+
+    def subscribe(self, callback: Callable):
+        """callback(symbol, quote_dict) on every published price"""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def publish(self, symbol: str, price: float, bid: Optional[float] = None,
+                ask: Optional[float] = None, timestamp: Optional[float] = None,
+                source: str = 'push'):
+        """Store a new quote and notify subscribers"""
+        quote = {
+            'price': float(price), 'bid': bid, 'ask': ask,
+            'timestamp': timestamp or time.time(), 'source': source
+        }
+        with self.lock:
+            self.quotes[symbol] = quote
+            self.stats['published'] += 1
+        for callback in list(self.subscribers):
+            try:
+                callback(symbol, dict(quote))
+            except Exception as e:
+                logger.warning(f"Price subscriber error: {e}")
+        return quote
+
+    def get_quote(self, symbol: str) -> Optional[Dict]:
+        """Latest quote without fetching, regardless of age"""
+        with self.lock:
+            quote = self.quotes.get(symbol)
+        return dict(quote) if quote else None
+
+    def _fresh_price(self, symbol: str, max_age: float) -> Optional[float]:
+        with self.lock:
+            quote = self.quotes.get(symbol)
+        if quote and time.time() - quote['timestamp'] <= max_age:
+            return quote['price']
+        return None
+
+    def get_price(self, symbol: str, max_age: Optional[float] = None,
+                  fetcher: Optional[Callable] = None, source: str = 'poll') -> Optional[float]:
+        """Latest price no older than max_age seconds, fetched on a miss.
+
+        Concurrent readers of the same symbol share one fetch, and a symbol is
+        fetched at most once per min_interval; within that window the last
+        known price is returned even when older than max_age.
+        fetcher is used when the registered source does not cover the symbol
+        or returns nothing."""
+        max_age = self.max_age if max_age is None else max_age
+        price = self._fresh_price(symbol, max_age)
+        if price is not None:
+            self.stats['hits'] += 1
+            return price
+
+        fetches = []
+        if self.source and (self.source_supports is None or self.source_supports(symbol)):
+            fetches.append((self.source, self.source_name))
+        if fetcher is not None:
+            fetches.append((fetcher, source))
+        if not fetches:
+            return None
+
+        with self.lock:
+            fetch_lock = self.fetch_locks.setdefault(symbol, threading.Lock())
+        with fetch_lock:
+            # Another reader may have refreshed it while we waited
+            price = self._fresh_price(symbol, max_age)
+            if price is not None:
+                self.stats['hits'] += 1
+                return price
+            if time.time() - self.last_fetch.get(symbol, 0) < self.min_interval:
+                quote = self.get_quote(symbol)
+                return quote['price'] if quote else None
+
+            self.last_fetch[symbol] = time.time()
+            for fetch, fetch_source in fetches:
+                self.stats['fetches'] += 1
+                try:
+                    price = fetch(symbol)
+                except Exception as e:
+                    logger.warning(f"Price fetch error for {symbol}: {e}")
+                    price = None
+                if price:
+                    self.publish(symbol, price, source=fetch_source)
+                    return float(price)
+            return None
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return {**self.stats, 'symbols': len(self.quotes)}
+
+
+# Global price bus instance
+price_bus = PriceBus()
+
+
+def get_bus_price(symbol: str, max_age: Optional[float] = None,
+                  fetcher: Optional[Callable] = None) -> Optional[float]:
+    """Helper function to read a price through the shared bus"""
+    return price_bus.get_price(symbol, max_age=max_age, fetcher=fetcher)
@@ -8,7 +8,8 @@ import time
 import json
 from datetime import datetime, timedelta
 from threading import Thread, Lock
-import requests
+from http_transport import http_get
+from price_bus import price_bus
 
 class BitcoinPriceMonitor:
     def __init__(self):
@@ -125,7 +126,7 @@ class BitcoinPriceMonitor:
     def get_backup_price(self):
         """Get Bitcoin price from external API as backup"""
         try:
-            response = requests.get(
+            response = http_get(
                 'https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd',
                 timeout=10
             )
@@ -138,12 +139,14 @@ class BitcoinPriceMonitor:
     
     def update_price(self):
         """Update Bitcoin price from best available source"""
-        # Try MT5 first (most accurate)
-        price = self.get_mt5_price()
+        # Shared price bus first (streamed or recently fetched), then MT5
+        price = price_bus.get_price('BTCUSD', fetcher=lambda symbol: self.get_mt5_price(), source='MT5')
         
         # Fallback to external API
         if price is None:
             price = self.get_backup_price()
+            if price is not None:
+                price_bus.publish('BTCUSD', price, source='CoinGecko')
         
         if price is None:
             print("⚠️ Could not fetch Bitcoin price")
@@ -153,10 +156,11 @@ class BitcoinPriceMonitor:
         self.current_price = price
         
         # Store price history
+        quote = price_bus.get_quote('BTCUSD')
         price_data = {
             'price': price,
             'timestamp': datetime.now().isoformat(),
-            'source': 'MT5' if self.get_mt5_price() else 'CoinGecko'
+            'source': quote['source'] if quote else 'MT5'
         }
         
         with self.lock:
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+TTL Quote Cache
+Short-lived market data cache with per-source expiry and request coalescing,
+so concurrent requests for one symbol share a single upstream fetch
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class QuoteCache:
+    def __init__(self, default_ttl: float = 5.0, source_ttls: Optional[Dict[str, float]] = None):
+        """source_ttls maps the source a value came from to its lifetime in seconds"""
+        self.default_ttl = default_ttl
+        self.source_ttls = dict(source_ttls or {})
+        self.entries: Dict[Hashable, Tuple[object, float]] = {}  # key -> (value, expires_at)
+        self.in_flight: Dict[Hashable, Future] = {}
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+    def configure_source(self, source: str, ttl: float):
+        self.source_ttls[source] = ttl
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Tuple[object, str]]):
+        """Cached value for key, or the result of fetch() -> (value, source).
+
+        Only one caller runs fetch for a key at a time; the others wait for and
+        share its result. Failures (exceptions or None) are not cached."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self.stats['hits'] += 1
+                return entry[0]
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.in_flight[key] = future
+                self.stats['misses'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value, source = fetch()
+            if value is not None:
+                ttl = self.source_ttls.get(source, self.default_ttl)
+                with self.lock:
+                    self.entries[key] = (value, time.time() + ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.in_flight.pop(key, None)
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one key or everything"""
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats, entries=len(self.entries))
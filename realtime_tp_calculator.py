@@ -4,11 +4,13 @@ Calculates dynamic TP hit probability based on current market conditions,
 volatility, and historical performance
 """
 
-import json
 import math
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import statistics
+from price_bus import get_bus_price
+from bar_store import load_recent_bars
+from signal_store import signal_store
 
 # Import MT5 data functions
 try:
@@ -19,22 +21,10 @@ except ImportError:
     print("⚠️ MT5 not available - using mock data")
 
 class RealTimeTPCalculator:
-    def __init__(self):
-        self.signals_file = "advanced_signals.json"
-        self.load_historical_data()
-        
-    def load_historical_data(self):
-        """Load historical signal performance data"""
-        try:
-            with open(self.signals_file, 'r') as f:
-                self.historical_signals = json.load(f)
-            print(f"✅ Loaded {len(self.historical_signals)} historical signals")
-        except FileNotFoundError:
-            self.historical_signals = []
-            print("⚠️ No historical data found")
-        except Exception as e:
-            self.historical_signals = []
-            print(f"❌ Error loading historical data: {e}")
+    def __init__(self, store=None):
+        # Historical signals are queried from the signal store per symbol/status
+        # instead of loading the whole history up front
+        self.store = store or signal_store
     
     def calculate_market_volatility(self, symbol: str, timeframe_minutes: int = 60) -> float:
         """Calculate current market volatility for probability adjustment"""
@@ -43,7 +33,9 @@ class RealTimeTPCalculator:
         
         try:
             # Get recent price data
-            data = fetch_market_data(symbol, timeframe_minutes, 20)
+            data = load_recent_bars(symbol, timeframe_minutes, 20)
+            if data is None:
+                data = fetch_market_data(symbol, timeframe_minutes, 20)
             if data is None or len(data) < 10:
                 return 0.5
             
@@ -65,8 +57,11 @@ class RealTimeTPCalculator:
     
     def get_symbol_historical_performance(self, symbol: str) -> Dict:
         """Get historical TP performance for specific symbol"""
-        symbol_signals = [s for s in self.historical_signals 
-                         if s.get('symbol') == symbol and s.get('status') == 'closed']
+        try:
+            symbol_signals = self.store.signals(status='closed', symbol=symbol)
+        except Exception as e:
+            print(f"❌ Error loading historical data: {e}")
+            symbol_signals = []
         
         if not symbol_signals:
             return {"tp_rate": 0.5, "total_trades": 0, "avg_duration": 0, "tp_hits": 0}
@@ -132,12 +127,14 @@ class RealTimeTPCalculator:
             return 0.85  # Default neutral market
         
         try:
-            current_price = get_current_price(symbol)
+            current_price = get_bus_price(symbol, fetcher=get_current_price)
             if not current_price:
                 return 0.85
             
             # Get recent data to determine trend strength
-            data = fetch_market_data(symbol, 15, 20)  # 15-minute data
+            data = load_recent_bars(symbol, 15, 20)  # 15-minute data
+            if data is None:
+                data = fetch_market_data(symbol, 15, 20)
             if data is None or len(data) < 10:
                 return 0.85
             
@@ -266,7 +263,7 @@ class RealTimeTPCalculator:
     
     def analyze_active_signals(self):
         """Analyze all currently active signals with real-time probability"""
-        active_signals = [s for s in self.historical_signals if s.get('status') == 'active']
+        active_signals = self.store.signals(status='active')
         
         if not active_signals:
             print("📭 No active signals to analyze")
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Adaptive Scan Prioritization
+Polls symbols close to a signal often and quiet symbols rarely, from cheap
+precomputed scores (pre-signal formation probability, proximity to support/
+resistance, ATR), while keeping data requests within a fixed budget per minute
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+SCAN_REQUEST_BUDGET = float(os.getenv('SCAN_REQUEST_BUDGET', 120))  # data requests per minute
+SCAN_MIN_INTERVAL = float(os.getenv('SCAN_MIN_INTERVAL', 5))
+SCAN_MAX_INTERVAL = float(os.getenv('SCAN_MAX_INTERVAL', 120))
+PROXIMITY_RANGE = 0.03  # same 3% band the signal gates use
+SCORE_WEIGHTS = {'probability': 0.5, 'proximity': 0.35, 'volatility': 0.15}
+
+
+def _known(value) -> bool:
+    return value is not None and value == value  # not None and not NaN
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None, clock: Callable[[], float] = time.time):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst if burst is not None else max(1.0, rate_per_minute / 6)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, n: float = 1) -> bool:
+        self._refill()
+        if self.tokens >= n:
+            self.tokens -= n
+            return True
+        return False
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+
+class ScanPrioritizer:
+    def __init__(self, symbols: Iterable[str], budget_per_minute: float = SCAN_REQUEST_BUDGET,
+                 min_interval: float = SCAN_MIN_INTERVAL, max_interval: float = SCAN_MAX_INTERVAL,
+                 requests_per_scan: Union[float, Callable[[str], float]] = 1,
+                 clock: Callable[[], float] = time.time):
+        """Each scan of a symbol costs requests_per_scan tokens of the budget - a
+        number, or a callable(symbol) for scans whose request count varies"""
+        self.symbols = list(symbols)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.requests_per_scan = requests_per_scan
+        self.clock = clock
+        self.bucket = TokenBucket(budget_per_minute, clock=clock)
+        self.heat: Dict[str, float] = {symbol: 0.5 for symbol in self.symbols}
+        self.scores: Dict[str, Dict[str, float]] = {}
+        self.volatility: Dict[str, float] = {}  # ATR / close
+        self.last_scan: Dict[str, float] = {}
+        self.pending = set()  # requested by events but deferred for budget
+        self.lock = threading.Lock()
+        self.stats = {'scans': 0, 'deferred': 0}
+
+    def update_score(self, symbol: str, probability: Optional[float] = None, close: Optional[float] = None,
+                     atr: Optional[float] = None, support: Optional[float] = None,
+                     resistance: Optional[float] = None):
+        """Update whichever cheap scores are given - pre-signal probability (0-1),
+        proximity to support/resistance, ATR relative to the universe - and
+        recompute the symbol's heat in [0, 1] from all known scores"""
+        with self.lock:
+            scores = self.scores.setdefault(symbol, {})
+            if _known(probability):
+                scores['probability'] = min(max(probability, 0.0), 1.0)
+            if close and _known(support) and _known(resistance):
+                distance = min(abs(close - support), abs(resistance - close)) / close
+                scores['proximity'] = max(0.0, 1 - distance / PROXIMITY_RANGE)
+            if close and _known(atr):
+                self.volatility[symbol] = atr / close
+                median = sorted(self.volatility.values())[len(self.volatility) // 2]
+                scores['volatility'] = min(1.0, self.volatility[symbol] / (2 * median)) if median else 0.5
+            if scores:
+                self.heat[symbol] = (sum(SCORE_WEIGHTS[name] * value for name, value in scores.items())
+                                     / sum(SCORE_WEIGHTS[name] for name in scores))
+
+    def interval(self, symbol: str) -> float:
+        """Geometric between max_interval (heat 0) and min_interval (heat 1)"""
+        heat = self.heat.get(symbol, 0.5)
+        return self.max_interval * (self.min_interval / self.max_interval) ** heat
+
+    def _due(self, now: float) -> List[str]:
+        return [s for s in self.symbols if now - self.last_scan.get(s, float('-inf')) >= self.interval(s)]
+
+    def scan_cost(self, symbol: str) -> float:
+        """Requests one scan of the symbol makes, capped at the bucket size so an
+        expensive scan can still be paid for"""
+        cost = self.requests_per_scan(symbol) if callable(self.requests_per_scan) else self.requests_per_scan
+        return min(cost, self.bucket.capacity)
+
+    def next_due_in(self) -> float:
+        """Seconds until a symbol is due and the budget can pay for its scan"""
+        now = self.clock()
+        with self.lock:
+            if not self.symbols:
+                return self.max_interval
+            waits = {s: self.last_scan.get(s, float('-inf')) + self.interval(s) - now for s in self.symbols}
+            # The symbol select() would try first pays for the next scan
+            if self.pending:
+                wait, first = 0.0, max(self.pending, key=lambda s: self.heat[s])
+            else:
+                due = [s for s, w in waits.items() if w <= 0]
+                first = max(due, key=lambda s: self.heat[s]) if due else min(waits, key=waits.get)
+                wait = waits[first]
+            shortfall = self.scan_cost(first) - self.bucket.available()
+        refill = shortfall / self.bucket.rate if shortfall > 0 and self.bucket.rate else 0.0
+        return max(0.0, wait, refill)
+
+    def select(self, requested: Iterable[str] = ()) -> List[str]:
+        """Symbols to scan now: event-requested ones first, then due symbols by heat,
+        as far as the request budget allows; the rest wait for a later call"""
+        now = self.clock()
+        with self.lock:
+            self.pending.update(s for s in requested if s in self.heat)
+            urgent = sorted(self.pending, key=lambda s: -self.heat[s])
+            due = sorted((s for s in self._due(now) if s not in self.pending), key=lambda s: -self.heat[s])
+            selected = []
+            for symbol in urgent + due:
+                if not self.bucket.take(self.scan_cost(symbol)):
+                    break
+                selected.append(symbol)
+                self.last_scan[symbol] = now
+                self.pending.discard(symbol)
+            deferred = len(urgent) + len(due) - len(selected)
+            self.stats['scans'] += len(selected)
+            self.stats['deferred'] += deferred
+        if deferred:
+            logger.debug(f"[Priority] Request budget reached - {deferred} symbols deferred")
+        return selected
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            hottest = sorted(self.heat.items(), key=lambda item: -item[1])[:5]
+            return dict(self.stats, tokens=round(self.bucket.available(), 1),
+                        hottest={s: round(h, 2) for s, h in hottest})
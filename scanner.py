@@ -1,8 +1,10 @@
 import time
 import sys
+import os
 import logging
 import signal
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timedelta
 from config import SYMBOLS, TIMEFRAMES, RR_MULTIPLIERS, MAX_OPEN_TRADES, DAILY_LOSS_LIMIT, trade_stats, LOG_LEVEL
 
@@ -15,7 +17,7 @@ logging.basicConfig(
         logging.StreamHandler(sys.stdout)
     ]
 )
-import requests
+from http_transport import http_get
 
 logger = logging.getLogger(__name__)
 
@@ -29,7 +31,7 @@ def get_binance_price(symbol):
     binance_symbol = symbol_map.get(symbol, symbol)
     url = f'https://api.binance.com/api/v3/ticker/price?symbol={binance_symbol}'
     try:
-        response = requests.get(url, timeout=5)
+        response = http_get(url, timeout=5)
         data = response.json()
         return float(data['price'])
     except Exception as e:
@@ -38,7 +40,9 @@ def get_binance_price(symbol):
 
 # Dummy functions for MT5 compatibility (for other symbols)
 import pandas as pd
-def fetch_market_data(symbol, tf_minutes, bars):
+from kline_parser import parse_klines
+def fetch_market_bars(symbol, tf_minutes, bars, start_time=None, end_time=None):
+    """Klines as a BarArray of contiguous float64 columns (no DataFrame)"""
     # Only support BTCUSD and XAUUSD for cloud
     symbol_map = {
         'BTCUSD': 'BTCUSDT',
@@ -51,28 +55,58 @@ def fetch_market_data(symbol, tf_minutes, bars):
     interval_map = {1: '1m', 3: '3m', 5: '5m', 15: '15m', 30: '30m', 60: '1h', 240: '4h', 1440: '1d'}
     interval = interval_map.get(tf_minutes, '1m')
     url = f'https://api.binance.com/api/v3/klines?symbol={binance_symbol}&interval={interval}&limit={bars}'
+    if start_time is not None:
+        url += f'&startTime={int(start_time)}'
+    if end_time is not None:
+        url += f'&endTime={int(end_time)}'
     try:
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        # Format to pandas DataFrame
-        df = pd.DataFrame(data, columns=[
-            'open_time', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'num_trades',
-            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-        ])
-        df['open'] = df['open'].astype(float)
-        df['high'] = df['high'].astype(float)
-        df['low'] = df['low'].astype(float)
-        df['close'] = df['close'].astype(float)
-        df['volume'] = df['volume'].astype(float)
-        return df
+        response = http_get(url, timeout=10)
+        return parse_klines(response.content)
     except Exception as e:
         logger.error(f"Binance OHLCV fetch error for {symbol}: {e}")
         return None
-def get_current_price(symbol):
+
+def fetch_market_data(symbol, tf_minutes, bars, start_time=None, end_time=None):
+    bar_array = fetch_market_bars(symbol, tf_minutes, bars, start_time, end_time)
+    return bar_array.to_dataframe() if bar_array is not None else None
+
+# Optional websocket feed - live bars and prices are served from memory and
+# REST is only used for seeding and gap backfill
+from market_stream import BinanceMarketStream, WEBSOCKET_AVAILABLE
+from price_bus import price_bus
+STREAM_ENABLED = os.getenv('STREAM_ENABLED', 'false').lower() == 'true'
+market_stream = None
+if STREAM_ENABLED:
+    if WEBSOCKET_AVAILABLE:
+        market_stream = BinanceMarketStream(SYMBOLS, intervals=[1], backfill=fetch_market_data)
+        market_stream.add_price_listener(
+            lambda symbol, price, bid, ask, ts: price_bus.publish(symbol, price, bid, ask, ts, source='stream'))
+    else:
+        logger.warning("STREAM_ENABLED but websocket-client is not installed - using REST polling")
+kline_source = market_stream.fetch_market_data if market_stream else fetch_market_data
+
+# One incremental M1 stream per symbol; M3/M5/M15/... are derived from it locally
+# and only timeframes the base history cannot cover yet are fetched natively
+from timeframe_resampler import TimeframeResampler
+RESAMPLE_BASE_BARS = int(os.getenv('RESAMPLE_BASE_BARS', 5000))
+# Closed bars are persisted locally so restarts only fetch the gap since shutdown
+from bar_store import bar_store
+BAR_STORE_ENABLED = os.getenv('BAR_STORE_ENABLED', 'true').lower() == 'true'
+resampler = TimeframeResampler(kline_source, base_bars=RESAMPLE_BASE_BARS,
+                               store=bar_store if BAR_STORE_ENABLED else None)
+
+def fetch_live_price(symbol):
     if symbol in ['BTCUSD', 'XAUUSD']:
         return get_binance_price(symbol)
     return None
+
+# Every price consumer reads through the bus: streamed quotes are pushed into it
+# and REST is polled at most once per interval per symbol on a stale read
+price_bus.register_source(fetch_live_price, name='binance',
+                          supports=lambda symbol: symbol in ['BTCUSD', 'XAUUSD'])
+
+def get_current_price(symbol):
+    return price_bus.get_price(symbol)
 def get_account_info():
     return {'balance': 10000, 'equity': 10000, 'server': 'Binance', 'trade_mode': 2}
 def get_symbol_info(symbol):
@@ -83,8 +117,18 @@ def shutdown_mt5():
     pass
 
 from smc_utils import generate_realistic_signal, calculate_realistic_tp_sl, atr
+from feature_engine import get_features, feature_engine
+from batch_kernel import gate_frames
+from analysis_memo import analysis_memo
+from confluence import confluence_evaluator
+from bar_scheduler import BarScheduler
+from scan_priority import ScanPrioritizer
+from signal_pipeline import SignalPipeline, Stage
+from level_index import LevelIndex
+from intrabar_resolver import IntrabarResolver
+from trade_book import TradeBook
+from pnl_engine import pnl_engine, pnl_pips
 from telegram_utils import send_enhanced_alert, send_trade_update, send_performance_update, send_system_alert
-import os
 
 # Import advanced analytics
 try:
@@ -117,6 +161,14 @@ except ImportError as e:
 # Real-time configuration
 TF_MAP = {"M1": 1, "M3": 3, "M5": 5, "M15": 15, "M30": 30, "H1": 60, "H4": 240, "D1": 1440}
 SCAN_INTERVAL = int(os.getenv('SCAN_INTERVAL', 10))
+FETCH_WORKERS = int(os.getenv('FETCH_WORKERS', 8))
+FETCH_DEADLINE = float(os.getenv('FETCH_DEADLINE', 15))
+INDICATOR_STATE_FILE = os.getenv('INDICATOR_STATE_FILE', 'indicator_state.json')
+BATCH_WINDOW = float(os.getenv('BATCH_WINDOW', 0.25))  # seconds to gather completed fetches into one batch
+# Event-driven scanning: wake on bar close and watched-level crosses, with a full
+# scan every SCHEDULER_FALLBACK_INTERVAL seconds; disabled, the loop polls every SCAN_INTERVAL
+SCHEDULER_ENABLED = os.getenv('SCHEDULER_ENABLED', 'true').lower() == 'true'
+SCHEDULER_FALLBACK_INTERVAL = float(os.getenv('SCHEDULER_FALLBACK_INTERVAL', 60))
 COOLDOWN_SECONDS = 60
 
 # Signal-only mode configuration
@@ -124,7 +176,7 @@ SIGNAL_ONLY_MODE = os.getenv('SIGNAL_ONLY_MODE', 'true').lower() == 'true'
 IGNORE_ACCOUNT_BALANCE = os.getenv('IGNORE_ACCOUNT_BALANCE', 'true').lower() == 'true'
 
 # Global state
-open_trades = []
+open_trades = TradeBook()  # open trades only; finished ones are archived
 last_alert_time = {}
 last_performance_update = datetime.now().date()
 bot_start_time = datetime.now()
@@ -155,37 +207,31 @@ def is_market_open():
     else:  # Monday-Friday
         return True
 
-def manage_trade(trade, current_price):
-    """Enhanced trade management for MT5 signals"""
-    try:
-        # Calculate current P&L in pips
-        if trade['side'] == 'buy':
-            pnl_pips = (current_price - trade['entry']) * 10000  # For 5-digit quotes
-        else:
-            pnl_pips = (trade['entry'] - current_price) * 10000
-        
-        trade['current_pnl_pips'] = pnl_pips
-        
-        # Trail stop logic (basic)
-        if pnl_pips > 20:  # If in profit by 20+ pips
-            if trade['side'] == 'buy':
-                new_sl = max(trade['sl'], current_price - (20 * 0.0001))  # Trail 20 pips
-            else:
-                new_sl = min(trade['sl'], current_price + (20 * 0.0001))
-            
-            if new_sl != trade['sl']:
-                logger.info(f"TRAIL STOP: {trade['symbol']} SL moved to {new_sl:.5f}")
-                trade['sl'] = new_sl
-        
-    except Exception as e:
-        logger.error(f"Trade management error: {e}")
-
 class MT5SignalBot:
     def __init__(self):
         self.running = False
         self.setup_signal_handlers()
         self.performance_lock = threading.Lock()
         self.trade_lock = threading.Lock()
+        self.fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='fetch')
+        self.pending_fetches = {}
+        self.level_index = LevelIndex()
+        self.intrabar_resolver = IntrabarResolver()
+        if market_stream:
+            market_stream.start()
+        self.pre_signal_alert = None
+        self.prioritizer = ScanPrioritizer(SYMBOLS, requests_per_scan=self.scan_request_cost)
+        self.scheduler = None
+        if SCHEDULER_ENABLED:
+            self.scheduler = BarScheduler(SYMBOLS, {tf: TF_MAP[tf] for tf in TIMEFRAMES if tf in TF_MAP},
+                                          fallback_interval=SCHEDULER_FALLBACK_INTERVAL)
+            price_bus.subscribe(self.scheduler.on_quote)
+            if not market_stream:
+                # Without streamed ticks nothing publishes while the loop waits -
+                # poll the watched symbols so level crosses still fire
+                self.scheduler.start_price_poll(get_current_price)
+        if feature_engine.load_state(INDICATOR_STATE_FILE):
+            logger.info(f"♻️ Restored indicator state for {len(feature_engine.streams)} series")
         self.initialize_mt5_connection()
         self.update_account_info()
         
@@ -207,6 +253,7 @@ class MT5SignalBot:
             self.tp_calculator = None
             self.signal_filter = None
             self.pre_signal_alert = None
+        self.signal_pipeline = self.build_signal_pipeline()
         
     def setup_signal_handlers(self):
         """Setup graceful shutdown handlers"""
@@ -217,15 +264,28 @@ class MT5SignalBot:
         """Handle shutdown signals gracefully"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        if self.scheduler:
+            self.scheduler.stop()
         
         # Stop advanced features
         if ADVANCED_FEATURES and self.price_monitor:
             self.price_monitor.stop_monitoring()
         
+        self.fetch_executor.shutdown(wait=False, cancel_futures=True)
+        if market_stream:
+            market_stream.stop()
+        self.save_indicator_state()
         shutdown_mt5()
         send_system_alert("STOP: MT5 Signal Bot shutting down gracefully", "INFO")
         sys.exit(0)
     
+    def save_indicator_state(self):
+        """Persist streaming indicator state so the next start resumes incrementally"""
+        try:
+            feature_engine.save_state(INDICATOR_STATE_FILE)
+        except Exception as e:
+            logger.warning(f"Could not save indicator state: {e}")
+
     def initialize_mt5_connection(self):
         """Initialize MT5 connection"""
         try:
@@ -266,15 +326,15 @@ class MT5SignalBot:
         except Exception as e:
             logger.error(f"MT5 account info error: {e}")
     
-    def safe_fetch_mt5_data(self, symbol, tf_minutes, retries=0):
-        """Safely fetch REAL MT5 market data with retry logic"""
+    def safe_fetch_mt5_data(self, symbol, tf_minutes, retries=0, deadline=None):
+        """Safely fetch REAL MT5 market data with retry logic (retries stop at `deadline`)"""
         try:
-            data = fetch_market_data(symbol, tf_minutes, 100)
+            data = resampler.get_bars(symbol, tf_minutes, 100)
             if data is None or len(data) < 30:
-                if retries < 3:
+                if retries < 3 and (deadline is None or time.time() + 2 < deadline):
                     logger.warning(f"MT5 data retry {retries + 1} for {symbol} {tf_minutes}m")
                     time.sleep(2)
-                    return self.safe_fetch_mt5_data(symbol, tf_minutes, retries + 1)
+                    return self.safe_fetch_mt5_data(symbol, tf_minutes, retries + 1, deadline)
                 logger.error(f"ERROR: Insufficient MT5 data for {symbol} {tf_minutes}m")
                 return None
             
@@ -285,13 +345,31 @@ class MT5SignalBot:
             
             return data
         except Exception as e:
-            if retries < 2:
+            if retries < 2 and (deadline is None or time.time() + 3 < deadline):
                 logger.warning(f"MT5 data retry {retries + 1} for {symbol}: {e}")
                 time.sleep(3)
-                return self.safe_fetch_mt5_data(symbol, tf_minutes, retries + 1)
+                return self.safe_fetch_mt5_data(symbol, tf_minutes, retries + 1, deadline)
             logger.error(f"ERROR: MT5 data fetch failed for {symbol}: {e}")
             return None
     
+    def fetch_symbol_frames(self, symbol, deadline=None):
+        """Fetch every configured timeframe for one symbol (runs in the fetch pool)"""
+        # One base fetch per symbol - every timeframe below is derived from it
+        if not resampler.refresh(symbol):
+            logger.warning(f"[DEBUG]     No base data for {symbol}")
+
+        frames = {}
+        for tf in TIMEFRAMES:
+            tf_minutes = TF_MAP.get(tf)
+            if tf_minutes is None:
+                continue
+            df = self.safe_fetch_mt5_data(symbol, tf_minutes, deadline=deadline)
+            if df is None:
+                logger.warning(f"[DEBUG]     No data for {symbol} {tf}")
+                continue
+            frames[tf] = df
+        return frames
+    
     def check_signal_limits(self):
         """Enhanced risk management for MT5 signals"""
         try:
@@ -332,186 +410,97 @@ class MT5SignalBot:
     def check_trades_realtime(self, symbol):
         """Real-time MT5 signal monitoring with live prices"""
         try:
+            # Every M1 range since the last check first, so wicks between polls
+            # close trades at the level in the order they were reached
+            with self.trade_lock:
+                for trade, outcome, level_price in self.intrabar_resolver.resolve(
+                        symbol, open_trades.for_symbol(symbol), resampler.get_base_bars(symbol)):
+                    self.level_index.remove(trade)
+                    self.record_trade_exit(trade, outcome, level_price)
+
             # Get REAL current price from MT5
             current_price = get_current_price(symbol)
             if current_price is None:
                 logger.warning(f"Could not get MT5 price for {symbol}")
                 return
-            
+
+            # Only the trades whose SL/TP this price reaches, found by bisect
             with self.trade_lock:
-                for trade in open_trades[:]:
-                    if trade.get('status', 'open') != 'open' or trade['symbol'] != symbol:
-                        continue
-                    
-                    # Check signal outcomes with REAL MT5 prices
-                    if trade['side'] == 'buy':
-                        if current_price <= trade['sl']:
-                            pnl_pips = (current_price - trade['entry']) * 10000
-                            logger.info(f"MT5 SIGNAL SL HIT: {trade['symbol']} at {current_price:.5f} "
-                                        f"({pnl_pips:.1f} pips)")
-                            trade['status'] = 'sl_hit'
-                            trade['exit_price'] = current_price
-                            trade['exit_time'] = datetime.now()
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'sl_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'sl_hit', current_price
-                                )
-                                trade_copy = trade.copy()
-                                trade_copy['status'] = 'sl_hit'
-                                trade_copy['exit_price'] = current_price
-                                record_signal_for_ai_learning(trade_copy)
-                        # TP1
-                        elif current_price >= trade['tp'][0] and trade.get('status', 'open') == 'open':
-                            pnl_pips = (current_price - trade['entry']) * 10000
-                            logger.info(f"MT5 SIGNAL TP1 HIT: {trade['symbol']} at {current_price:.5f} "
-                                        f"(+{pnl_pips:.1f} pips)")
-                            trade['status'] = 'tp1_hit'
-                            trade['exit_price'] = current_price
-                            trade['exit_time'] = datetime.now()
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'tp1_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'tp1_hit', current_price
-                                )
-                                trade_copy = trade.copy()
-                                trade_copy['status'] = 'tp1_hit'
-                                trade_copy['exit_price'] = current_price
-                                record_signal_for_ai_learning(trade_copy)
-                        # TP2
-                        elif len(trade['tp']) > 1 and current_price >= trade['tp'][1] and trade.get('status', 'open') in ['open', 'tp1_hit']:
-                            pnl_pips = (current_price - trade['entry']) * 10000
-                            logger.info(f"MT5 SIGNAL TP2 HIT: {trade['symbol']} at {current_price:.5f} "
-                                        f"(+{pnl_pips:.1f} pips)")
-                            trade['status'] = 'tp2_hit'
-                            trade['exit_price'] = current_price
-                            trade['exit_time'] = datetime.now()
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'tp2_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'tp2_hit', current_price
-                                )
-                                trade_copy = trade.copy()
-                                trade_copy['status'] = 'tp2_hit'
-                                trade_copy['exit_price'] = current_price
-                                record_signal_for_ai_learning(trade_copy)
-                        # TP3
-                        elif len(trade['tp']) > 2 and current_price >= trade['tp'][2] and trade.get('status', 'open') in ['open', 'tp1_hit', 'tp2_hit']:
-                            pnl_pips = (current_price - trade['entry']) * 10000
-                            logger.info(f"MT5 SIGNAL TP3 HIT: {trade['symbol']} at {current_price:.5f} "
-                                        f"(+{pnl_pips:.1f} pips)")
-                            trade['status'] = 'tp3_hit'
-                            trade['exit_price'] = current_price
-                            trade['exit_time'] = datetime.now()
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'tp3_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'tp3_hit', current_price
-                                )
-                                trade_copy = trade.copy()
-                                trade_copy['status'] = 'tp3_hit'
-                                trade_copy['exit_price'] = current_price
-                                record_signal_for_ai_learning(trade_copy)
-                    elif trade['side'] == 'sell':
-                        if current_price >= trade['sl']:
-                            pnl_pips = (trade['entry'] - current_price) * 10000
-                            logger.info(f"MT5 SIGNAL SL HIT: {trade['symbol']} at {current_price:.5f} "
-                                        f"({pnl_pips:.1f} pips)")
-                            trade['status'] = 'sl_hit'
-                            trade['exit_price'] = current_price
-                            trade['exit_time'] = datetime.now()
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'sl_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'sl_hit', current_price
-                                )
-                        # TP1
-                        elif current_price <= trade['tp'][0] and trade.get('status', 'open') == 'open':
-                            pnl_pips = (trade['entry'] - current_price) * 10000
-                            logger.info(f"MT5 SIGNAL TP1 HIT: {trade['symbol']} at {current_price:.5f} "
-                                        f"(+{pnl_pips:.1f} pips)")
-                            trade['status'] = 'tp1_hit'
-                            trade['exit_price'] = current_price
-                            trade['exit_time'] = datetime.now()
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'tp1_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'tp1_hit', current_price
-                                )
-                        # TP2
-                        elif len(trade['tp']) > 1 and current_price <= trade['tp'][1] and trade.get('status', 'open') in ['open', 'tp1_hit']:
-                            pnl_pips = (trade['entry'] - current_price) * 10000
-                            logger.info(f"MT5 SIGNAL TP2 HIT: {trade['symbol']} at {current_price:.5f} "
-                                        f"(+{pnl_pips:.1f} pips)")
-                            trade['status'] = 'tp2_hit'
-                            trade['exit_price'] = current_price
-                            trade['exit_time'] = datetime.now()
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'tp2_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'tp2_hit', current_price
-                                )
-                        # TP3
-                        elif len(trade['tp']) > 2 and current_price <= trade['tp'][2] and trade.get('status', 'open') in ['open', 'tp1_hit', 'tp2_hit']:
-                            pnl_pips = (trade['entry'] - current_price) * 10000
-                            logger.info(f"MT5 SIGNAL TP3 HIT: {trade['symbol']} at {current_price:.5f} "
-                                        f"(+{pnl_pips:.1f} pips)")
-                            trade['status'] = 'tp3_hit'
-                            trade['exit_price'] = current_price
-                            trade['exit_time'] = datetime.now()
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'tp3_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'tp3_hit', current_price
-                                )
-                            if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
-                                self.analytics.update_signal_outcome(
-                                    trade['analytics_id'], 'tp_hit', current_price
-                                )
-                                performance_monitor.record_trade_outcome(
-                                    trade['analytics_id'], 'tp_hit', current_price
-                                )
-                        
+                for trade, outcome in self.level_index.update(symbol, current_price):
+                    self.record_trade_exit(trade, outcome, current_price)
+
         except Exception as e:
             logger.error(f"Real-time MT5 signal check error for {symbol}: {e}")
-    
+
+    def mark_open_trades(self):
+        """Mark every open trade to market in one pass. Trailed stops (only with
+        TRAIL_STOPS_ENABLED) are announced and re-indexed."""
+        try:
+            with self.trade_lock:
+                symbols = {t.symbol for t in open_trades}
+            if not symbols:
+                return
+            # Price fetches can hit the network - keep them outside the trade lock
+            prices = {symbol: get_current_price(symbol) for symbol in symbols}
+            with self.trade_lock:
+                trades = list(open_trades)
+                if not trades:
+                    return
+                marks = pnl_engine.mark(trades, prices)
+                if not pnl_engine.apply_trailing:
+                    for trade, sl, candidate_sl in marks['candidates']:
+                        logger.debug(f"Trail candidate: {trade['symbol']} SL {sl:.5f} -> {candidate_sl:.5f}")
+                for trade, old_sl, new_sl in marks['trailed']:
+                    logger.info(f"TRAIL STOP: {trade['symbol']} SL moved {old_sl:.5f} -> {new_sl:.5f}")
+                    trade['trailed'] = True
+                    self.level_index.remove(trade)
+                    self.level_index.add(trade)
+            for trade, old_sl, new_sl in marks['trailed']:
+                send_trade_update(trade, 'sl_trailed')
+        except Exception as e:
+            logger.error(f"Trade mark-to-market error: {e}")
+
+    def record_trade_exit(self, trade, outcome, current_price):
+        """Close a trade at an SL/TP hit and report the outcome"""
+        pips = pnl_pips(trade['symbol'], trade['side'], trade['entry'], current_price)
+        # A stop that was trailed into profit is a win, not a stop-out
+        if outcome == 'sl_hit' and trade.get('trailed') and pips > 0:
+            outcome = 'trailed_profit'
+        level = {'sl_hit': 'SL', 'trailed_profit': 'TRAILED SL'}.get(outcome) or outcome.split('_')[0].upper()
+        logger.info(f"MT5 SIGNAL {level} HIT: {trade['symbol']} at {current_price:.5f} "
+                    f"({pips:+.1f} pips)")
+        # Finished trades leave the book for the on-disk archive
+        trade = open_trades.close(trade, outcome, current_price)
+        if ADVANCED_FEATURES and self.analytics and 'analytics_id' in trade:
+            self.analytics.update_signal_outcome(
+                trade['analytics_id'], outcome, current_price
+            )
+            performance_monitor.record_trade_outcome(
+                trade['analytics_id'], outcome, current_price
+            )
+            record_signal_for_ai_learning(trade)
+
     def generate_and_process_signals(self, df, symbol, tf):
         """Generate and process MT5-based signals with comprehensive analysis and validation"""
+        signals = self.generate_candidate_signals(df, symbol, tf)
+        if not signals:
+            logger.debug(f"[SignalGen] No signals to process for {symbol} {tf}")
+            return
+        self.process_signals(signals, df, symbol, tf)
+
+    def generate_candidate_signals(self, df, symbol, tf):
+        """Raw strategy signals for one frame, before any validation"""
         try:
-            ema_20 = df['close'].rolling(20).mean().iloc[-1]
-            ema_50 = df['close'].rolling(50).mean().iloc[-1]
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-            rs = gain / (loss + 1e-9)
-            rsi = 100 - (100 / (1 + rs))
-            rsi_last = rsi.iloc[-1]
-            current_price = df['close'].iloc[-1]
+            # Shared per-bar features - smc_utils reuses the same computation
+            features = get_features(symbol, tf, df)
+            ema_20 = features['ma20']
+            ema_50 = features['ma50']
+            rsi_last = features['rsi14']
+            current_price = features['close']
             logger.debug(f"[SignalGen] Checking for signal: {symbol} {tf} | Price: {current_price}, EMA20: {ema_20}, EMA50: {ema_50}, RSI: {rsi_last}")
 
             # --- Support/Resistance Detection ---
-            def detect_support_resistance(df, window=20):
-                support = df['low'].rolling(window).min().iloc[-1]
-                resistance = df['high'].rolling(window).max().iloc[-1]
-                return support, resistance
-
-            support, resistance = detect_support_resistance(df, window=20)
+            support, resistance = features['support'], features['resistance']
             logger.debug(f"[SignalGen] Support: {support}, Resistance: {resistance}")
 
             signals = []
@@ -534,10 +523,121 @@ class MT5SignalBot:
                         bearish_signal['resistance'] = resistance
                         signals.append(bearish_signal)
             
-            if not signals:
-                logger.debug(f"[SignalGen] No signals to process for {symbol} {tf}")
-                return
-
+            return signals
+        except Exception as e:
+            logger.error(f"MT5 signal generation error for {symbol} {tf}: {e}")
+            return []
+
+    def build_signal_pipeline(self):
+        """Validation stages with their starting cost/selectivity hints; the
+        pipeline reorders them from measurements"""
+        pipeline = SignalPipeline()
+        if not ADVANCED_FEATURES:
+            return pipeline
+        pipeline.add_stage(Stage('correlation', self.stage_correlation, cost_ms=2, reject_rate=0.1))
+        pipeline.add_stage(Stage('session', self.stage_session, cost_ms=1, reject_rate=0.05, after=['correlation']))
+        pipeline.add_stage(Stage('risk', self.stage_risk, cost_ms=1, reject_rate=0.1, after=['session']))
+        if self.signal_filter:
+            pipeline.add_stage(Stage('quality_precheck', self.signal_filter.precheck_signal, cost_ms=2,
+                                     reject_rate=0.2, after=['session']))
+        if self.tp_calculator:
+            # Network-bound; runs once the cheap stages have let the signal through
+            pipeline.add_stage(Stage('tp_probability', self.stage_tp_probability, cost_ms=500,
+                                     reject_rate=0.0, after=['session']))
+        if self.signal_filter:
+            pipeline.add_stage(Stage('quality', self.stage_quality_filter, cost_ms=2, reject_rate=0.3,
+                                     after=['tp_probability', 'quality_precheck']))
+        return pipeline
+
+    def stage_correlation(self, signal):
+        correlation_advice = get_correlation_advice(signal, open_trades)
+        signal['correlation_advice'] = correlation_advice
+        if correlation_advice['advice'] == 'AVOID':
+            return False, f"Correlation: {correlation_advice['reason']}"
+
+        # Apply correlation adjustments
+        if 'adjustments' in correlation_advice:
+            adjustments = correlation_advice['adjustments']
+            if 'confidence_adjustment' in adjustments:
+                original_conf = signal.get('confidence', 0.8)
+                signal['confidence'] = max(0.1, original_conf + adjustments['confidence_adjustment'])
+        return True, correlation_advice['advice']
+
+    def stage_session(self, signal):
+        symbol = signal['symbol']
+        session_recommendation = get_trading_recommendation(symbol)
+        signal['session_analysis'] = session_recommendation
+
+        # Only block trading in CRITICAL conditions, allow all others in signal-only mode
+        if session_recommendation['action'] == 'AVOID_TRADING' and 'CRITICAL' in session_recommendation.get('recommendation', ''):
+            return False, f"Session: {session_recommendation['recommendation']}"
+        elif session_recommendation['action'] == 'AVOID_TRADING':
+            # In signal-only mode, still send signals but with session warning
+            logger.info(f"⚠️ SESSION WARNING: {symbol} - {session_recommendation['recommendation']} (Signal still sent)")
+
+        # Apply session multipliers
+        session_multipliers = get_session_multipliers(symbol)
+        signal['session_multipliers'] = session_multipliers
+
+        if 'tp_probability' in signal:
+            original_prob = signal['tp_probability']
+            signal['tp_probability'] = min(99, max(1, original_prob * session_multipliers['multipliers']['probability_multiplier']))
+
+        if 'confidence' in signal:
+            boost = session_multipliers['multipliers']['confidence_boost']
+            signal['confidence'] = min(1.0, signal['confidence'] + boost)
+        return True, session_recommendation['action']
+
+    def stage_risk(self, signal):
+        risk_valid, risk_message = validate_trade_risk(signal, account_info['balance'] if account_info else 0, open_trades)
+        signal['risk_validation'] = {'valid': risk_valid, 'message': risk_message}
+        if not risk_valid:
+            return False, f"Risk: {risk_message}"
+
+        # Calculate optimal position size
+        optimal_size = calculate_optimal_position_size(signal, account_info['balance'] if account_info else 1000, open_trades)
+        signal['position_size'] = optimal_size
+
+        # Apply correlation position size adjustment
+        if 'correlation_advice' in signal and 'adjustments' in signal['correlation_advice']:
+            pos_multiplier = signal['correlation_advice']['adjustments'].get('position_size_multiplier', 1.0)
+            signal['position_size'] *= pos_multiplier
+        return True, risk_message
+
+    def stage_tp_probability(self, signal):
+        symbol, tf = signal['symbol'], signal['tf']
+        tp_price = signal['tp'][0] if isinstance(signal['tp'], list) else signal['tp']
+        probability_analysis = self.tp_calculator.calculate_comprehensive_tp_probability(
+            symbol, signal['entry'], tp_price, signal['sl'],
+            signal['side'], tf, signal.get('confidence', 0.75)
+        )
+        signal['tp_final_probability'] = probability_analysis['final_probability']
+        signal['tp_probability'] = probability_analysis['probability_percent']
+        signal['expected_value'] = probability_analysis['expected_value']
+        signal['recommendation'] = probability_analysis['recommendation']
+
+        # === AI ADJUSTMENTS ===
+        ai_adjustments = get_ai_probability_adjustments(symbol, tf)
+        if ai_adjustments:
+            adjusted_prob = probability_analysis['probability_percent'] * ai_adjustments.get('probability_multiplier', 1.0)
+            signal['tp_probability'] = max(1, min(99, adjusted_prob))
+            signal['ai_adjusted'] = True
+            logger.info(f"🤖 AI ADJUSTMENT: {symbol} probability adjusted from {probability_analysis['probability_percent']:.1f}% to {signal['tp_probability']:.1f}%")
+
+        logger.info(f"🎯 TP PROBABILITY: {signal['tp_probability']}% for {symbol} {signal['side'].upper()}")
+        logger.info(f"💡 RECOMMENDATION: {signal['recommendation']}")
+        return True, signal['recommendation']
+
+    def stage_quality_filter(self, signal):
+        filter_passed, filter_message = self.signal_filter.filter_signal(signal)
+        if filter_passed:
+            logger.info(f"✅ SIGNAL QUALITY CHECK PASSED: {signal['symbol']}")
+        return filter_passed, filter_message
+
+    def process_signals(self, signals, df, symbol, tf):
+        """Validate, enrich and deliver signals for a symbol; `tf` and `df` belong to
+        the timeframe the signals were built on"""
+        try:
             key = (symbol, tf)
             now = time.time()
 
@@ -560,115 +660,19 @@ class MT5SignalBot:
                 signal['account_balance'] = account_info['balance'] if account_info else 0
                 signal['server'] = account_info['server'] if account_info else 'Unknown'
 
-                # === 1. CORRELATION ANALYSIS ===
-                if ADVANCED_FEATURES:
-                    correlation_advice = get_correlation_advice(signal, open_trades)
-                    signal['correlation_advice'] = correlation_advice
-                    
-                    if correlation_advice['advice'] == 'AVOID':
-                        logger.warning(f"🚫 CORRELATION BLOCK: {symbol} - {correlation_advice['reason']}")
-                        performance_monitor.record_signal_filtered(signal, f"Correlation: {correlation_advice['reason']}")
-                        continue
-                    
-                    # Apply correlation adjustments
-                    if 'adjustments' in correlation_advice:
-                        adjustments = correlation_advice['adjustments']
-                        if 'confidence_adjustment' in adjustments:
-                            original_conf = signal.get('confidence', 0.8)
-                            signal['confidence'] = max(0.1, original_conf + adjustments['confidence_adjustment'])
-
-                # === 2. SESSION ANALYSIS ===
-                if ADVANCED_FEATURES:
-                    session_recommendation = get_trading_recommendation(symbol)
-                    signal['session_analysis'] = session_recommendation
-                    
-                    # Only block trading in CRITICAL conditions, allow all others in signal-only mode
-                    if session_recommendation['action'] == 'AVOID_TRADING' and 'CRITICAL' in session_recommendation.get('recommendation', ''):
-                        logger.warning(f"🚫 SESSION BLOCK: {symbol} - {session_recommendation['recommendation']}")
-                        performance_monitor.record_signal_filtered(signal, f"Session: {session_recommendation['recommendation']}")
-                        continue
-                    elif session_recommendation['action'] == 'AVOID_TRADING':
-                        # In signal-only mode, still send signals but with session warning
-                        logger.info(f"⚠️ SESSION WARNING: {symbol} - {session_recommendation['recommendation']} (Signal still sent)")
-                    
-                    # Apply session multipliers
-                    session_multipliers = get_session_multipliers(symbol)
-                    signal['session_multipliers'] = session_multipliers
-                    
-                    if 'tp_probability' in signal:
-                        original_prob = signal['tp_probability']
-                        signal['tp_probability'] = min(99, max(1, original_prob * session_multipliers['multipliers']['probability_multiplier']))
-                    
-                    if 'confidence' in signal:
-                        boost = session_multipliers['multipliers']['confidence_boost']
-                        signal['confidence'] = min(1.0, signal['confidence'] + boost)
-
-                # === 3. RISK VALIDATION ===
-                if ADVANCED_FEATURES:
-                    risk_valid, risk_message = validate_trade_risk(signal, account_info['balance'] if account_info else 0, open_trades)
-                    signal['risk_validation'] = {'valid': risk_valid, 'message': risk_message}
-                    
-                    if not risk_valid:
-                        logger.warning(f"🚫 RISK BLOCK: {symbol} - {risk_message}")
-                        performance_monitor.record_signal_filtered(signal, f"Risk: {risk_message}")
-                        continue
-                    
-                    # Calculate optimal position size
-                    optimal_size = calculate_optimal_position_size(signal, account_info['balance'] if account_info else 1000, open_trades)
-                    signal['position_size'] = optimal_size
-                    
-                    # Apply correlation position size adjustment
-                    if 'correlation_advice' in signal and 'adjustments' in signal['correlation_advice']:
-                        pos_multiplier = signal['correlation_advice']['adjustments'].get('position_size_multiplier', 1.0)
-                        signal['position_size'] *= pos_multiplier
-
                 price_diff = abs(signal['entry'] - signal['current_price']) / signal['current_price']
                 if price_diff > 0.01:
                     logger.warning(f"Large price difference detected for {symbol}: "
                                  f"Signal: {signal['entry']:.5f}, Current: {signal['current_price']:.5f}")
 
-                tp_probability = 0.75
-                probability_analysis = None
-
-                # === 4. TP PROBABILITY CALCULATION ===
-                if ADVANCED_FEATURES and self.tp_calculator:
-                    try:
-                        tp_price = signal['tp'][0] if isinstance(signal['tp'], list) else signal['tp']
-                        probability_analysis = self.tp_calculator.calculate_comprehensive_tp_probability(
-                            symbol, signal['entry'], tp_price, signal['sl'],
-                            signal['side'], tf, signal.get('confidence', 0.75)
-                        )
-                        tp_probability = probability_analysis['final_probability']
-                        signal['tp_probability'] = probability_analysis['probability_percent']
-                        signal['expected_value'] = probability_analysis['expected_value']
-                        signal['recommendation'] = probability_analysis['recommendation']
-
-                        # === 5. AI ADJUSTMENTS ===
-                        ai_adjustments = get_ai_probability_adjustments(symbol, tf)
-                        if ai_adjustments:
-                            adjusted_prob = probability_analysis['probability_percent'] * ai_adjustments.get('probability_multiplier', 1.0)
-                            signal['tp_probability'] = max(1, min(99, adjusted_prob))
-                            signal['ai_adjusted'] = True
-                            logger.info(f"🤖 AI ADJUSTMENT: {symbol} probability adjusted from {probability_analysis['probability_percent']:.1f}% to {signal['tp_probability']:.1f}%")
-
-                        logger.info(f"🎯 TP PROBABILITY: {signal['tp_probability']}% for {symbol} {signal['side'].upper()}")
-                        logger.info(f"💡 RECOMMENDATION: {signal['recommendation']}")
-
-                    except Exception as e:
-                        logger.warning(f"TP probability calculation error: {e}")
-
-                # === 6. SMART SIGNAL FILTERING ===
-                if ADVANCED_FEATURES and self.signal_filter:
-                    try:
-                        filter_passed, filter_message = self.signal_filter.filter_signal(signal)
-                        if not filter_passed:
-                            logger.warning(f"🚫 SIGNAL FILTERED: {symbol} - {filter_message}")
-                            performance_monitor.record_signal_filtered(signal, filter_message)
-                            continue
-                        else:
-                            logger.info(f"✅ SIGNAL QUALITY CHECK PASSED: {symbol}")
-                    except Exception as e:
-                        logger.warning(f"Signal filter error: {e}")
+                # === 1-6. VALIDATION PIPELINE (cheapest, most selective stages first) ===
+                passed, stage, reason = self.signal_pipeline.run(signal)
+                if not passed:
+                    logger.warning(f"🚫 {stage.upper()} BLOCK: {symbol} - {reason}")
+                    if ADVANCED_FEATURES:
+                        performance_monitor.record_signal_filtered(signal, f"{stage}: {reason}")
+                    continue
+                tp_probability = signal.get('tp_final_probability', 0.75)
 
                 # === 7. FINAL SIGNAL VALIDATION ===
                 logger.info(f"NEW ENHANCED SIGNAL: {signal['order_type']} {signal['symbol']} {signal['tf']} "
@@ -683,7 +687,8 @@ class MT5SignalBot:
                         performance_monitor.record_signal_sent(signal)
 
                     with self.trade_lock:
-                        open_trades.append(signal)
+                        trade = open_trades.open(signal)
+                        self.level_index.add(trade)
 
                     if ADVANCED_FEATURES and self.analytics:
                         tp_price = signal['tp'][0] if isinstance(signal['tp'], list) else signal['tp']
@@ -697,14 +702,80 @@ class MT5SignalBot:
                             signal.get('confidence', 0.8)
                         )
                         signal['analytics_id'] = signal_id
+                        trade['analytics_id'] = signal_id
 
                     logger.info(f"ENHANCED SIGNAL SENT: {signal['order_type']} {signal['symbol']} {signal['tf']}")
 
             last_alert_time[key] = now
+            # Timeframes merged into a confluence signal share its cooldown
+            for signal in signals:
+                for merged_tf in signal.get('confluence', {}).get('timeframes', []):
+                    last_alert_time[(symbol, merged_tf)] = now
 
         except Exception as e:
             logger.error(f"MT5 signal processing error for {symbol} {tf}: {e}")
     
+    def process_frame_batch(self, batch):
+        """Gate a batch of (symbol, tf, df) in one kernel call per timeframe, then
+        merge each symbol's candidates across timeframes and run the full signal
+        pipeline once per merged signal. Frames whose closed bars and in-progress
+        bar are unchanged since the last scan are skipped."""
+        by_tf = {}
+        for symbol, tf, df in batch:
+            if symbol in ['BTCUSD', 'XAUUSD'] and tf in TIMEFRAMES and df is not None and len(df):
+                if analysis_memo.unchanged(symbol, tf, df):
+                    logger.debug(f"[SignalGen] {symbol} {tf} unchanged since last scan - skipped")
+                    continue
+                by_tf.setdefault(tf, []).append((symbol, df))
+
+        candidates = {}  # symbol -> {tf: [signals]}; frames failing the gates count as no signal
+        frames = {}
+        for tf, entries in by_tf.items():
+            passed = gate_frames([df for _, df in entries])
+            logger.debug(f"[SignalGen] {tf}: {sum(passed)}/{len(entries)} symbols passed the batch gates")
+            for (symbol, df), ok in zip(entries, passed):
+                frames[(symbol, tf)] = df
+                if ok:
+                    logger.info(f"[DEBUG]     Generating signals for {symbol} {tf}")
+                candidates.setdefault(symbol, {})[tf] = self.generate_candidate_signals(df, symbol, tf) if ok else []
+
+        for symbol, fresh in candidates.items():
+            bar_times = {tf: int(frames[(symbol, tf)]['open_time'].iat[-1]) for tf in fresh
+                         if 'open_time' in frames[(symbol, tf)].columns}
+            for signal in confluence_evaluator.evaluate(symbol, fresh, bar_times):
+                self.process_signals([signal], frames[(symbol, signal['tf'])], symbol, signal['tf'])
+
+    def scan_request_cost(self, symbol):
+        """Data requests one scan of a symbol makes: the base M1 refresh, a native
+        fetch per timeframe the base history can't derive yet, the live price read
+        and the pre-signal bars"""
+        native = sum(1 for tf in TIMEFRAMES if tf in TF_MAP and not resampler.can_derive(symbol, TF_MAP[tf]))
+        pre_signal = 1 if ADVANCED_FEATURES and self.pre_signal_alert else 0
+        return 1 + native + 1 + pre_signal
+
+    def update_scan_priorities(self, symbols):
+        """Re-score scanned symbols from the features already computed this cycle"""
+        for symbol in symbols:
+            for tf in TIMEFRAMES:
+                cached = feature_engine.latest.get((symbol, tf))
+                if cached:
+                    features = cached[1]
+                    self.prioritizer.update_score(symbol, close=features['close'], atr=features['atr14'],
+                                                  support=features['support'], resistance=features['resistance'])
+                    break  # the fastest timeframe with features is the most current
+
+    def refresh_watched_levels(self):
+        """Intrabar triggers: open trades' SL/TP and each timeframe's support/resistance"""
+        for symbol in SYMBOLS:
+            levels = {f"trade{id(trade)}_{level}": price for price, trade, level in self.level_index.levels(symbol)}
+            for tf in TIMEFRAMES:
+                cached = feature_engine.latest.get((symbol, tf))
+                if cached:
+                    levels[f"{tf}_support"] = cached[1]['support']
+                    levels[f"{tf}_resistance"] = cached[1]['resistance']
+            self.scheduler.watch_levels(symbol, {name: level for name, level in levels.items()
+                                                 if level is not None and level == level})
+
     def scan_realtime(self):
         """Main MT5 real-time scanning loop"""
         self.running = True
@@ -722,6 +793,7 @@ class MT5SignalBot:
         last_correlation_update = time.time()
         correlation_update_interval = 7200  # Update every 2 hours
         
+        requested = list(SYMBOLS)  # the first pass asks for everything
         while self.running:
             loop_start_time = time.time()
             try:
@@ -739,8 +811,25 @@ class MT5SignalBot:
                     time.sleep(60)
                     continue
 
-                # Main MT5 scanning loop
-                for symbol in SYMBOLS:
+                # Hot symbols and event-requested ones first, within the request budget
+                scan_symbols = self.prioritizer.select(requested)
+                requested = []
+
+                # Fire every fetch for this cycle at once; a symbol whose previous
+                # fetch is still running is skipped instead of queued twice
+                cycle_deadline = time.time() + FETCH_DEADLINE
+                futures = {}
+                for symbol in scan_symbols:
+                    pending = self.pending_fetches.get(symbol)
+                    if pending is not None and not pending.done():
+                        logger.warning(f"[DEBUG] Previous fetch for {symbol} still running - skipping")
+                        continue
+                    future = self.fetch_executor.submit(self.fetch_symbol_frames, symbol, cycle_deadline)
+                    self.pending_fetches[symbol] = future
+                    futures[future] = symbol
+
+                # Trade and pre-signal checks run while the fetches are in flight
+                for symbol in scan_symbols:
                     logger.info(f"[DEBUG] Scanning symbol: {symbol}")
                     # Real-time signal monitoring with MT5 prices
                     self.check_trades_realtime(symbol)
@@ -748,26 +837,39 @@ class MT5SignalBot:
                     # Pre-signal alert monitoring (1-minute advance warning)
                     if ADVANCED_FEATURES and self.pre_signal_alert:
                         try:
-                            self.pre_signal_alert.check_pre_signal_conditions(symbol)
+                            conditions = self.pre_signal_alert.check_pre_signal_conditions(symbol)
+                            if conditions:
+                                self.prioritizer.update_score(symbol, probability=conditions['signal_probability'] / 100)
                         except Exception as e:
                             logger.warning(f"Pre-signal alert error for {symbol}: {e}")
 
-                    # Data analysis and signal generation with MT5 data
-                    for tf in TIMEFRAMES:
-                        logger.info(f"[DEBUG]   Timeframe: {tf}")
-                        tf_minutes = TF_MAP.get(tf)
-                        if tf_minutes is None:
-                            continue
-
-                        # Fetch REAL MT5 data
-                        df = self.safe_fetch_mt5_data(symbol, tf_minutes)
-                        if df is None:
-                            logger.warning(f"[DEBUG]     No data for {symbol} {tf}")
+                self.mark_open_trades()
+
+                # Data analysis in micro-batches: frames that complete close together are
+                # gated in one vectorized call, and only passing frames are processed
+                pending = set(futures)
+                while pending:
+                    done, pending = wait(pending, timeout=max(0, cycle_deadline - time.time()),
+                                         return_when=FIRST_COMPLETED)
+                    if not done:
+                        late = [futures[f] for f in pending]
+                        logger.warning(f"[DEBUG] Fetch deadline ({FETCH_DEADLINE}s) missed for: {', '.join(late)}")
+                        break
+                    if pending and BATCH_WINDOW > 0:
+                        more, pending = wait(pending, timeout=min(BATCH_WINDOW, max(0, cycle_deadline - time.time())))
+                        done |= more
+                    batch = []
+                    for future in done:
+                        symbol = futures[future]
+                        try:
+                            frames = future.result()
+                        except Exception as e:
+                            logger.warning(f"[DEBUG] Fetch failed for {symbol}: {e}")
                             continue
+                        batch.extend((symbol, tf, df) for tf, df in frames.items())
+                    self.process_frame_batch(batch)
 
-                        logger.info(f"[DEBUG]     Generating signals for {symbol} {tf}")
-                        # Generate signals using MT5 data
-                        self.generate_and_process_signals(df, symbol, tf)
+                self.update_scan_priorities(scan_symbols)
 
                 # Reset error counter
                 consecutive_errors = 0
@@ -778,6 +880,10 @@ class MT5SignalBot:
                     try:
                         report = performance_monitor.generate_performance_report()
                         logger.info(report)
+                        logger.info(f"🧠 Analysis memo: {analysis_memo.get_stats()}")
+                        logger.info(f"⏱️ Signal pipeline: {self.signal_pipeline.get_stats()}")
+                        logger.info(f"📏 Intrabar resolver: {self.intrabar_resolver.get_stats()}")
+                        logger.info(f"💹 Open P&L: {pnl_engine.get_stats()}")
                         last_performance_report = current_time
                     except Exception as e:
                         logger.warning(f"Performance report error: {e}")
@@ -793,10 +899,17 @@ class MT5SignalBot:
                     except Exception as e:
                         logger.warning(f"Correlation update error: {e}")
 
-                # Sleep
-                loop_duration = time.time() - loop_start_time
-                sleep_time = max(1, SCAN_INTERVAL - loop_duration)
-                time.sleep(sleep_time)
+                # Wait for the next bar close / level cross, or sleep out the polling interval
+                if self.scheduler:
+                    self.refresh_watched_levels()
+                    events = self.scheduler.wait_for_events(timeout=self.prioritizer.next_due_in())
+                    requested = sorted({event.symbol for event in events})
+                    logger.debug(f"[Scheduler] Woke for {len(events)} events: "
+                                 f"{sorted({event.reason for event in events})}")
+                else:
+                    loop_duration = time.time() - loop_start_time
+                    sleep_time = max(1, SCAN_INTERVAL - loop_duration)
+                    time.sleep(sleep_time)
                 
             except KeyboardInterrupt:
                 logger.info("KEYBOARD: Interrupt received, shutting down MT5 bot...")
@@ -825,6 +938,10 @@ class MT5SignalBot:
             except Exception as e:
                 logger.error(f"Error saving performance data: {e}")
         
+        self.fetch_executor.shutdown(wait=False, cancel_futures=True)
+        if market_stream:
+            market_stream.stop()
+        self.save_indicator_state()
         shutdown_mt5()
         send_system_alert("STOP: MT5 Signal Bot Stopped", "INFO")
 
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Cost-Ordered Signal Pipeline
+Runs signal validation as a declarative list of stages, cheapest and most
+selective first, stopping at the first rejection so expensive work only runs
+for signals that survive the cheap filters. Every stage keeps a latency
+histogram and reject counts.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+PRIOR_RUNS = 20  # weight of the declared hints until enough runs are measured
+COST_ALPHA = 0.2
+
+
+class Stage:
+    def __init__(self, name: str, run: Callable[[Dict], Tuple[bool, str]], cost_ms: float = 1.0,
+                 reject_rate: float = 0.1, after: Iterable[str] = ()):
+        """run(signal) -> (passed, reason) and may enrich the signal in place.
+        cost_ms and reject_rate are starting hints, replaced by measurements;
+        `after` names stages whose output this one reads."""
+        self.name = name
+        self.run = run
+        self.after = tuple(after)
+        self.hint_reject_rate = reject_rate
+        self.cost_ms = cost_ms
+        self.runs = 0
+        self.rejects = 0
+        self.errors = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    @property
+    def reject_rate(self) -> float:
+        return (self.rejects + self.hint_reject_rate * PRIOR_RUNS) / (self.runs + PRIOR_RUNS)
+
+    @property
+    def rank(self) -> float:
+        """Expected cost per rejection: lower runs earlier"""
+        return self.cost_ms / max(self.reject_rate, 0.01)
+
+    def record(self, elapsed_ms: float, passed: bool):
+        self.runs += 1
+        if not passed:
+            self.rejects += 1
+        self.cost_ms += COST_ALPHA * (elapsed_ms - self.cost_ms)
+        bucket = next((i for i, edge in enumerate(LATENCY_BUCKETS_MS) if elapsed_ms < edge), len(LATENCY_BUCKETS_MS))
+        self.histogram[bucket] += 1
+
+
+class SignalPipeline:
+    def __init__(self, stages: Iterable[Stage] = ()):
+        self.stages: List[Stage] = list(stages)
+        self.lock = threading.Lock()
+
+    def add_stage(self, stage: Stage):
+        self.stages.append(stage)
+
+    def order(self) -> List[Stage]:
+        """Lowest rank first, never before the stages it runs after"""
+        with self.lock:
+            remaining = sorted(self.stages, key=lambda s: s.rank)
+        known = {s.name for s in remaining}
+        ordered, done = [], set()
+        while remaining:
+            ready = next((s for s in remaining if all(d in done or d not in known for d in s.after)), remaining[0])
+            remaining.remove(ready)
+            ordered.append(ready)
+            done.add(ready.name)
+        return ordered
+
+    def run(self, signal: Dict) -> Tuple[bool, Optional[str], str]:
+        """(passed, rejecting stage name, reason). A stage that raises is logged
+        and treated as passed, like the inline checks it replaces."""
+        for stage in self.order():
+            started = time.perf_counter()
+            try:
+                passed, reason = stage.run(signal)
+            except Exception as e:
+                logger.warning(f"Pipeline stage {stage.name} error: {e}")
+                passed, reason = True, f"error: {e}"
+                with self.lock:
+                    stage.errors += 1
+            with self.lock:
+                stage.record((time.perf_counter() - started) * 1000, passed)
+            if not passed:
+                return False, stage.name, reason
+        return True, None, 'passed'
+
+    def get_stats(self) -> Dict:
+        """Per-stage runs, rejects, average cost and latency histogram"""
+        labels = [f"<{edge}ms" for edge in LATENCY_BUCKETS_MS] + [f">={LATENCY_BUCKETS_MS[-1]}ms"]
+        with self.lock:
+            return {s.name: {'runs': s.runs, 'rejects': s.rejects, 'errors': s.errors,
+                             'reject_rate': round(s.reject_rate, 3), 'avg_ms': round(s.cost_ms, 2),
+                             'histogram': {label: n for label, n in zip(labels, s.histogram) if n}}
+                    for s in self.stages}
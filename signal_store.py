@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+SQLite Signal Store
+Embedded WAL-mode store for analytics signals and their outcomes. Each new
+signal or outcome is one indexed row write instead of a rewrite of the whole
+history, and readers query just the rows they need
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SIGNAL_DB_FILE = os.getenv('SIGNAL_DB_FILE', 'signals.db')
+LEGACY_SIGNALS_FILE = 'advanced_signals.json'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS signals (
+    id INTEGER PRIMARY KEY,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    entry_price REAL NOT NULL,
+    stop_loss REAL,
+    take_profit REAL,
+    timeframe TEXT,
+    confidence REAL,
+    timestamp TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    risk_reward_ratio REAL,
+    market_condition TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_signals_status ON signals (status, id);
+CREATE INDEX IF NOT EXISTS idx_signals_symbol_status ON signals (symbol, status);
+CREATE TABLE IF NOT EXISTS outcomes (
+    signal_id INTEGER PRIMARY KEY REFERENCES signals (id),
+    outcome TEXT NOT NULL,
+    exit_price REAL,
+    pnl_pips REAL,
+    duration_minutes INTEGER,
+    closed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outcomes_outcome ON outcomes (outcome);
+"""
+
+SIGNAL_COLUMNS = ('id', 'symbol', 'side', 'entry_price', 'stop_loss', 'take_profit', 'timeframe',
+                  'confidence', 'timestamp', 'status', 'risk_reward_ratio', 'market_condition')
+OUTCOME_COLUMNS = ('outcome', 'exit_price', 'pnl_pips', 'duration_minutes', 'closed_at')
+
+# Fixed statement text, so sqlite3's statement cache prepares each one only once
+INSERT_SIGNAL = f"INSERT INTO signals ({', '.join(SIGNAL_COLUMNS)}) VALUES ({', '.join('?' * len(SIGNAL_COLUMNS))})"
+CLOSE_SIGNAL = "UPDATE signals SET status = 'closed' WHERE id = ? AND status = 'active'"
+INSERT_OUTCOME = f"INSERT OR REPLACE INTO outcomes (signal_id, {', '.join(OUTCOME_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)"
+SELECT_SIGNALS = (f"SELECT s.{', s.'.join(SIGNAL_COLUMNS)}, o.{', o.'.join(OUTCOME_COLUMNS)} "
+                  "FROM signals s LEFT JOIN outcomes o ON o.signal_id = s.id")
+
+
+class SignalStore:
+    def __init__(self, path: str = SIGNAL_DB_FILE, legacy_file: Optional[str] = LEGACY_SIGNALS_FILE):
+        """The database is opened on first use; an empty one imports legacy_file once"""
+        self.path = path
+        self.legacy_file = legacy_file
+        self.conn: Optional[sqlite3.Connection] = None
+        self.lock = threading.Lock()
+        self.stats = {'inserts': 0, 'outcomes': 0, 'queries': 0}
+
+    def _db(self) -> sqlite3.Connection:
+        """Connection, created with the schema on first use (caller holds the lock)"""
+        if self.conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self.conn = conn
+            self._import_legacy()
+        return self.conn
+
+    def _import_legacy(self):
+        if not self.legacy_file or not os.path.exists(self.legacy_file):
+            return
+        if self.conn.execute("SELECT 1 FROM signals LIMIT 1").fetchone():
+            return
+        try:
+            with open(self.legacy_file, 'r') as f:
+                signals = json.load(f)
+            with self.conn:
+                for signal in signals:
+                    self.conn.execute(INSERT_SIGNAL, [signal.get(c) for c in SIGNAL_COLUMNS])
+                    if signal.get('outcome') is not None:
+                        self.conn.execute(INSERT_OUTCOME, [signal['id']] + [signal.get(c) for c in OUTCOME_COLUMNS])
+            logger.info(f"📦 Imported {len(signals)} signals from {self.legacy_file}")
+        except Exception as e:
+            logger.warning(f"Could not import {self.legacy_file}: {e}")
+
+    def add_signal(self, signal: Dict) -> int:
+        """Insert a signal dict (SIGNAL_COLUMNS keys; id may be omitted) and return its id"""
+        values = [signal.get(c) for c in SIGNAL_COLUMNS]
+        with self.lock:
+            db = self._db()
+            with db:
+                cursor = db.execute(INSERT_SIGNAL, values)
+            self.stats['inserts'] += 1
+            return cursor.lastrowid
+
+    def record_outcome(self, signal_id: int, outcome: str, exit_price: float, pnl_pips: float,
+                       duration_minutes: int, closed_at: str) -> bool:
+        """Close an active signal with its outcome; False when it isn't active"""
+        with self.lock:
+            db = self._db()
+            with db:
+                if db.execute(CLOSE_SIGNAL, (signal_id,)).rowcount == 0:
+                    return False
+                db.execute(INSERT_OUTCOME, (signal_id, outcome, exit_price, pnl_pips, duration_minutes, closed_at))
+            self.stats['outcomes'] += 1
+            return True
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[sqlite3.Row]:
+        with self.lock:
+            self.stats['queries'] += 1
+            return self._db().execute(sql, params).fetchall()
+
+    def get_signal(self, signal_id: int) -> Optional[Dict]:
+        rows = self._query(SELECT_SIGNALS + " WHERE s.id = ?", (signal_id,))
+        return dict(rows[0]) if rows else None
+
+    def signals(self, status: Optional[str] = None, symbol: Optional[str] = None,
+                since: Optional[str] = None, limit: Optional[int] = None, newest_first: bool = False) -> List[Dict]:
+        """Signals in the advanced_signals.json shape, filtered on indexed columns"""
+        clauses, params = [], []
+        for column, value in (('s.status = ?', status), ('s.symbol = ?', symbol), ('s.timestamp > ?', since)):
+            if value is not None:
+                clauses.append(column)
+                params.append(value)
+        sql = SELECT_SIGNALS + (" WHERE " + " AND ".join(clauses) if clauses else "")
+        sql += " ORDER BY s.id DESC" if newest_first else " ORDER BY s.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._query(sql, tuple(params))]
+
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return self._query("SELECT COUNT(*) FROM signals")[0][0]
+        return self._query("SELECT COUNT(*) FROM signals WHERE status = ?", (status,))[0][0]
+
+    def pnl_totals(self) -> Tuple[float, float]:
+        """(sum of winning pips, sum of losing pips as a positive number) over closed signals"""
+        row = self._query("SELECT COALESCE(SUM(CASE WHEN pnl_pips > 0 THEN pnl_pips END), 0), "
+                          "COALESCE(-SUM(CASE WHEN pnl_pips < 0 THEN pnl_pips END), 0) FROM outcomes")[0]
+        return float(row[0]), float(row[1])
+
+    def find_active(self, symbol: str, entry_price: float, tolerance: float) -> Optional[int]:
+        rows = self._query("SELECT id FROM signals WHERE symbol = ? AND status = 'active' "
+                           "AND entry_price > ? AND entry_price < ? ORDER BY id LIMIT 1",
+                           (symbol, entry_price - tolerance, entry_price + tolerance))
+        return rows[0][0] if rows else None
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats, path=self.path)
+
+
+# Global signal store instance
+signal_store = SignalStore()
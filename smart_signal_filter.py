@@ -125,7 +125,7 @@ class SmartSignalFilter:
             # Legacy signal - apply stricter filtering
             return True, "Legacy signal - basic validation applied"
 
-    def check_time_filter(self, signal: Dict) -> Tuple[bool, str]:
+    def check_time_filter(self, signal: Dict, log: bool = True) -> Tuple[bool, str]:
         """Check if current time is suitable for trading with NY session focus"""
         # First check traditional avoid hours
         current_hour = datetime.now().hour
@@ -144,10 +144,10 @@ class SmartSignalFilter:
             session_info = session_manager.get_session_info()
             
             # Log NY session status
-            if session_info['ny_session_active']:
+            if log and session_info['ny_session_active']:
                 self.logger.info(f"🇺🇸 NY SESSION ACTIVE - Enhanced signal quality expected")
             
-            if session_info['overlap_session_active']:
+            if log and session_info['overlap_session_active']:
                 self.logger.info(f"🔥 NY-LONDON OVERLAP - Maximum volatility period!")
             
             return True, f"✅ {session_reason} | NY Time: {session_info['ny_time']}"
@@ -155,14 +155,17 @@ class SmartSignalFilter:
         # Fallback to basic time check
         return True, f"Current hour {current_hour} is acceptable for trading"
     
-    def apply_session_multipliers(self, signal: Dict) -> Dict:
-        """Apply New York session-based multipliers to signal"""
+    def apply_session_multipliers(self, signal: Dict, session_analysis: Optional[Dict] = None,
+                                  log: bool = True) -> Dict:
+        """Apply New York session-based multipliers to signal. session_analysis is a
+        get_session_multipliers result already fetched for this signal, if any"""
         if not SESSIONS_AVAILABLE:
             return signal
         
         try:
             # Get session analysis
-            session_analysis = get_session_multipliers(signal.get('symbol', ''))
+            if session_analysis is None:
+                session_analysis = get_session_multipliers(signal.get('symbol', ''))
             multipliers = session_analysis['multipliers']
             session_info = session_analysis['session_info']
             
@@ -172,7 +175,7 @@ class SmartSignalFilter:
                 adjusted_prob = original_prob * multipliers['probability_multiplier']
                 signal['tp_probability'] = min(99, max(1, adjusted_prob))
                 
-                if adjusted_prob != original_prob:
+                if log and adjusted_prob != original_prob:
                     self.logger.info(f"🎯 SESSION ADJUSTMENT: {signal.get('symbol')} TP probability: "
                                    f"{original_prob:.1f}% → {signal['tp_probability']:.1f}% "
                                    f"({multipliers['probability_multiplier']:.2f}x)")
@@ -182,7 +185,7 @@ class SmartSignalFilter:
                 original_conf = signal['confidence']
                 signal['confidence'] = min(1.0, max(0.1, original_conf + multipliers['confidence_boost']))
                 
-                if multipliers['confidence_boost'] != 0:
+                if log and multipliers['confidence_boost'] != 0:
                     self.logger.info(f"💪 CONFIDENCE BOOST: {signal.get('symbol')} confidence: "
                                    f"{original_conf:.2f} → {signal['confidence']:.2f}")
             
@@ -192,8 +195,9 @@ class SmartSignalFilter:
             signal['session_priority'] = session_info['priority_score']
             
             # Log session recommendations
-            for rec in session_analysis['recommendations']:
-                self.logger.info(f"📋 SESSION TIP: {rec}")
+            if log:
+                for rec in session_analysis['recommendations']:
+                    self.logger.info(f"📋 SESSION TIP: {rec}")
                 
         except Exception as e:
             self.logger.error(f"Error applying session multipliers: {e}")
@@ -213,18 +217,19 @@ class SmartSignalFilter:
         
         return True, f"Recommendation acceptable: {recommendation}"
     
-    def apply_quality_filters(self, signal: Dict) -> Tuple[bool, List[str]]:
-        """Apply all quality filters to a signal"""
-        filters = [
-            self.check_realistic_signal_filter,  # New realistic signal check
-            self.check_probability_filter,
-            self.check_confidence_filter,
-            self.check_expected_value_filter,
-            self.check_price_accuracy_filter,
-            # self.check_timeframe_filter,  # Disabled: allow all timeframes
-            self.check_time_filter,
-            self.check_recommendation_filter
-        ]
+    def apply_quality_filters(self, signal: Dict, filters: Optional[List] = None) -> Tuple[bool, List[str]]:
+        """Apply all quality filters (or the given subset) to a signal"""
+        if filters is None:
+            filters = [
+                self.check_realistic_signal_filter,  # New realistic signal check
+                self.check_probability_filter,
+                self.check_confidence_filter,
+                self.check_expected_value_filter,
+                self.check_price_accuracy_filter,
+                # self.check_timeframe_filter,  # Disabled: allow all timeframes
+                self.check_time_filter,
+                self.check_recommendation_filter
+            ]
         
         results = []
         passed = True
@@ -243,6 +248,24 @@ class SmartSignalFilter:
         
         return passed, results
     
+    def _check_time_filter_quietly(self, signal: Dict) -> Tuple[bool, str]:
+        return self.check_time_filter(signal, log=False)
+
+    def precheck_signal(self, signal: Dict) -> Tuple[bool, str]:
+        """Run the quality checks that don't depend on the TP probability analysis,
+        so a signal they would reject can skip it. Works on a copy: filter_signal
+        still applies the session multipliers once and re-runs every check, so the
+        preview reuses the session stage's analysis and logs nothing."""
+        preview = self.apply_session_multipliers(dict(signal), signal.get('session_multipliers'), log=False)
+        passed, results = self.apply_quality_filters(preview, [
+            self.check_realistic_signal_filter,
+            self.check_confidence_filter,
+            self.check_price_accuracy_filter,
+            self._check_time_filter_quietly
+        ])
+        failed = [r for r in results if '❌' in r]
+        return passed, failed[0] if failed else "Pre-checks passed"
+
     def filter_signal(self, signal: Dict) -> Tuple[bool, str]:
         """Main signal filtering function with NY session optimization"""
         symbol = signal.get('symbol', 'Unknown')
@@ -251,8 +274,8 @@ class SmartSignalFilter:
         
         self.logger.info(f"🔍 Filtering signal: {symbol} {side} {tf}")
         
-        # Apply New York session multipliers first
-        signal = self.apply_session_multipliers(signal)
+        # Apply New York session multipliers first (the session stage's analysis when present)
+        signal = self.apply_session_multipliers(signal, signal.get('session_multipliers'))
         
         # Apply all quality filters
         passed, filter_results = self.apply_quality_filters(signal)
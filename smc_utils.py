@@ -6,104 +6,154 @@
     es_zone = None
     if len(df) < lookback + 2:
         return smt_signal, es_zone
-    recent_highs = df['high'].iloc[-lookback-2:-2]
-    recent_lows = df['low'].iloc[-lookback-2:-2]
-    last_high = df['high'].iloc[-2]
-    last_low = df['low'].iloc[-2]
-    curr_high = df['high'].iloc[-1]
-    curr_low = df['low'].iloc[-1]
-    # SMT: wick above previous highs (bullish sweep)
-    if curr_high > max(recent_highs):
-        smt_signal = 'bullish_sweep'
-    # SMT: wick below previous lows (bearish sweep)
-    elif curr_low < min(recent_lows):
-        smt_signal = 'bearish_sweep'
-    # ES: tight range in last N candles
-    range_high = max(df['high'].iloc[-lookback:])
-    range_low = min(df['low'].iloc[-lookback:])
-    if (range_high - range_low) / df['close'].iloc[-1] < 0.01:
-        es_zone = (range_low, range_high)
+    # Only the last bar matters here, so run the array scans over its window alone
+    tail = df.iloc[-lookback - 2:]
+    sweep_index, sweep_direction = find_liquidity_sweeps(tail, lookback)
+    if len(sweep_index) and sweep_index[-1] == len(tail) - 1:
+        smt_signal = 'bullish_sweep' if sweep_direction[-1] > 0 else 'bearish_sweep'
+    zone_index, zone_low, zone_high = find_equilibrium_zones(tail, lookback)
+    if len(zone_index) and zone_index[-1] == len(tail) - 1:
+        es_zone = (zone_low[-1], zone_high[-1])
     return smt_signal, es_zone
 def detect_fvg(df, lookback=3):
     """Detect Fair Value Gap (FVG) in the last `lookback` candles."""
     # FVG: gap between previous candle's low and next candle's high (for bullish), or high and next low (for bearish)
-    fvg_signals = []
-    for i in range(len(df) - lookback, len(df) - 1):
-        prev_low = df['low'].iloc[i - 1]
-        curr_high = df['high'].iloc[i]
-        next_low = df['low'].iloc[i + 1]
-        prev_high = df['high'].iloc[i - 1]
-        curr_low = df['low'].iloc[i]
-        next_high = df['high'].iloc[i + 1]
-        # Bullish FVG: previous low < current high < next low
-        if curr_high > prev_low and next_low > curr_high:
-            fvg_signals.append({'type': 'bullish', 'index': i, 'price': curr_high})
-        # Bearish FVG: previous high > current low > next high
-        if curr_low < prev_high and next_high < curr_low:
-            fvg_signals.append({'type': 'bearish', 'index': i, 'price': curr_low})
-    return fvg_signals
+    offset = max(len(df) - lookback - 1, 0)
+    index, price, direction = find_fvgs(df.iloc[offset:])
+    return [{'type': 'bullish' if d > 0 else 'bearish', 'index': int(i) + offset, 'price': p}
+            for i, p, d in zip(index, price.tolist(), direction) if i + offset >= len(df) - lookback]
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from pandas import DataFrame
 from datetime import datetime
 import logging
 from config import SYMBOLS, TIMEFRAMES, EMA_PERIOD, RR_MULTIPLIERS, SYMBOL_SETTINGS
+from feature_engine import get_features
 
-def calculate_realistic_tp_sl(symbol, entry_price, side, current_atr):
-    """Calculate realistic TP and SL based on symbol-specific settings and ATR."""
-    # Default settings if symbol not found
-    default_config = {
-        'max_sl_distance': 100,
-        'min_tp_distance': 50,
-        'atr_multiplier_sl': 1.0,
-        'atr_multiplier_tp': 1.5
-    }
-    symbol_config = SYMBOL_SETTINGS.get(symbol, default_config)
-
-    # Use ATR and timeframe to make TP/SL dynamic
-    # Example: Increase TP/SL for higher timeframes
-    # Assume timeframe is a string like 'M3', 'M5', 'H1', etc.
-    tf_map = {'M3': 1, 'M5': 2, 'M15': 3, 'M30': 4, 'H1': 5, 'H4': 6}
-    tf_factor = tf_map.get(str(symbol_config.get('tf', 'M3')), tf_map.get(str(symbol_config.get('tf', 'M3')), 1))
-    # If tf not in config, fallback to passed timeframe if available
-    if 'tf' not in symbol_config:
-        tf_factor = tf_map.get(str(symbol_config.get('tf', 'M3')), 1)
-
-    # If timeframe is passed as argument, use it
-    import inspect
-    frame = inspect.currentframe().f_back
-    timeframe = frame.f_locals.get('timeframe', 'M3')
-    tf_factor = tf_map.get(str(timeframe), 1)
-
-    # Adjust ATR multipliers by timeframe factor
-    atr_multiplier_sl = symbol_config['atr_multiplier_sl'] * (0.8 + 0.2 * tf_factor)
-    atr_multiplier_tp = symbol_config['atr_multiplier_tp'] * (0.8 + 0.2 * tf_factor)
-
-    if side == 'buy':
-        atr_based_sl = entry_price - (current_atr * atr_multiplier_sl)
-        point_value = 1.0 if symbol in ['BTCUSD', 'ETHUSD'] else 0.01
-        max_sl_distance = symbol_config['max_sl_distance'] * point_value * (0.8 + 0.2 * tf_factor)
-        max_sl = entry_price - max_sl_distance
-        sl = max(atr_based_sl, max_sl)
-    else:
-        atr_based_sl = entry_price + (current_atr * atr_multiplier_sl)
+
+# Vectorized SMC scans. Each takes anything indexable by column name (DataFrame,
+# BarArray, bar store records) and marks every bar of the history in one pass,
+# so the same code serves the live scanner and multi-month backtests.
+def _column(bars, name):
+    return np.asarray(bars[name], dtype=np.float64)
+
+
+def find_fvgs(bars):
+    """Fair value gaps across all bars: (index, price, direction) arrays sorted by
+    index, direction +1 bullish / -1 bearish. Bar i needs bars i-1 and i+1."""
+    high = _column(bars, 'high')
+    low = _column(bars, 'low')
+    if len(high) < 3:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, np.empty(0), np.empty(0, dtype=np.int8)
+    prev_high, curr_high, next_high = high[:-2], high[1:-1], high[2:]
+    prev_low, curr_low, next_low = low[:-2], low[1:-1], low[2:]
+    bullish = (curr_high > prev_low) & (next_low > curr_high)
+    bearish = (curr_low < prev_high) & (next_high < curr_low)
+
+    bull_index = np.flatnonzero(bullish) + 1
+    bear_index = np.flatnonzero(bearish) + 1
+    index = np.concatenate((bull_index, bear_index))
+    price = np.concatenate((high[bull_index], low[bear_index]))
+    direction = np.concatenate((np.ones(len(bull_index), dtype=np.int8),
+                                -np.ones(len(bear_index), dtype=np.int8)))
+    order = np.argsort(index, kind='stable')  # bullish first when both share a bar
+    return index[order], price[order], direction[order]
+
+
+def find_liquidity_sweeps(bars, lookback=10):
+    """Bars whose wick takes out the previous `lookback` bars' extreme (excluding the
+    bar just before it): (index, direction) arrays, +1 sweep of highs, -1 of lows"""
+    high = _column(bars, 'high')
+    low = _column(bars, 'low')
+    if len(high) < lookback + 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int8)
+    # Window j spans bars j..j+lookback-1 and is compared with bar j+lookback+1
+    prior_high = sliding_window_view(high[:-2], lookback).max(axis=1)
+    prior_low = sliding_window_view(low[:-2], lookback).min(axis=1)
+    bullish = high[lookback + 1:] > prior_high
+    bearish = ~bullish & (low[lookback + 1:] < prior_low)
+    index = np.flatnonzero(bullish | bearish)
+    direction = np.where(bullish[index], 1, -1).astype(np.int8)
+    return index + lookback + 1, direction
+
+
+def find_equilibrium_zones(bars, lookback=10, max_range=0.01):
+    """Bars closing a `lookback`-bar window whose range is under max_range of the
+    close: (index, zone_low, zone_high) arrays"""
+    high = _column(bars, 'high')
+    low = _column(bars, 'low')
+    close = _column(bars, 'close')
+    if len(high) < lookback:
+        return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0)
+    range_high = sliding_window_view(high, lookback).max(axis=1)
+    range_low = sliding_window_view(low, lookback).min(axis=1)
+    index = np.flatnonzero((range_high - range_low) / close[lookback - 1:] < max_range)
+    return index + lookback - 1, range_low[index], range_high[index]
+
+
+# TP/SL ladder coefficients. Everything except entry, side and ATR depends only on
+# (symbol, timeframe), so it is computed once per pair and looked up by batches.
+DEFAULT_TP_SL_CONFIG = {
+    'max_sl_distance': 100,
+    'min_tp_distance': 50,
+    'atr_multiplier_sl': 1.0,
+    'atr_multiplier_tp': 1.5
+}
+TP_SL_TF_FACTORS = {'M3': 1, 'M5': 2, 'M15': 3, 'M30': 4, 'H1': 5, 'H4': 6}
+TP_MULTIPLIERS = np.array([1, 1.5, 2, 2.5, 3])
+_tp_sl_coefficients = {}
+
+
+def tp_sl_coefficients(symbol, timeframe):
+    """(sl ATR multiple, max SL distance in price, TP risk multiple) for a pair"""
+    key = (symbol, str(timeframe))
+    coefficients = _tp_sl_coefficients.get(key)
+    if coefficients is None:
+        symbol_config = SYMBOL_SETTINGS.get(symbol, DEFAULT_TP_SL_CONFIG)
+        # Higher timeframes get proportionally wider stops and targets
+        tf_scale = 0.8 + 0.2 * TP_SL_TF_FACTORS.get(str(timeframe), 1)
         point_value = 1.0 if symbol in ['BTCUSD', 'ETHUSD'] else 0.01
-        max_sl_distance = symbol_config['max_sl_distance'] * point_value * (0.8 + 0.2 * tf_factor)
-        max_sl = entry_price + max_sl_distance
-        sl = min(atr_based_sl, max_sl)
-
-    risk = abs(entry_price - sl)
-    tp_levels = []
-    rr = RR_MULTIPLIERS.get(symbol, 1.5)
-    # Generate up to 5 TP levels as multiples of RR and timeframe factor
-    tp_multipliers = [1, 1.5, 2, 2.5, 3]
-    for mult in tp_multipliers:
-        if side == 'buy':
-            tp = entry_price + (risk * rr * mult * (0.8 + 0.2 * tf_factor))
-        else:
-            tp = entry_price - (risk * rr * mult * (0.8 + 0.2 * tf_factor))
-        tp_levels.append(round(tp, 5))
-    return {'sl': round(sl, 5), 'tp_levels': tp_levels}
+        coefficients = (symbol_config['atr_multiplier_sl'] * tf_scale,
+                        symbol_config['max_sl_distance'] * point_value * tf_scale,
+                        RR_MULTIPLIERS.get(symbol, 1.5) * tf_scale)
+        _tp_sl_coefficients[key] = coefficients
+    return coefficients
+
+
+for _symbol in set(SYMBOLS) | set(SYMBOL_SETTINGS) | set(RR_MULTIPLIERS):
+    for _tf in TP_SL_TF_FACTORS:
+        tp_sl_coefficients(_symbol, _tf)
+
+
+def calculate_tp_sl_batch(entries, sides, atrs, symbols, timeframes):
+    """SL and five-level TP ladder for many signals at once.
+
+    entries and atrs are arrays; sides ('buy'/'sell'), symbols and timeframes are
+    arrays or single values. Returns (sl, tp_levels) with shapes (n,) and (n, 5).
+    The SL is the ATR stop capped at the symbol's maximum SL distance."""
+    entries = np.asarray(entries, dtype=np.float64)
+    n = entries.shape[0]
+    atrs = np.broadcast_to(np.asarray(atrs, dtype=np.float64), n)
+    direction = np.where(np.broadcast_to(np.asarray(sides), n) == 'buy', 1.0, -1.0)
+
+    pairs = np.stack([np.broadcast_to(np.asarray(symbols, dtype=str), n),
+                      np.broadcast_to(np.asarray(timeframes, dtype=str), n)], axis=1)
+    unique_pairs, inverse = np.unique(pairs, axis=0, return_inverse=True)
+    table = np.array([tp_sl_coefficients(symbol, tf) for symbol, tf in unique_pairs]).reshape(-1, 3)
+    sl_atr, max_sl, tp_risk = table[inverse.reshape(-1)].T
+
+    sl = entries - direction * np.minimum(atrs * sl_atr, max_sl)
+    risk = np.abs(entries - sl)
+    tp_levels = entries[:, None] + (direction * risk * tp_risk)[:, None] * TP_MULTIPLIERS[None, :]
+    return np.round(sl, 5), np.round(tp_levels, 5)
+
+
+def calculate_realistic_tp_sl(symbol, entry_price, side, current_atr, timeframe='M3'):
+    """Calculate realistic TP and SL based on symbol-specific settings and ATR."""
+    sl, tp_levels = calculate_tp_sl_batch([entry_price], side, [current_atr], symbol, timeframe)
+    return {'sl': float(sl[0]), 'tp_levels': tp_levels[0].tolist()}
 
 def generate_realistic_signal(symbol, timeframe, df, trend='bullish'):
     """Generate trading signal with realistic TP/SL levels"""
@@ -119,18 +169,15 @@ def generate_realistic_signal(symbol, timeframe, df, trend='bullish'):
         logging.debug(f"[SignalGen] DataFrame is None or too short for {symbol} {timeframe}")
         return None
 
-    current_price = float(df['close'].iloc[-1])
-    current_atr = float(atr(df))
+    # Same per-bar feature set the scanner already computed for this frame
+    features = get_features(symbol, timeframe, df)
+    current_price = features['close']
+    current_atr = features['atr14']
 
     # Use EMA and RSI to determine bullish or bearish
-    ema_20 = df['close'].rolling(20).mean().iloc[-1]
-    ema_50 = df['close'].rolling(50).mean().iloc[-1]
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-    rs = gain / (loss + 1e-9)
-    rsi = 100 - (100 / (1 + rs))
-    rsi_last = rsi.iloc[-1]
+    ema_20 = features['ma20']
+    ema_50 = features['ma50']
+    rsi_last = features['rsi14']
 
     if ema_20 > ema_50 and rsi_last > 55:
         side = 'buy'
@@ -143,7 +190,7 @@ def generate_realistic_signal(symbol, timeframe, df, trend='bullish'):
         return None
 
     entry = current_price
-    tp_sl_data = calculate_realistic_tp_sl(symbol, entry, side, current_atr)
+    tp_sl_data = calculate_realistic_tp_sl(symbol, entry, side, current_atr, timeframe)
     if not tp_sl_data or 'tp_levels' not in tp_sl_data or len(tp_sl_data['tp_levels']) < 5:
         logging.error(f"[SignalGen] Invalid TP/SL data for {symbol} {timeframe}: {tp_sl_data}")
         return None
@@ -190,17 +237,12 @@ def generate_signal(df, symbol, timeframe, rr_multipliers):
     if df is None or len(df) < 50:
         return []
 
-    ema_20 = df['close'].rolling(20).mean().iloc[-1]
-    ema_50 = df['close'].rolling(50).mean().iloc[-1]
-    current_price = df['close'].iloc[-1]
-
-    # Calculate RSI for confirmation
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-    rs = gain / (loss + 1e-9)
-    rsi = 100 - (100 / (1 + rs))
-    rsi_last = rsi.iloc[-1]
+    features = get_features(symbol, timeframe, df)
+    ema_20 = features['ma20']
+    ema_50 = features['ma50']
+
+    # RSI for confirmation
+    rsi_last = features['rsi14']
 
     # Bullish: EMA20 > EMA50 and RSI > 55
     if ema_20 > ema_50 and rsi_last > 55:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Latency-Aware Data Source Router
+Routes market data requests to the fastest healthy source, with per-source
+circuit breakers that skip failing providers and probe them in the background
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class DataSource:
+    def __init__(self, name: str, fetch: Callable, supports: Optional[Callable] = None, order: int = 0):
+        self.name = name
+        self.fetch = fetch
+        self.supports = supports or (lambda symbol: True)
+        self.order = order
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.latency = None  # EWMA seconds over successful calls
+        self.last_args = None
+        self.probing = False
+
+
+class SourceRouter:
+    def __init__(self, failure_threshold: int = 3, open_seconds: float = 60,
+                 latency_alpha: float = 0.3):
+        """failure_threshold consecutive failures open a source's circuit; after
+        open_seconds it is probed in the background and closed again on success"""
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.latency_alpha = latency_alpha
+        self.sources: List[DataSource] = []
+        self.lock = threading.Lock()
+
+    def register(self, name: str, fetch: Callable, supports: Optional[Callable] = None):
+        """fetch(symbol, *args) returns data or None; registration order breaks latency ties"""
+        self.sources.append(DataSource(name, fetch, supports, order=len(self.sources)))
+
+    def _candidates(self, symbol: str) -> List[DataSource]:
+        now = time.time()
+        ready = []
+        with self.lock:
+            for source in self.sources:
+                if not source.supports(symbol):
+                    continue
+                if source.state == OPEN and now - source.opened_at >= self.open_seconds:
+                    source.state = HALF_OPEN
+                if source.state == CLOSED:
+                    ready.append(source)
+                elif source.state == HALF_OPEN and not source.probing:
+                    self._start_probe(source)
+        # Unmeasured sources go first so every source gets a latency sample
+        return sorted(ready, key=lambda s: (s.latency if s.latency is not None else -1, s.order))
+
+    def _record(self, source: DataSource, ok: bool, elapsed: float):
+        with self.lock:
+            if ok:
+                source.successes += 1
+                source.consecutive_failures = 0
+                source.state = CLOSED
+                if source.latency is None:
+                    source.latency = elapsed
+                else:
+                    source.latency += self.latency_alpha * (elapsed - source.latency)
+            else:
+                source.failures += 1
+                source.consecutive_failures += 1
+                if source.state == HALF_OPEN or source.consecutive_failures >= self.failure_threshold:
+                    if source.state != OPEN:
+                        logger.warning(f"⚡ Circuit open for {source.name} after {source.consecutive_failures} failures")
+                    source.state = OPEN
+                    source.opened_at = time.time()
+
+    def _call(self, source: DataSource, symbol: str, args: Tuple):
+        started = time.time()
+        try:
+            data = source.fetch(symbol, *args)
+        except Exception as e:
+            logger.warning(f"Source {source.name} error for {symbol}: {e}")
+            data = None
+        self._record(source, bool(data), time.time() - started)
+        return data
+
+    def _start_probe(self, source: DataSource):
+        """Half-open check off the request path (caller holds the lock)"""
+        source.probing = True
+
+        def probe():
+            try:
+                symbol, args = source.last_args
+                if self._call(source, symbol, args):
+                    logger.info(f"✅ Circuit closed for {source.name}")
+            finally:
+                source.probing = False
+
+        threading.Thread(target=probe, daemon=True, name=f"probe-{source.name}").start()
+
+    def fetch(self, symbol: str, *args) -> Tuple[Optional[object], Optional[str]]:
+        """Try healthy sources fastest-first; returns (data, source_name) or (None, None)"""
+        for source in self._candidates(symbol):
+            source.last_args = (symbol, args)
+            data = self._call(source, symbol, args)
+            if data:
+                return data, source.name
+        return None, None
+
+    def get_stats(self) -> Dict:
+        """Per-source health for status endpoints"""
+        with self.lock:
+            stats = {}
+            for source in self.sources:
+                total = source.successes + source.failures
+                stats[source.name] = {
+                    'state': source.state,
+                    'success_rate': round(source.successes / total, 3) if total else None,
+                    'avg_latency_ms': round(source.latency * 1000, 1) if source.latency is not None else None,
+                    'requests': total
+                }
+            return stats
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Streaming Indicators
+O(1) incremental indicator state. Each update either revises the in-progress
+bar or commits it and starts the next one, and all state can be snapshotted
+to JSON and restored after a restart
+"""
+
+import math
+from collections import deque
+from typing import Dict, Optional
+
+NAN = float('nan')
+
+
+class StreamingIndicator:
+    """update(bar_time, *inputs) with the same bar_time revises the in-progress
+    bar; a newer bar_time commits the previous bar first"""
+
+    def __init__(self, period: int = 1):
+        self.period = period
+        self.bar_time = None
+        self.pending = None
+
+    def update(self, bar_time, *inputs) -> float:
+        if self.bar_time is not None and bar_time != self.bar_time:
+            if bar_time < self.bar_time:
+                raise ValueError(f"bar {bar_time} is older than {self.bar_time}")
+            self._commit(*self.pending)
+        self.bar_time = bar_time
+        self.pending = inputs
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return NAN if self.pending is None else self._peek(*self.pending)
+
+    def snapshot(self) -> Dict:
+        return {'period': self.period, 'bar_time': self.bar_time,
+                'pending': list(self.pending) if self.pending is not None else None,
+                'state': self._state()}
+
+    def restore(self, snapshot: Dict):
+        self.period = snapshot['period']
+        self.bar_time = snapshot['bar_time']
+        self.pending = tuple(snapshot['pending']) if snapshot['pending'] is not None else None
+        self._load(snapshot['state'])
+        return self
+
+    # Subclasses: value with x as the in-progress bar, and folding x into committed state
+    def _peek(self, *inputs) -> float:
+        raise NotImplementedError
+
+    def _commit(self, *inputs):
+        raise NotImplementedError
+
+    def _state(self) -> Dict:
+        raise NotImplementedError
+
+    def _load(self, state: Dict):
+        raise NotImplementedError
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average seeded with the first value (pandas adjust=False)"""
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.alpha = 2 / (period + 1)
+        self.ema = None
+
+    def _peek(self, x):
+        return x if self.ema is None else self.ema + self.alpha * (x - self.ema)
+
+    def _commit(self, x):
+        self.ema = self._peek(x)
+
+    def _state(self):
+        return {'ema': self.ema}
+
+    def _load(self, state):
+        self.alpha = 2 / (self.period + 1)
+        self.ema = state['ema']
+
+
+class RollingMean(StreamingIndicator):
+    """Simple moving average over the last `period` bars including the in-progress one"""
+
+    RESUM_EVERY = 1000  # re-add the window now and then so float drift cannot build up
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.window = deque(maxlen=period - 1)
+        self.total = 0.0
+        self.commits = 0
+
+    def _peek(self, x):
+        return (self.total + x) / self.period if len(self.window) == self.period - 1 else NAN
+
+    def _commit(self, x):
+        if self.window.maxlen == 0:
+            return
+        if len(self.window) == self.window.maxlen:
+            self.total -= self.window[0]
+        self.window.append(x)
+        self.total += x
+        self.commits += 1
+        if self.commits % self.RESUM_EVERY == 0:
+            self.total = math.fsum(self.window)
+
+    def _state(self):
+        return {'window': list(self.window)}
+
+    def _load(self, state):
+        self.window = deque(state['window'], maxlen=self.period - 1)
+        self.total = math.fsum(self.window)
+        self.commits = 0
+
+
+class RollingStd(StreamingIndicator):
+    """Population standard deviation over the last `period` bars"""
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.mean = RollingMean(period)
+        self.mean_sq = RollingMean(period)
+
+    def _peek(self, x):
+        variance = self.mean_sq._peek(x * x) - self.mean._peek(x) ** 2
+        return math.sqrt(max(variance, 0.0)) if variance == variance else NAN
+
+    def _commit(self, x):
+        self.mean._commit(x)
+        self.mean_sq._commit(x * x)
+
+    def _state(self):
+        return {'window': list(self.mean.window)}
+
+    def _load(self, state):
+        self.mean = RollingMean(self.period)
+        self.mean._load({'window': state['window']})
+        self.mean_sq = RollingMean(self.period)
+        self.mean_sq._load({'window': [v * v for v in state['window']]})
+
+
+class _RollingExtreme(StreamingIndicator):
+    """Rolling min/max with a monotonic deque: amortised O(1) per committed bar"""
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.candidates = deque()  # (bar index, value), values monotonic from the front
+        self.count = 0
+
+    def _better(self, a, b) -> bool:
+        raise NotImplementedError
+
+    def _peek(self, x):
+        if self.count + 1 < self.period:
+            return NAN
+        if self.candidates and self._better(self.candidates[0][1], x):
+            return self.candidates[0][1]
+        return x
+
+    def _commit(self, x):
+        while self.candidates and not self._better(self.candidates[-1][1], x):
+            self.candidates.pop()
+        self.candidates.append((self.count, x))
+        self.count += 1
+        # Drop what falls out of the next bar's window
+        while self.candidates and self.candidates[0][0] <= self.count - self.period:
+            self.candidates.popleft()
+
+    def _state(self):
+        return {'candidates': [list(c) for c in self.candidates], 'count': self.count}
+
+    def _load(self, state):
+        self.candidates = deque(tuple(c) for c in state['candidates'])
+        self.count = state['count']
+
+
+class RollingMin(_RollingExtreme):
+    def _better(self, a, b):
+        return a < b
+
+
+class RollingMax(_RollingExtreme):
+    def _better(self, a, b):
+        return a > b
+
+
+class _WilderAverage:
+    """Wilder smoothing seeded with a simple average of the first `period` values"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.seed_total = 0.0
+        self.average = None
+
+    def peek(self, x) -> Optional[float]:
+        if self.average is not None:
+            return (self.average * (self.period - 1) + x) / self.period
+        if self.count + 1 == self.period:
+            return (self.seed_total + x) / self.period
+        return None
+
+    def commit(self, x):
+        value = self.peek(x)
+        self.count += 1
+        if value is None:
+            self.seed_total += x
+        else:
+            self.average = value
+
+    def state(self):
+        return {'count': self.count, 'seed_total': self.seed_total, 'average': self.average}
+
+    def load(self, state):
+        self.count = state['count']
+        self.seed_total = state['seed_total']
+        self.average = state['average']
+
+
+class WilderRSI(StreamingIndicator):
+    """RSI with Wilder smoothing of gains and losses"""
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.prev_close = None
+        self.gains = _WilderAverage(period)
+        self.losses = _WilderAverage(period)
+
+    def _peek(self, close):
+        if self.prev_close is None:
+            return NAN
+        change = close - self.prev_close
+        avg_gain = self.gains.peek(max(change, 0.0))
+        avg_loss = self.losses.peek(max(-change, 0.0))
+        if avg_gain is None:
+            return NAN
+        if avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+    def _commit(self, close):
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            self.gains.commit(max(change, 0.0))
+            self.losses.commit(max(-change, 0.0))
+        self.prev_close = close
+
+    def _state(self):
+        return {'prev_close': self.prev_close, 'gains': self.gains.state(), 'losses': self.losses.state()}
+
+    def _load(self, state):
+        self.prev_close = state['prev_close']
+        self.gains = _WilderAverage(self.period)
+        self.gains.load(state['gains'])
+        self.losses = _WilderAverage(self.period)
+        self.losses.load(state['losses'])
+
+
+class ATR(StreamingIndicator):
+    """Average true range with Wilder smoothing; update(bar_time, high, low, close)"""
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.prev_close = None
+        self.ranges = _WilderAverage(period)
+
+    def _true_range(self, high, low):
+        if self.prev_close is None:
+            return high - low
+        return max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+
+    def _peek(self, high, low, close):
+        value = self.ranges.peek(self._true_range(high, low))
+        return NAN if value is None else value
+
+    def _commit(self, high, low, close):
+        self.ranges.commit(self._true_range(high, low))
+        self.prev_close = close
+
+    def _state(self):
+        return {'prev_close': self.prev_close, 'ranges': self.ranges.state()}
+
+    def _load(self, state):
+        self.prev_close = state['prev_close']
+        self.ranges = _WilderAverage(self.period)
+        self.ranges.load(state['ranges'])
@@ -1,9 +1,9 @@
-import requests
 import logging
 import time
 from config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
 from datetime import datetime
 import urllib3
+from http_transport import http_post
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -49,27 +49,21 @@ def send_telegram_message_to_users(message, chat_ids=None, max_retries=MAX_RETRI
                 try:
                     print(f"[TELEGRAM DEBUG] Sending to {chat_id} - Attempt {attempt+1}")
                     
-                    with requests.Session() as session:
-                        session.headers.update({
-                            'User-Agent': 'TradingBot/1.0',
-                            'Connection': 'close'
-                        })
-                        
-                        response = session.post(
-                            url,
-                            json=payload,
-                            timeout=SESSION_TIMEOUT,
-                            verify=False if 'http://' in url else True
-                        )
+                    response = http_post(
+                        url,
+                        json=payload,
+                        timeout=SESSION_TIMEOUT,
+                        verify=False if 'http://' in url else True
+                    )
+                    
+                    if response.status_code == 200:
+                        print(f"✅ Message sent to {chat_id}")
+                        success_count += 1
+                        user_success = True
+                        break
+                    else:
+                        print(f"❌ Failed to send to {chat_id}: {response.status_code}")
                         
-                        if response.status_code == 200:
-                            print(f"✅ Message sent to {chat_id}")
-                            success_count += 1
-                            user_success = True
-                            break
-                        else:
-                            print(f"❌ Failed to send to {chat_id}: {response.status_code}")
-                            
                 except Exception as e:
                     print(f"❌ Error sending to {chat_id}: {str(e)[:50]}")
                 
@@ -177,6 +171,9 @@ def send_trade_update(trade, update_type, pnl=None):
         if update_type == "entry_filled":
             message = f"✅ ENTRY FILLED: {symbol} at {trade.get('actual_entry', trade.get('entry', 0)):.5f}"
             
+        elif update_type == "sl_trailed":
+            message = f"🔒 STOP MOVED: {symbol} new SL {trade.get('sl', 0):.5f}"
+            
         elif update_type == "sl_hit":
             message = f"❌ STOP LOSS: {symbol} P&L: ${pnl:.2f}"
             
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Test for the closed-bar analysis memo
+"""
+
+import numpy as np
+import pandas as pd
+
+from analysis_memo import AnalysisMemo
+
+
+def make_frame(bars=60):
+    close = 100 + np.arange(bars, dtype=float)
+    return pd.DataFrame({'open_time': np.arange(bars) * 900_000, 'open': close, 'high': close + 1,
+                         'low': close - 1, 'close': close, 'volume': np.ones(bars)})
+
+
+def test_repeat_scans_hit_until_bar_changes():
+    print("🔍 Testing analysis memo...")
+    memo = AnalysisMemo()
+    df = make_frame()
+    assert not memo.unchanged('BTCUSD', 'M15', df)
+    for _ in range(5):
+        assert memo.unchanged('BTCUSD', 'M15', df.copy())
+    assert not memo.unchanged('BTCUSD', 'M5', df)  # keyed per timeframe
+
+    ticked = df.copy()
+    ticked.loc[ticked.index[-1], 'close'] += 0.5  # in-progress bar moved
+    assert not memo.unchanged('BTCUSD', 'M15', ticked)
+    assert memo.unchanged('BTCUSD', 'M15', ticked)
+
+    next_bar = make_frame(61)  # a bar closed
+    assert not memo.unchanged('BTCUSD', 'M15', next_bar)
+
+    memo.invalidate('BTCUSD')
+    assert not memo.unchanged('BTCUSD', 'M15', next_bar)
+    stats = memo.get_stats()
+    assert stats['hits'] == 6 and stats['misses'] == 5
+    assert stats['hit_rate'] == round(6 / 11, 3)
+    print("✅ Analysis memo OK")
+
+
+if __name__ == "__main__":
+    test_repeat_scans_hit_until_bar_changes()
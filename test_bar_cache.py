@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test for the incremental OHLCV bar cache
+Uses an in-memory kline source so no network access is needed
+"""
+
+import pandas as pd
+
+from bar_cache import BarCache
+
+MINUTE_MS = 60_000
+
+
+class FakeKlineSource:
+    """Serves Binance-style kline frames from a growing in-memory series"""
+
+    def __init__(self, total_bars):
+        self.total_bars = total_bars
+        self.last_close = 100.0
+        self.calls = []
+
+    def frame(self):
+        rows = []
+        for i in range(self.total_bars):
+            close = self.last_close if i == self.total_bars - 1 else 100.0 + i
+            rows.append({
+                'open_time': i * MINUTE_MS,
+                'open': 100.0 + i, 'high': close + 1, 'low': close - 1,
+                'close': close, 'volume': 1.0
+            })
+        return pd.DataFrame(rows)
+
+    def __call__(self, symbol, tf_minutes, bars, start_time=None):
+        self.calls.append(start_time)
+        df = self.frame()
+        if start_time is not None:
+            return df[df['open_time'] >= start_time].head(bars).reset_index(drop=True)
+        return df.tail(bars).reset_index(drop=True)
+
+
+def test_incremental_fetch_merges_in_progress_bar():
+    """Second call fetches only the in-progress bar and new bars"""
+    print("🔍 Testing incremental bar cache...")
+    source = FakeKlineSource(150)
+    cache = BarCache(source, max_bars=200)
+
+    first = cache.get_bars('BTCUSD', 1, 100)
+    assert len(first) == 100
+    assert source.calls == [None]
+
+    # In-progress bar revised and one new bar opened
+    source.last_close = 250.0
+    source.total_bars = 152
+    second = cache.get_bars('BTCUSD', 1, 100)
+
+    assert source.calls[-1] == 149 * MINUTE_MS
+    assert len(second) == 100
+    assert second['open_time'].iloc[-1] == 151 * MINUTE_MS
+    assert second['open_time'].is_monotonic_increasing
+    assert second['open_time'].is_unique
+    assert second['close'].iloc[-1] == 250.0
+    assert cache.get_stats()['incremental_fetches'] == 1
+    print("✅ Incremental merge OK")
+
+
+def test_gap_triggers_full_refetch():
+    """A full page of new bars means history may be missing - resync"""
+    source = FakeKlineSource(150)
+    cache = BarCache(source)
+    cache.get_bars('BTCUSD', 1, 50)
+
+    source.total_bars = 400
+    bars = cache.get_bars('BTCUSD', 1, 50)
+
+    assert bars['open_time'].iloc[-1] == 399 * MINUTE_MS
+    assert cache.get_stats()['full_fetches'] == 2
+    print("✅ Gap resync OK")
+
+
+def test_empty_incremental_response_keeps_cached_bars():
+    """No new bars yet is not a failure - the cached window is still served"""
+    source = FakeKlineSource(150)
+    empty = {'on': False}
+
+    def fetcher(symbol, tf_minutes, bars, start_time=None):
+        if empty['on']:
+            return source.frame().iloc[0:0]
+        return source(symbol, tf_minutes, bars, start_time)
+
+    cache = BarCache(fetcher)
+    first = cache.get_bars('BTCUSD', 1, 50)
+
+    empty['on'] = True  # the provider has nothing from the last bar onwards
+    again = cache.get_bars('BTCUSD', 1, 50)
+    assert again is not None and again.equals(first)
+    assert cache.get_stats()['incremental_fetches'] == 1
+    print("✅ Empty incremental response OK")
+
+
+if __name__ == "__main__":
+    test_incremental_fetch_merges_in_progress_bar()
+    test_gap_triggers_full_refetch()
+    test_empty_incremental_response_keeps_cached_bars()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test for the bar-close event scheduler
+"""
+
+import threading
+import time
+
+from bar_scheduler import BAR_CLOSE, FALLBACK, LEVEL_CROSS, BarScheduler
+
+
+def test_next_bar_close_alignment():
+    print("🔍 Testing bar scheduler...")
+    scheduler = BarScheduler(['BTCUSD'], {'M3': 3, 'M5': 5, 'M15': 15}, close_delay=1.0)
+    at, closing = scheduler.next_bar_close(now=900 * 1000 + 30)
+    assert at == 900 * 1000 + 180 + 1 and closing == ['M3']
+
+    at, closing = scheduler.next_bar_close(now=900 * 1001 - 10)  # just before an M15 boundary
+    assert at == 900 * 1001 + 1 and sorted(closing) == ['M15', 'M3', 'M5']
+
+    # Inside the close delay the bar that just closed is still due
+    at, _ = scheduler.next_bar_close(now=900 * 1001 + 0.5)
+    assert at == 900 * 1001 + 1
+    print("✅ Bar close alignment OK")
+
+
+def test_bar_close_events_with_fake_clock():
+    now = [900 * 1000 + 179.5]
+    scheduler = BarScheduler(['BTCUSD', 'XAUUSD'], {'M3': 3}, fallback_interval=3600,
+                             close_delay=0.0, clock=lambda: now[0])
+
+    def advance():
+        now[0] = 900 * 1000 + 180.0
+        with scheduler.condition:
+            scheduler.condition.notify_all()
+
+    threading.Timer(0.02, advance).start()
+    events = scheduler.wait_for_events()
+    assert {(e.symbol, e.tf, e.reason) for e in events} == {('BTCUSD', 'M3', BAR_CLOSE),
+                                                            ('XAUUSD', 'M3', BAR_CLOSE)}
+    print("✅ Bar close events OK")
+
+
+def test_level_cross_wakes_and_fallback_keeps_cadence():
+    scheduler = BarScheduler(['BTCUSD', 'XAUUSD'], {'D1': 1440}, fallback_interval=0.05)
+    scheduler.watch_levels('BTCUSD', {'trade0_sl': 99.0, 'M5_resistance': 105.0, 'unset': None})
+    scheduler.on_price('BTCUSD', 100.0)
+    scheduler.on_price('BTCUSD', 100.5)  # no level crossed
+
+    threading.Timer(0.01, lambda: scheduler.on_price('BTCUSD', 98.5)).start()
+    started = time.time()
+    events = scheduler.wait_for_events()
+    assert time.time() - started < 0.04
+    assert [(e.symbol, e.reason, e.detail) for e in events] == [('BTCUSD', LEVEL_CROSS, 'trade0_sl')]
+
+    events = scheduler.wait_for_events()  # nothing happens: the fallback scans everything
+    assert sorted(e.symbol for e in events) == ['BTCUSD', 'XAUUSD']
+    assert all(e.reason == FALLBACK for e in events)
+
+    scheduler.fallback_interval = 10
+    assert scheduler.wait_for_events(timeout=0.01) == []  # the prioritizer's next due scan
+    threading.Timer(0.01, scheduler.stop).start()
+    assert scheduler.wait_for_events() == []
+    stats = scheduler.get_stats()
+    assert stats[LEVEL_CROSS] == 1 and stats[FALLBACK] == 2 and stats['watched_levels'] == 2
+    print("✅ Level triggers and fallback OK")
+
+
+def test_price_poll_fires_level_cross_without_a_stream():
+    scheduler = BarScheduler(['BTCUSD', 'XAUUSD'], {'D1': 1440}, fallback_interval=10)
+    scheduler.watch_levels('BTCUSD', {'trade0_tp1': 101.0})
+    prices = iter([100.0, 100.5, 101.5])
+    fetched = []
+
+    def fetch(symbol):
+        fetched.append(symbol)
+        return next(prices, 101.5)
+
+    scheduler.start_price_poll(fetch, interval=0.01)
+    events = scheduler.wait_for_events(timeout=1)
+    scheduler.stop()
+    scheduler.poller.join(timeout=1)
+    assert [(e.symbol, e.reason, e.detail) for e in events] == [('BTCUSD', LEVEL_CROSS, 'trade0_tp1')]
+    assert set(fetched) == {'BTCUSD'}  # only symbols with watched levels are polled
+    assert not scheduler.poller.is_alive()
+    print("✅ Level poll without a stream OK")
+
+
+if __name__ == "__main__":
+    test_next_bar_close_alignment()
+    test_bar_close_events_with_fake_clock()
+    test_level_cross_wakes_and_fallback_keeps_cadence()
+    test_price_poll_fires_level_cross_without_a_stream()
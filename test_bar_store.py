@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test for the memory-mapped bar store
+Uses a temporary directory so no market data files are left behind
+"""
+
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from automated_backtester import AutomatedBacktester
+from bar_cache import BarCache
+from bar_store import BarStore
+
+MINUTE_MS = 60_000
+
+
+def make_bars(start, count):
+    times = np.arange(start, start + count) * MINUTE_MS
+    return pd.DataFrame({
+        'open_time': times, 'open': times / MINUTE_MS, 'high': times / MINUTE_MS + 1,
+        'low': times / MINUTE_MS - 1, 'close': times / MINUTE_MS + 0.5, 'volume': 1.0
+    })
+
+
+def test_append_and_range_queries():
+    """Only closed, new bars are appended; range queries are served from the memmap"""
+    print("🔍 Testing bar store...")
+    with tempfile.TemporaryDirectory() as root:
+        store = BarStore(root)
+        # Bar 9 is still in progress at now_ms
+        assert store.append('BTCUSD', 1, make_bars(0, 10), now_ms=9 * MINUTE_MS + 1) == 9
+        # Overlapping batch only adds what is new
+        assert store.append('BTCUSD', 1, make_bars(5, 10), now_ms=20 * MINUTE_MS) == 6
+        assert store.count('BTCUSD', 1) == 15
+        assert store.last_time('BTCUSD', 1) == 14 * MINUTE_MS
+
+        window = store.read('BTCUSD', 1, start_time=3 * MINUTE_MS, end_time=6 * MINUTE_MS)
+        assert list(window['open_time'] // MINUTE_MS) == [3, 4, 5, 6]
+        assert isinstance(window.base, np.memmap) or isinstance(window, np.memmap)
+        assert list(store.read('BTCUSD', 1, last=2)['close']) == [13.5, 14.5]
+
+        # A fresh instance (restart) sees the same history
+        df = BarStore(root).read_frame('BTCUSD', 1, last=5)
+        assert list(df['open_time'] // MINUTE_MS) == [10, 11, 12, 13, 14]
+        assert df['close_time'].iloc[0] == 11 * MINUTE_MS - 1
+        print("✅ Bar store OK")
+
+
+def test_bar_cache_warm_start_from_store():
+    """A cold cache seeded from disk only fetches bars newer than the stored ones"""
+    with tempfile.TemporaryDirectory() as root:
+        store = BarStore(root)
+        store.append('BTCUSD', 1, make_bars(0, 100), now_ms=100 * MINUTE_MS)
+        calls = []
+
+        def fetcher(symbol, tf_minutes, bars, start_time=None, end_time=None):
+            calls.append(start_time)
+            return make_bars(99, 3)  # last stored bar refreshed plus two new ones
+
+        cache = BarCache(fetcher, max_bars=100, store=store)
+        bars = cache.get_bars('BTCUSD', 1, 50)
+        assert calls == [99 * MINUTE_MS]
+        assert cache.stats['warm_starts'] == 1 and cache.stats['full_fetches'] == 0
+        assert bars['open_time'].iloc[-1] == 101 * MINUTE_MS
+        assert bars['open_time'].is_unique
+        # Only bar 100 closed since the stored history; 101 is still forming
+        assert store.last_time('BTCUSD', 1) == 100 * MINUTE_MS
+        print("✅ Warm start OK")
+
+
+def test_bar_cache_persists_only_newly_closed_bars():
+    """Each call hands the store just the bars closed since the last persisted one"""
+    with tempfile.TemporaryDirectory() as root:
+        appended = []
+
+        class RecordingStore(BarStore):
+            def append(self, symbol, tf_minutes, bars, now_ms=None):
+                appended.append(list(bars['open_time'] // MINUTE_MS))
+                return super().append(symbol, tf_minutes, bars, now_ms)
+
+        store = RecordingStore(root)
+        responses = iter([make_bars(0, 20), make_bars(19, 1), make_bars(19, 3)])
+        cache = BarCache(lambda *args, **kwargs: next(responses), max_bars=20, store=store)
+
+        cache.get_bars('BTCUSD', 1, 20)  # full fetch: bars 0-18 closed, 19 in progress
+        cache.get_bars('BTCUSD', 1, 20)  # bar 19 refreshed, nothing new closed
+        cache.get_bars('BTCUSD', 1, 20)  # bars 19 and 20 closed, 21 in progress
+        assert appended == [list(range(19)), [19, 20]]
+        assert store.count('BTCUSD', 1) == 21
+
+
+def test_replayed_outcomes_are_in_pips():
+    """Outcomes replayed from stored bars use the symbol's pip size, like the simulated ones"""
+    bars = pd.DataFrame({'open_time': [0, MINUTE_MS], 'high': [1.1005, 1.1030], 'low': [1.0995, 1.1000]})
+    signal = {'symbol': 'EURUSD', 'side': 'buy', 'entry': 1.1000, 'sl': 1.0980, 'tp': [1.1025]}
+    resolved = AutomatedBacktester().resolve_signal_outcome(signal, bars)
+    assert resolved['outcome'] == 'tp_hit'
+    assert abs(resolved['pips'] - 25) < 1e-6
+
+    signal = dict(signal, symbol='BTCUSD', side='sell', entry=60000.0, sl=60100.0, tp=[59000.0])
+    bars = pd.DataFrame({'open_time': [0], 'high': [60150.0], 'low': [59950.0]})
+    assert abs(AutomatedBacktester().resolve_signal_outcome(signal, bars)['pips'] + 100) < 1e-6
+    print("✅ Replayed outcome pips OK")
+
+
+if __name__ == "__main__":
+    test_append_and_range_queries()
+    test_bar_cache_warm_start_from_store()
+    test_bar_cache_persists_only_newly_closed_bars()
+    test_replayed_outcomes_are_in_pips()
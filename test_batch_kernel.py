@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test for the batched multi-symbol gating kernel
+"""
+
+import numpy as np
+import pandas as pd
+
+from batch_kernel import compute_gate_features, evaluate_gates, gate_frames, stack_frames
+from feature_engine import compute_features
+
+
+def make_frame(bars, seed, drift=0.0):
+    rng = np.random.default_rng(seed)
+    close = 100 + (rng.normal(0, 1, bars) + drift).cumsum()
+    return pd.DataFrame({'open': close, 'high': close + rng.random(bars),
+                         'low': close - rng.random(bars), 'close': close})
+
+
+def test_kernel_matches_per_symbol_features():
+    """Every row equals the per-frame feature engine, including short histories"""
+    print("🔍 Testing batch kernel...")
+    frames = [make_frame(bars, seed) for seed, bars in enumerate([200, 60, 51, 30, 14, 5])]
+    matrices = stack_frames(frames)
+    batch = compute_gate_features(matrices['close'], matrices['high'], matrices['low'])
+
+    for row, df in enumerate(frames):
+        expected = compute_features(df)
+        for name, values in batch.items():
+            assert np.isclose(values[row], expected[name], equal_nan=True), (row, name)
+    print("✅ Kernel features OK")
+
+
+def test_gates_match_scalar_conditions():
+    frames = [make_frame(120, seed, drift) for seed in range(20) for drift in (-0.3, 0.0, 0.3)]
+    passed = gate_frames(frames)
+    for df, ok in zip(frames, passed):
+        f = compute_features(df)
+        price = f['close']
+        bullish = f['ma20'] > f['ma50'] and f['rsi14'] > 50 and abs(price - f['support']) < price * 0.03
+        bearish = f['ma20'] < f['ma50'] and f['rsi14'] < 50 and abs(price - f['resistance']) < price * 0.03
+        assert ok == (bullish or bearish)
+    assert any(passed) and not all(passed)
+
+    gates = evaluate_gates({'close': np.array([100.0]), 'ma20': np.array([np.nan]), 'ma50': np.array([99.0]),
+                            'rsi14': np.array([60.0]), 'support': np.array([99.0]),
+                            'resistance': np.array([101.0])})
+    assert not gates['passed'][0]
+    assert gate_frames([]) == []
+    print("✅ Batch gates OK")
+
+
+if __name__ == "__main__":
+    test_kernel_matches_per_symbol_features()
+    test_gates_match_scalar_conditions()
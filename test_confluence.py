@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test for the multi-timeframe confluence evaluator
+"""
+
+from confluence import ConfluenceEvaluator
+
+
+def make_signal(tf, side, entry=100.0):
+    return {'symbol': 'BTCUSD', 'tf': tf, 'timeframe': tf, 'side': side, 'entry': entry,
+            'sl': entry - 1, 'tp': [entry + 2], 'confidence': 99.0}
+
+
+def test_agreeing_timeframes_merge_into_one_signal():
+    print("🔍 Testing confluence evaluator...")
+    evaluator = ConfluenceEvaluator()
+    merged = evaluator.evaluate('BTCUSD', {
+        'M3': [make_signal('M3', 'buy', 100.0)],
+        'M5': [make_signal('M5', 'buy', 100.5)],
+        'M15': [make_signal('M15', 'buy', 101.0)]
+    })
+    assert len(merged) == 1
+    signal = merged[0]
+    assert signal['tf'] == 'M15' and signal['entry'] == 101.0  # highest timeframe is the base
+    assert signal['confluence']['timeframes'] == ['M3', 'M5', 'M15']
+    assert signal['confluence_score'] == 1.0
+    assert signal['confluence']['evidence']['M3']['entry'] == 100.0
+    assert evaluator.get_stats() == {'candidates': 3, 'merged_signals': 1, 'expired': 0}
+    print("✅ Agreeing timeframes merged")
+
+
+def test_skipped_timeframes_still_count_as_evidence():
+    """An unchanged M15 verdict from an earlier scan supports or opposes a fresh M3 signal"""
+    evaluator = ConfluenceEvaluator()
+    evaluator.evaluate('BTCUSD', {'M15': [make_signal('M15', 'sell')], 'M5': []})
+
+    merged = evaluator.evaluate('BTCUSD', {'M3': [make_signal('M3', 'buy')]})
+    assert len(merged) == 1 and merged[0]['tf'] == 'M3'
+    assert merged[0]['confluence']['opposing_timeframes'] == ['M15']
+    assert merged[0]['confluence_score'] < 0
+
+    # Once M15 re-evaluates with no signal the stale verdict is dropped
+    merged = evaluator.evaluate('BTCUSD', {'M15': [], 'M3': [make_signal('M3', 'buy')]})
+    assert merged[0]['confluence']['opposing_timeframes'] == []
+    assert evaluator.evaluate('BTCUSD', {'M3': []}) == []
+    print("✅ Cached evidence OK")
+
+
+def test_old_evidence_expires():
+    """A timeframe that stops being evaluated stops counting after about one more bar"""
+    minute = 60_000
+    evaluator = ConfluenceEvaluator()
+    evaluator.evaluate('BTCUSD', {'M15': [make_signal('M15', 'sell')]}, {'M15': 0}, now_ms=minute)
+
+    merged = evaluator.evaluate('BTCUSD', {'M3': [make_signal('M3', 'buy')]}, {'M3': 27 * minute}, now_ms=28 * minute)
+    assert merged[0]['confluence']['opposing_timeframes'] == ['M15']
+
+    merged = evaluator.evaluate('BTCUSD', {'M3': [make_signal('M3', 'buy')]}, {'M3': 30 * minute}, now_ms=31 * minute)
+    assert merged[0]['confluence']['opposing_timeframes'] == []
+    assert ('BTCUSD', 'M15') not in evaluator.latest
+    assert evaluator.get_stats()['expired'] == 1
+    print("✅ Evidence expiry OK")
+
+
+if __name__ == "__main__":
+    test_agreeing_timeframes_merge_into_one_signal()
+    test_skipped_timeframes_still_count_as_evidence()
+    test_old_evidence_expires()
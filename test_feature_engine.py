@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test for the shared per-bar feature engine
+"""
+
+import numpy as np
+import pandas as pd
+
+from feature_engine import FeatureEngine, compute_features
+
+
+def make_frame(bars=120, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, bars).cumsum()
+    return pd.DataFrame({
+        'open_time': np.arange(bars) * 60_000, 'open': close,
+        'high': close + rng.random(bars), 'low': close - rng.random(bars), 'close': close
+    })
+
+
+def test_features_match_rolling_reference():
+    """Engine values equal the pandas rolling computations they replace"""
+    print("🔍 Testing feature engine...")
+    df = make_frame()
+    features = compute_features(df)
+
+    delta = df['close'].diff()
+    gain = (delta.where(delta > 0, 0)).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    rsi = 100 - (100 / (1 + gain / (loss + 1e-9)))
+    true_range = pd.concat([df['high'] - df['low'], (df['high'] - df['close'].shift()).abs(),
+                            (df['low'] - df['close'].shift()).abs()], axis=1).max(axis=1)
+
+    assert np.isclose(features['ma20'], df['close'].rolling(20).mean().iloc[-1])
+    assert np.isclose(features['ma50'], df['close'].rolling(50).mean().iloc[-1])
+    assert np.isclose(features['rsi14'], rsi.iloc[-1])
+    assert np.isclose(features['atr14'], true_range.rolling(14).mean().iloc[-1])
+    assert np.isclose(features['support'], df['low'].rolling(20).min().iloc[-1])
+    assert np.isclose(features['resistance'], df['high'].rolling(20).max().iloc[-1])
+    assert features['bb_lower'] < features['bb_middle'] < features['bb_upper']
+    assert np.isnan(compute_features(df.head(30))['ma50'])
+    print("✅ Feature values OK")
+
+
+def test_computed_once_per_bar():
+    """Consumers of the same bar share one computation; a revised bar recomputes"""
+    engine = FeatureEngine()
+    df = make_frame()
+    first = engine.get_features('BTCUSD', 'M5', df)
+    assert engine.get_features('BTCUSD', 'M5', df.copy()) is first
+    assert engine.stats['hits'] == 1 and engine.stats['computed'] == 1
+
+    revised = df.copy()
+    revised.loc[revised.index[-1], 'close'] += 5
+    assert engine.get_features('BTCUSD', 'M5', revised)['close'] == first['close'] + 5
+    assert engine.stats['computed'] == 2
+    print("✅ Per-bar caching OK")
+
+
+class FakeTalib:
+    """Records which TA-Lib indicators the API asks for"""
+    def __init__(self, n):
+        self.calls = []
+        self.n = n
+
+    def RSI(self, close, timeperiod):
+        self.calls.append(('RSI', timeperiod))
+        return np.full(self.n, 75.0)
+
+    def MACD(self, close):
+        self.calls.append(('MACD',))
+        return np.ones(self.n), np.zeros(self.n), np.ones(self.n)
+
+    def BBANDS(self, close):
+        self.calls.append(('BBANDS',))
+        return np.full(self.n, 90.0), np.full(self.n, 80.0), np.full(self.n, 70.0)
+
+
+def test_api_indicators_keep_their_definitions():
+    """The API's TA-Lib path still uses TA-Lib's indicators, and the manual path
+    the simple 14-delta RSI and SMA20/SMA50 trend it always used"""
+    import api.index as api
+
+    df = make_frame()
+    closes = df['close'].values
+    deltas = np.diff(closes)
+    avg_gain = np.mean(np.where(deltas > 0, deltas, 0)[-14:])
+    avg_loss = np.mean(np.where(deltas < 0, -deltas, 0)[-14:])
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+
+    original = api.talib
+    try:
+        api.talib = None
+        manual = api.calculate_real_technical_indicators({'price': 100.0, 'historical_data': df}, 'TEST')
+        assert abs(manual['rsi'] - rsi) < 1e-9
+        assert manual['signal_strength'] == (0.8 if abs(rsi - 50) > 20 else 0.6)
+        trending = np.mean(closes[-20:]) > np.mean(closes[-50:])
+        assert manual['market_condition'] == ('trending' if trending else 'ranging')
+
+        api.talib = FakeTalib(len(df))
+        indicators = api.calculate_real_technical_indicators({'price': 95.0, 'historical_data': df}, 'TEST')
+        assert api.talib.calls == [('RSI', 14), ('MACD',), ('BBANDS',)]
+        assert indicators['rsi'] == 75.0
+        assert indicators['market_condition'] == 'overbought'  # above the TA-Lib upper band of 90
+    finally:
+        api.talib = original
+    print("✅ API indicator definitions OK")
+
+
+if __name__ == "__main__":
+    test_features_match_rolling_reference()
+    test_computed_once_per_bar()
+    test_api_indicators_keep_their_definitions()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test for the shared HTTP transport
+Runs against a local keep-alive HTTP server
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from http_transport import HttpTransport
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_GET(self):
+        KeepAliveHandler.connections.add(self.client_address)
+        body = b'{"price": "1.0"}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_connections_are_reused_per_host():
+    """Sequential requests to one host share a single pooled connection"""
+    print("🔍 Testing pooled keep-alive transport...")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    transport = HttpTransport(timeout=5, retries=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/api/v3/ticker/price"
+        for _ in range(5):
+            response = transport.get(url)
+            assert response.status_code == 200
+            assert response.json()['price'] == '1.0'
+        assert len(KeepAliveHandler.connections) == 1
+        print("✅ Connection reuse OK")
+    finally:
+        transport.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_host_settings():
+    """Per-host overrides take precedence over defaults"""
+    transport = HttpTransport(timeout=10, max_per_host=8)
+    transport.configure_host('api.telegram.org', timeout=15, max_concurrency=2)
+    assert transport._setting('api.telegram.org', 'timeout', transport.timeout) == 15
+    assert transport._setting('api.binance.com', 'timeout', transport.timeout) == 10
+    _, semaphore = transport._pool('api.telegram.org')
+    assert semaphore.acquire(blocking=False) and semaphore.acquire(blocking=False)
+    assert not semaphore.acquire(blocking=False)
+    print("✅ Host settings OK")
+
+
+if __name__ == "__main__":
+    test_connections_are_reused_per_host()
+    test_host_settings()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test for intrabar TP/SL resolution from bar ranges
+"""
+
+import random
+
+import pandas as pd
+
+from intrabar_resolver import IntrabarResolver
+
+MINUTE_MS = 60_000
+START = 1_700_000_000_000
+
+
+def make_bars(ranges, start=START):
+    return pd.DataFrame({
+        'open_time': [start + i * MINUTE_MS for i in range(len(ranges))],
+        'high': [h for h, _ in ranges],
+        'low': [l for _, l in ranges]
+    })
+
+
+def make_trade(side, sl, tps, opened_at=START - 1):
+    return {'symbol': 'BTCUSD', 'side': side, 'entry': 100.0, 'sl': sl, 'tp': tps,
+            'status': 'open', 'opened_at': opened_at}
+
+
+def reference_outcome(trade, bars):
+    """Bar-by-bar replay: the first bar reaching any level decides, stop first"""
+    buy = trade['side'] == 'buy'
+    for _, bar in bars.iterrows():
+        if bar['open_time'] <= trade['opened_at']:
+            continue
+        if (bar['low'] <= trade['sl']) if buy else (bar['high'] >= trade['sl']):
+            return 'sl_hit', trade['sl']
+        for i, tp in enumerate(trade['tp'][:3]):
+            if (bar['high'] >= tp) if buy else (bar['low'] <= tp):
+                return f"tp{i + 1}_hit", tp
+    return None
+
+
+def test_wick_between_polls_is_caught():
+    """A wick through TP1 that a sampled price would miss still closes the trade at TP1"""
+    print("🔍 Testing intrabar resolution...")
+    resolver = IntrabarResolver()
+    buy = make_trade('buy', 95.0, [105.0, 110.0, 115.0])
+    sell = make_trade('sell', 105.0, [95.0, 90.0, 85.0])
+    bars = make_bars([(101, 99), (106, 100), (102, 99)])
+
+    outcomes = resolver.resolve('BTCUSD', [buy, sell], bars)
+    assert outcomes == [(buy, 'tp1_hit', 105.0), (sell, 'sl_hit', 105.0)]
+    print("✅ Wick resolution OK")
+
+
+def test_order_of_hits():
+    """Earlier bars win; one bar reaching both SL and TP counts as a stop"""
+    resolver = IntrabarResolver()
+    late_tp = make_trade('buy', 90.0, [104.0, 108.0, 112.0])
+    early_sl = make_trade('buy', 98.0, [120.0, 130.0, 140.0])
+    both = make_trade('sell', 103.0, [98.0, 95.0, 93.0])
+    bars = make_bars([(101, 99.5), (103, 97.5), (109, 100)])
+
+    outcomes = resolver.resolve('BTCUSD', [late_tp, early_sl, both], bars)
+    assert [(t, o) for t, o, _ in outcomes] == [
+        (early_sl, 'sl_hit'), (both, 'sl_hit'), (late_tp, 'tp1_hit')]
+    print("✅ Hit ordering OK")
+
+
+def test_bars_before_entry_and_already_checked_are_skipped():
+    resolver = IntrabarResolver()
+    opened_late = make_trade('buy', 95.0, [105.0, 110.0, 115.0], opened_at=START + MINUTE_MS + 1)
+    bars = make_bars([(101, 99), (106, 99), (101, 99)])
+    assert resolver.resolve('BTCUSD', [opened_late], bars) == []
+
+    # Only the newest bar seen is checked again, so its later extension counts
+    resolver.resolve('BTCUSD', [], bars)
+    extended = make_bars([(101, 99), (106, 99), (101, 94)])
+    assert resolver.resolve('BTCUSD', [opened_late], extended) == [(opened_late, 'sl_hit', 95.0)]
+    assert resolver.get_stats()['resolved'] == 1
+
+
+def test_matches_bar_replay():
+    """Vectorized outcomes agree with a per-trade bar-by-bar replay"""
+    rng = random.Random(7)
+    price, ranges = 100.0, []
+    for _ in range(200):
+        price += rng.uniform(-1, 1)
+        ranges.append((price + rng.uniform(0, 1.5), price - rng.uniform(0, 1.5)))
+    bars = make_bars(ranges)
+
+    trades = []
+    for _ in range(300):
+        side = rng.choice(['buy', 'sell'])
+        entry = rng.uniform(90, 110)
+        risk = rng.uniform(0.5, 5)
+        sign = 1 if side == 'buy' else -1
+        opened_at = START + rng.randrange(0, 200) * MINUTE_MS + rng.randrange(-1, 2)
+        trades.append(make_trade(side, entry - sign * risk, [entry + sign * risk * k for k in (1, 2, 3)], opened_at))
+
+    outcomes = {id(t): (o, p) for t, o, p in IntrabarResolver().resolve('BTCUSD', trades, bars)}
+    for trade in trades:
+        assert outcomes.get(id(trade)) == reference_outcome(trade, bars)
+    print("✅ Vectorized resolution matches replay")
+
+
+if __name__ == "__main__":
+    test_wick_between_polls_is_caught()
+    test_order_of_hits()
+    test_bars_before_entry_and_already_checked_are_skipped()
+    test_matches_bar_replay()
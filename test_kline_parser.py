@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test for the Binance kline fast parser
+"""
+
+import json
+
+import numpy as np
+
+from kline_parser import parse_klines
+
+ROWS = [
+    [1700000000000 + i * 60000, f"{100 + i:.2f}", "101.50000000", "99.50000000", "100.25000000",
+     "12.34500000", 1700000000000 + i * 60000 + 59999, "1234.5", 10, "1.2", "3.4", "0"]
+    for i in range(50)
+]
+
+
+def test_fast_path_matches_json_decoding():
+    """Raw response bytes decode to the same values as json + float()"""
+    print("🔍 Testing kline parser...")
+    raw = json.dumps(ROWS, separators=(',', ':')).encode()
+    bars = parse_klines(raw)
+    assert len(bars) == 50
+    assert bars.close.dtype == np.float64 and bars.close.flags['C_CONTIGUOUS']
+    assert bars.open[3] == 103.0 and bars.volume[0] == 12.345
+    assert bars.open_time[-1] == ROWS[-1][0]
+
+    # Pretty-printed or already-decoded payloads take the slow path
+    assert np.array_equal(parse_klines(json.dumps(ROWS)).data, bars.data)
+    assert np.array_equal(parse_klines(ROWS).data, bars.data)
+    print("✅ Parser OK")
+
+
+def test_dataframe_view_and_edge_cases():
+    """DataFrame view keeps the scanner layout; errors and empty payloads are handled"""
+    bars = parse_klines(json.dumps(ROWS[:2], separators=(',', ':')))
+    df = bars.to_dataframe()
+    assert list(df.columns) == ['open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time']
+    assert df['open_time'].dtype == np.int64 and df['open_time'].iloc[1] == ROWS[1][0]
+    assert df['close'].dtype == np.float64
+
+    assert len(parse_klines(b'[]')) == 0
+    assert parse_klines(b'{"code":-1121,"msg":"Invalid symbol."}') is None
+    print("✅ DataFrame view OK")
+
+
+if __name__ == "__main__":
+    test_fast_path_matches_json_decoding()
+    test_dataframe_view_and_edge_cases()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test for the open-trade price-level index
+"""
+
+import random
+
+from level_index import LevelIndex
+
+
+def make_trade(symbol, side, entry, sl, tps):
+    return {'symbol': symbol, 'side': side, 'entry': entry, 'sl': sl, 'tp': tps, 'status': 'open'}
+
+
+def reference_outcome(trade, price):
+    """The per-trade if/elif chain the index replaces"""
+    if trade['side'] == 'buy':
+        if price <= trade['sl']:
+            return 'sl_hit'
+        for i, tp in enumerate(trade['tp'][:3]):
+            if price >= tp:
+                return f"tp{i + 1}_hit"
+    else:
+        if price >= trade['sl']:
+            return 'sl_hit'
+        for i, tp in enumerate(trade['tp'][:3]):
+            if price <= tp:
+                return f"tp{i + 1}_hit"
+    return None
+
+
+def test_buy_and_sell_levels():
+    print("🔍 Testing level index...")
+    index = LevelIndex()
+    buy = make_trade('BTCUSD', 'buy', 100.0, 95.0, [105.0, 110.0, 115.0, 120.0, 125.0])
+    sell = make_trade('BTCUSD', 'sell', 100.0, 104.0, [96.0, 92.0, 88.0])
+    other = make_trade('XAUUSD', 'buy', 2000.0, 1990.0, [2010.0])
+    for trade in (buy, sell, other):
+        index.add(trade)
+    assert len(index) == 3 and len(index.levels('BTCUSD')) == 8
+
+    assert index.update('BTCUSD', 101.0) == []
+    assert index.update('BTCUSD', 104.5) == [(sell, 'sl_hit')]
+    assert index.update('BTCUSD', 112.0) == [(buy, 'tp1_hit')]  # TP1 wins over TP2 like before
+    assert index.levels('BTCUSD') == [] and len(index) == 1
+
+    index.remove(other)
+    assert index.update('XAUUSD', 1980.0) == []
+    print("✅ Buy/sell levels OK")
+
+
+def test_matches_per_trade_checks_with_many_trades():
+    rng = random.Random(11)
+    index = LevelIndex()
+    trades = []
+    for _ in range(3000):
+        side = rng.choice(['buy', 'sell'])
+        entry = rng.uniform(90, 110)
+        risk = rng.uniform(0.5, 5)
+        sign = 1 if side == 'buy' else -1
+        trade = make_trade('BTCUSD', side, entry, entry - sign * risk,
+                           [entry + sign * risk * m for m in (1, 1.5, 2, 2.5, 3)])
+        trades.append(trade)
+        index.add(trade)
+
+    price = 100.0
+    for _ in range(200):
+        price += rng.uniform(-1, 1)
+        expected = {id(t): reference_outcome(t, price) for t in trades if t['status'] == 'open'}
+        hits = index.update('BTCUSD', price)
+        assert {id(t): outcome for t, outcome in hits} == {k: v for k, v in expected.items() if v}
+        for trade, outcome in hits:
+            trade['status'] = outcome
+    assert len(index) == sum(t['status'] == 'open' for t in trades)
+    print("✅ Index matches per-trade checks")
+
+
+if __name__ == "__main__":
+    test_buy_and_sell_levels()
+    test_matches_per_trade_checks_with_many_trades()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Test for the streaming market data client
+Uses a stand-in transport that replays scripted websocket sessions, and a local
+stand-in websocket server driven through the real websocket-client transport
+"""
+
+import base64
+import hashlib
+import json
+import queue
+import socket
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from market_stream import WEBSOCKET_AVAILABLE, BinanceMarketStream, WebSocketClientTransport
+
+MINUTE_MS = 60_000
+
+
+def kline(open_time, close, closed=False):
+    return json.dumps({'stream': 'btcusdt@kline_1m', 'data': {
+        'e': 'kline', 's': 'BTCUSDT',
+        'k': {'t': open_time, 'T': open_time + MINUTE_MS - 1, 'i': '1m',
+              'o': str(close - 1), 'h': str(close + 2), 'l': str(close - 2),
+              'c': str(close), 'v': '3.5', 'x': closed}
+    }})
+
+
+def book_ticker(bid, ask):
+    return json.dumps({'stream': 'btcusdt@bookTicker',
+                       'data': {'u': 1, 's': 'BTCUSDT', 'b': str(bid), 'B': '1', 'a': str(ask), 'A': '1'}})
+
+
+class ScriptedConnection:
+    def __init__(self, messages):
+        self.messages = queue.Queue()
+        for message in messages:
+            self.messages.put(message)
+
+    def recv(self):
+        message = self.messages.get(timeout=5)
+        if isinstance(message, Exception):
+            raise message
+        return message
+
+    def close(self):
+        pass
+
+
+class StandInTransport:
+    """Hands out one scripted session per connect() call"""
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        self.urls = []
+
+    def connect(self, url):
+        self.urls.append(url)
+        if not self.sessions:
+            return ScriptedConnection([])  # idle until the test stops the stream
+        return ScriptedConnection(self.sessions.pop(0))
+
+
+class StandInServer:
+    """Minimal local websocket server: each accepted connection replays the next
+    scripted session then drops the socket; once the sessions run out the
+    connection is held open idle until the client closes it"""
+
+    GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+    def __init__(self, sessions):
+        self.sessions = list(sessions)
+        self.paths = []
+        self.idle = []
+        self.sock = socket.socket()
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen()
+        self.url = f"ws://127.0.0.1:{self.sock.getsockname()[1]}/stream"
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            request = b''
+            while b'\r\n\r\n' not in request:
+                request += conn.recv(4096)
+            lines = request.decode().split('\r\n')
+            self.paths.append(lines[0].split()[1])
+            key = next(l.split(':', 1)[1].strip() for l in lines if l.lower().startswith('sec-websocket-key'))
+            accept = base64.b64encode(hashlib.sha1((key + self.GUID).encode()).digest()).decode()
+            conn.sendall((
+                "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode())
+            if not self.sessions:
+                self.idle.append(conn)
+                threading.Thread(target=self.answer_close, args=(conn,), daemon=True).start()
+                continue
+            for message in self.sessions.pop(0):
+                payload = message.encode()
+                conn.sendall(bytes([0x81, len(payload)]) if len(payload) < 126 else
+                             bytes([0x81, 126]) + len(payload).to_bytes(2, 'big'))
+                conn.sendall(payload)
+            conn.close()  # drop without a close frame
+
+    def answer_close(self, conn):
+        """The only frame an idle client sends is its close - echo one back"""
+        try:
+            if conn.recv(1024):
+                conn.sendall(bytes([0x88, 0]))
+        except OSError:
+            pass
+        conn.close()
+
+    def close(self):
+        self.sock.close()
+        for conn in self.idle:
+            conn.close()
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_stream_bars_prices_and_reconnect_backfill():
+    """Live updates, reconnect after a drop, and REST gap backfill"""
+    print("🔍 Testing market stream...")
+    backfill_calls = []
+
+    def backfill(symbol, tf_minutes, bars, start_time=None, end_time=None):
+        backfill_calls.append(start_time)
+        if start_time is None:
+            return pd.DataFrame({'open_time': [0, MINUTE_MS], 'open': [1.0, 2.0], 'high': [1.0, 2.0],
+                                 'low': [1.0, 2.0], 'close': [1.0, 2.0], 'volume': [1.0, 1.0]})
+        # Bars that closed while disconnected
+        return pd.DataFrame({'open_time': [2 * MINUTE_MS, 3 * MINUTE_MS], 'open': [5.0, 6.0],
+                             'high': [5.0, 6.0], 'low': [5.0, 6.0], 'close': [5.0, 6.0], 'volume': [1.0, 1.0]})
+
+    closed_bars = []
+    transport = StandInTransport([
+        [kline(MINUTE_MS, 100.0), kline(MINUTE_MS, 101.0, closed=True), kline(2 * MINUTE_MS, 102.0),
+         book_ticker(99.0, 101.0), ConnectionError("dropped")],
+        [book_ticker(109.0, 111.0)]
+    ])
+    stream = BinanceMarketStream(['BTCUSD', 'US30'], intervals=[1], backfill=backfill,
+                                 transport=transport, reconnect_delay=0.01)
+    stream.add_bar_close_listener(lambda symbol, tf, bar: closed_bars.append((symbol, tf, bar['close'])))
+    stream.start()
+    try:
+        assert wait_for(lambda: stream.get_price('BTCUSD') == 110.0)
+        assert 'btcusdt@kline_1m' in transport.urls[0] and 'btcusdt@bookTicker' in transport.urls[0]
+        assert closed_bars == [('BTCUSD', 1, 101.0)]
+        assert stream.stats['reconnects'] == 1
+        # Initial seed, then a gap fill starting at the last live bar
+        assert backfill_calls == [None, 2 * MINUTE_MS]
+
+        bars = stream.get_bars('BTCUSD', 1, 10)
+        assert list(bars['open_time']) == [0, MINUTE_MS, 2 * MINUTE_MS, 3 * MINUTE_MS]
+        assert bars['close'].iloc[1] == 101.0
+        assert bars['close'].iloc[-1] == 6.0
+
+        # Incremental kline requests are served from memory while connected
+        served = stream.fetch_market_data('BTCUSD', 1, 10, start_time=2 * MINUTE_MS)
+        assert list(served['open_time']) == [2 * MINUTE_MS, 3 * MINUTE_MS]
+        assert len(backfill_calls) == 2
+        print("✅ Stream OK")
+    finally:
+        stream.stop()
+
+
+def test_connected_only_after_backfill_succeeds():
+    """A failed gap fill leaves the stream disconnected and retries on a new connection"""
+    states = []
+
+    def backfill(symbol, tf_minutes, bars, start_time=None, end_time=None):
+        states.append(stream.connected)
+        if len(states) == 1:
+            raise TimeoutError("REST down")
+        return pd.DataFrame({'open_time': [0], 'open': [1.0], 'high': [1.0],
+                             'low': [1.0], 'close': [1.0], 'volume': [1.0]})
+
+    transport = StandInTransport([[book_ticker(99.0, 101.0)], [book_ticker(109.0, 111.0)]])
+    stream = BinanceMarketStream(['BTCUSD'], intervals=[1], backfill=backfill,
+                                 transport=transport, reconnect_delay=0.01)
+    stream.start()
+    try:
+        assert wait_for(lambda: stream.connected)
+        assert states == [False, False]
+        # The first session was abandoned before any message was consumed
+        assert wait_for(lambda: stream.get_price('BTCUSD') == 110.0)
+        assert len(transport.urls) == 2 and stream.stats['reconnects'] == 1
+    finally:
+        stream.stop()
+    assert not stream.connected
+
+
+@pytest.mark.skipif(not WEBSOCKET_AVAILABLE, reason="websocket-client is not installed")
+def test_real_websocket_server_with_reconnect():
+    """End to end over a real socket: handshake, frames, a dropped connection and a reconnect"""
+    backfill_calls = []
+
+    def backfill(symbol, tf_minutes, bars, start_time=None, end_time=None):
+        backfill_calls.append((start_time, stream.connected))
+        return pd.DataFrame({'open_time': [0], 'open': [1.0], 'high': [1.0],
+                             'low': [1.0], 'close': [1.0], 'volume': [1.0]})
+
+    server = StandInServer([
+        [kline(MINUTE_MS, 101.0, closed=True), book_ticker(99.0, 101.0)],
+        [kline(2 * MINUTE_MS, 103.0), book_ticker(109.0, 111.0)]
+    ])
+    stream = BinanceMarketStream(['BTCUSD'], intervals=[1], backfill=backfill, url=server.url,
+                                 transport=WebSocketClientTransport(timeout=5), reconnect_delay=0.01)
+    stream.start()
+    try:
+        assert wait_for(lambda: stream.get_price('BTCUSD') == 110.0)
+        assert wait_for(lambda: len(server.paths) >= 3)  # second drop, then the idle session
+        assert wait_for(lambda: stream.connected)
+        assert all(path.startswith('/stream?streams=btcusdt@kline_1m/btcusdt@bookTicker')
+                   for path in server.paths)
+        assert stream.stats['reconnects'] >= 2
+        # Seeded once, then gap fills from the last bar held - never while marked connected
+        assert backfill_calls[:3] == [(None, False), (MINUTE_MS, False), (2 * MINUTE_MS, False)]
+        assert list(stream.get_bars('BTCUSD', 1, 10)['open_time']) == [0, MINUTE_MS, 2 * MINUTE_MS]
+        print("✅ Real websocket reconnect OK")
+    finally:
+        stream.stop()
+        server.close()
+
+
+if __name__ == "__main__":
+    test_stream_bars_prices_and_reconnect_backfill()
+    test_connected_only_after_backfill_succeeds()
+    if WEBSOCKET_AVAILABLE:
+        test_real_websocket_server_with_reconnect()
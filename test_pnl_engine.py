@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test for the vectorized open-trade P&L engine
+"""
+
+import random
+
+from pnl_engine import PnLEngine, pnl_pips, symbol_point
+
+
+def make_trade(symbol, side, entry, sl, size=0.1):
+    return {'symbol': symbol, 'side': side, 'entry': entry, 'sl': sl, 'tp': [], 'position_size': size}
+
+
+def test_pips_use_symbol_points():
+    """P&L is quoted in each symbol's own pip/point size"""
+    print("🔍 Testing per-symbol pip units...")
+    assert symbol_point('EURUSD') == 0.0001 and symbol_point('BTCUSD') == 1.0
+    assert abs(pnl_pips('EURUSD', 'buy', 1.1000, 1.1025) - 25) < 1e-6
+    assert abs(pnl_pips('USDJPY', 'sell', 150.00, 149.50) - 50) < 1e-6
+    assert abs(pnl_pips('BTCUSD', 'buy', 60000, 59900) + 100) < 1e-6
+
+    engine = PnLEngine(trail_trigger_pips=0)
+    trades = [make_trade('XAUUSD', 'buy', 2000.0, 1990.0), make_trade('XAUUSD', 'sell', 2010.0, 2020.0),
+              make_trade('US30', 'buy', 39000.0, 38900.0, size=1.0)]
+    marks = engine.mark(trades, {'XAUUSD': 2005.0, 'US30': None})
+    assert [round(p, 6) for p in marks['pnl_pips'][:2]] == [50.0, 50.0]
+    assert marks['by_symbol']['XAUUSD']['net_exposure'] == 0.0
+    assert 'US30' not in marks['by_symbol']
+    print("✅ Pip units OK")
+
+
+def test_trailing_is_report_only_by_default():
+    """Without apply_trailing, candidate stops are reported but trades keep their SL"""
+    trade = make_trade('EURUSD', 'buy', 1.1000, 1.0980)
+    marks = PnLEngine().mark([trade], {'EURUSD': 1.1030})
+    assert marks['trailed'] == [] and trade['sl'] == 1.0980
+    assert [(t, round(new, 6)) for t, _, new in marks['candidates']] == [(trade, 1.1010)]
+
+
+def test_trailing_stops_only_tighten():
+    engine = PnLEngine(trail_trigger_pips=20, trail_distance_pips=20, apply_trailing=True)
+    winner = make_trade('EURUSD', 'buy', 1.1000, 1.0980)
+    loser = make_trade('EURUSD', 'sell', 1.0990, 1.1010)
+    marks = engine.mark([winner, loser], {'EURUSD': 1.1030})
+    assert [t for t, _, _ in marks['trailed']] == [winner]
+    assert abs(winner['sl'] - 1.1010) < 1e-9 and loser['sl'] == 1.1010
+
+    # A pullback never loosens the stop; a new high moves it again
+    assert engine.mark([winner, loser], {'EURUSD': 1.1025})['trailed'] == []
+    engine.mark([winner, loser], {'EURUSD': 1.1050})
+    assert abs(winner['sl'] - 1.1030) < 1e-9
+    assert engine.get_stats()['rebuilds'] == 1
+    print("✅ Trailing stops OK")
+
+
+def test_matches_per_trade_loop():
+    """Vectorized marks agree with the per-trade computation they replace"""
+    rng = random.Random(3)
+    symbols = ['EURUSD', 'USDJPY', 'XAUUSD', 'BTCUSD']
+    prices = {'EURUSD': 1.1, 'USDJPY': 150.0, 'XAUUSD': 2000.0, 'BTCUSD': 60000.0}
+    trades = []
+    for _ in range(500):
+        symbol = rng.choice(symbols)
+        entry = prices[symbol] * rng.uniform(0.99, 1.01)
+        side = rng.choice(['buy', 'sell'])
+        sl = entry * (0.99 if side == 'buy' else 1.01)
+        trades.append(make_trade(symbol, side, entry, sl, size=rng.uniform(0.01, 1)))
+    expected_sl = []
+    for t in trades:
+        point = symbol_point(t['symbol'])
+        price = prices[t['symbol']]
+        if pnl_pips(t['symbol'], t['side'], t['entry'], price) > 20:
+            trail = price - 20 * point if t['side'] == 'buy' else price + 20 * point
+            expected_sl.append(max(t['sl'], trail) if t['side'] == 'buy' else min(t['sl'], trail))
+        else:
+            expected_sl.append(t['sl'])
+
+    marks = PnLEngine(apply_trailing=True).mark(trades, prices)
+    for i, t in enumerate(trades):
+        assert abs(marks['pnl_pips'][i] - pnl_pips(t['symbol'], t['side'], t['entry'], prices[t['symbol']])) < 1e-6
+        assert abs(t['sl'] - expected_sl[i]) < 1e-9
+    print("✅ Vectorized marks match per-trade loop")
+
+
+if __name__ == "__main__":
+    test_pips_use_symbol_points()
+    test_trailing_is_report_only_by_default()
+    test_trailing_stops_only_tighten()
+    test_matches_per_trade_loop()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test for the central price bus
+"""
+
+import threading
+import time
+
+from price_bus import PriceBus
+
+
+class CountingFetcher:
+    def __init__(self, price=100.0, delay=0.0):
+        self.price = price
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, symbol):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.price
+
+
+def test_concurrent_readers_share_one_fetch():
+    """Many consumers reading the same stale symbol trigger a single fetch"""
+    print("🔍 Testing price bus single-flight...")
+    bus = PriceBus(max_age=5, min_interval=1)
+    fetcher = CountingFetcher(delay=0.05)
+    bus.register_source(fetcher)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(bus.get_price('BTCUSD'))) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [100.0] * 6
+    assert fetcher.calls == 1
+    assert bus.get_quote('BTCUSD')['source'] == 'rest'
+    print("✅ Single-flight OK")
+
+
+def test_staleness_and_fetch_interval():
+    """Stale reads refetch, but never more than once per interval"""
+    bus = PriceBus(max_age=5, min_interval=60)
+    fetcher = CountingFetcher()
+    assert bus.get_price('XAUUSD', fetcher=fetcher) == 100.0
+    fetcher.price = 101.0
+    # Stale by max_age but inside min_interval: last known price, no new fetch
+    assert bus.get_price('XAUUSD', max_age=0, fetcher=fetcher) == 100.0
+    assert fetcher.calls == 1
+
+    bus.min_interval = 0
+    assert bus.get_price('XAUUSD', max_age=0, fetcher=fetcher) == 101.0
+    assert fetcher.calls == 2
+    print("✅ Staleness bound OK")
+
+
+def test_published_quotes_reach_subscribers_and_readers():
+    """Pushed quotes notify subscribers and satisfy reads without fetching"""
+    bus = PriceBus(max_age=5)
+    fetcher = CountingFetcher()
+    bus.register_source(fetcher)
+    updates = []
+    bus.subscribe(lambda symbol, quote: updates.append((symbol, quote['price'], quote['source'])))
+
+    bus.publish('BTCUSD', 110.0, bid=109.0, ask=111.0, source='stream')
+    assert bus.get_price('BTCUSD') == 110.0
+    assert fetcher.calls == 0
+    assert updates == [('BTCUSD', 110.0, 'stream')]
+    print("✅ Publish/subscribe OK")
+
+
+def test_per_call_fetcher_covers_what_the_source_does_not():
+    """The registered source is tried first; the caller's fetcher fills in for
+    symbols it doesn't support or when it returns nothing"""
+    bus = PriceBus(max_age=5, min_interval=0)
+    source = CountingFetcher(price=None)
+    bus.register_source(source, name='binance', supports=lambda symbol: symbol != 'US30')
+    fallback = CountingFetcher(price=39000.0)
+
+    assert bus.get_price('US30', fetcher=fallback) == 39000.0
+    assert source.calls == 0 and fallback.calls == 1
+
+    assert bus.get_price('BTCUSD', fetcher=fallback) == 39000.0
+    assert source.calls == 1 and fallback.calls == 2
+    assert bus.get_price('XAUUSD') is None
+    print("✅ Fallback fetcher OK")
+
+
+if __name__ == "__main__":
+    test_concurrent_readers_share_one_fetch()
+    test_staleness_and_fetch_interval()
+    test_published_quotes_reach_subscribers_and_readers()
+    test_per_call_fetcher_covers_what_the_source_does_not()
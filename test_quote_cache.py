@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test for the TTL quote cache with request coalescing
+"""
+
+import threading
+import time
+
+from quote_cache import QuoteCache
+
+
+def test_concurrent_requests_share_one_fetch():
+    """N concurrent requests for one symbol produce a single upstream call"""
+    print("🔍 Testing quote cache coalescing...")
+    cache = QuoteCache(default_ttl=5)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return {'symbol': 'BTCUSD', 'price': 120000.0}, 'Yahoo Finance'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch('BTCUSD', fetch)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert all(r['price'] == 120000.0 for r in results) and len(results) == 8
+    # Later requests are served from the cache
+    cache.get_or_fetch('BTCUSD', fetch)
+    assert len(calls) == 1
+    assert cache.get_stats()['hits'] >= 1
+    print("✅ Coalescing OK")
+
+
+def test_per_source_ttl_and_failures():
+    """Expiry follows the source that produced the value; failures are not cached"""
+    cache = QuoteCache(default_ttl=60, source_ttls={'MT5': 0})
+    calls = []
+
+    def fetch_mt5():
+        calls.append('mt5')
+        return {'price': 1.0}, 'MT5'
+
+    cache.get_or_fetch('EURUSD', fetch_mt5)
+    cache.get_or_fetch('EURUSD', fetch_mt5)
+    assert calls == ['mt5', 'mt5']
+
+    def failing():
+        raise ConnectionError("upstream down")
+
+    try:
+        cache.get_or_fetch('XAUUSD', failing)
+        assert False, "expected the upstream error"
+    except ConnectionError:
+        pass
+    assert cache.get_or_fetch('XAUUSD', lambda: ({'price': 2.0}, 'Yahoo Finance'))['price'] == 2.0
+    print("✅ Per-source TTL OK")
+
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_fetch()
+    test_per_source_ttl_and_failures()
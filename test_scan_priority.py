@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test for adaptive scan prioritization
+"""
+
+from scan_priority import ScanPrioritizer, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_at_budget_rate():
+    print("🔍 Testing scan prioritizer...")
+    clock = FakeClock()
+    bucket = TokenBucket(60, burst=2, clock=clock)
+    assert bucket.take() and bucket.take() and not bucket.take()
+    clock.now += 1.0  # 60/min = one token per second
+    assert bucket.take() and not bucket.take()
+    print("✅ Token bucket OK")
+
+
+def test_hot_symbols_polled_more_often_within_budget():
+    clock = FakeClock()
+    symbols = [f"SYM{i}" for i in range(100)]
+    prioritizer = ScanPrioritizer(symbols, budget_per_minute=120, min_interval=5, max_interval=120, clock=clock)
+    for symbol in symbols:
+        prioritizer.update_score(symbol, probability=0.0, close=100.0, atr=0.5, support=90.0, resistance=110.0)
+    prioritizer.update_score('SYM7', probability=0.9, close=100.0, atr=1.5, support=99.8, resistance=110.0)
+    assert prioritizer.interval('SYM7') < 10 and prioritizer.interval('SYM1') > 60
+
+    scans = {symbol: 0 for symbol in symbols}
+    total = 0
+    for _ in range(600):  # ten minutes in one-second steps
+        selected = prioritizer.select()
+        total += len(selected)
+        for symbol in selected:
+            scans[symbol] += 1
+        clock.now += 1
+    assert total <= 120 * 10 + prioritizer.bucket.capacity
+    assert scans['SYM7'] >= 60
+    assert scans['SYM7'] > 10 * max(v for k, v in scans.items() if k != 'SYM7')
+    print("✅ Hot symbols prioritized within budget")
+
+
+def test_event_requests_are_served_first_and_kept_when_deferred():
+    clock = FakeClock()
+    prioritizer = ScanPrioritizer(['A', 'B', 'C'], budget_per_minute=6, clock=clock)
+    prioritizer.bucket.tokens = 1
+    assert prioritizer.select(['C']) == ['C']
+    prioritizer.bucket.tokens = 0
+    assert prioritizer.select(['B']) == []
+    assert prioritizer.next_due_in() > 0  # waits for the budget, not a busy loop
+    clock.now += 10
+    assert prioritizer.select()[0] == 'B'
+    assert prioritizer.get_stats()['deferred'] >= 1
+    print("✅ Event requests OK")
+
+
+def test_scans_are_charged_their_request_count():
+    """A per-symbol request count is taken from the budget for each scan"""
+    clock = FakeClock()
+    costs = {'A': 4, 'B': 2}
+    prioritizer = ScanPrioritizer(['A', 'B'], budget_per_minute=60, clock=clock,
+                                  requests_per_scan=lambda symbol: costs[symbol])
+    prioritizer.bucket.tokens = 5
+    prioritizer.heat.update({'A': 0.9, 'B': 0.1})
+    assert prioritizer.select() == ['A']  # B's 2 requests no longer fit
+    assert abs(prioritizer.bucket.tokens - 1) < 1e-9
+    assert abs(prioritizer.next_due_in() - 1) < 1e-6  # one more token for B at 1/s
+    print("✅ Per-scan request cost OK")
+
+
+if __name__ == "__main__":
+    test_token_bucket_refills_at_budget_rate()
+    test_hot_symbols_polled_more_often_within_budget()
+    test_event_requests_are_served_first_and_kept_when_deferred()
+    test_scans_are_charged_their_request_count()
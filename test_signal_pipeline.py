@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test for the cost-ordered signal pipeline
+"""
+
+import logging
+import time
+
+import smart_signal_filter
+from signal_pipeline import SignalPipeline, Stage
+from smart_signal_filter import SmartSignalFilter
+
+
+def make_stage(name, calls, passes=lambda signal: True, delay=0.0, **hints):
+    def run(signal):
+        calls.append(name)
+        time.sleep(delay)
+        return passes(signal), f"{name} checked"
+    return Stage(name, run, **hints)
+
+
+def test_cheap_selective_stages_short_circuit_expensive_work():
+    print("🔍 Testing signal pipeline...")
+    calls = []
+    pipeline = SignalPipeline([
+        make_stage('probability', calls, cost_ms=500, reject_rate=0.0),
+        make_stage('risk', calls, passes=lambda s: s['risk_ok'], cost_ms=1, reject_rate=0.3),
+        make_stage('enrich', calls, cost_ms=1, reject_rate=0.0, after=['risk']),
+        make_stage('quality', calls, passes=lambda s: s['quality_ok'], cost_ms=2, reject_rate=0.3,
+                   after=['probability']),
+    ])
+    assert [s.name for s in pipeline.order()] == ['risk', 'enrich', 'probability', 'quality']
+
+    assert pipeline.run({'risk_ok': False, 'quality_ok': True}) == (False, 'risk', 'risk checked')
+    assert calls == ['risk']  # nothing expensive ran
+
+    calls.clear()
+    assert pipeline.run({'risk_ok': True, 'quality_ok': True}) == (True, None, 'passed')
+    assert calls == ['risk', 'enrich', 'probability', 'quality']
+
+    stats = pipeline.get_stats()
+    assert stats['risk']['runs'] == 2 and stats['risk']['rejects'] == 1
+    assert stats['probability']['runs'] == 1
+    assert sum(stats['quality']['histogram'].values()) == 1
+    print("✅ Short-circuit ordering OK")
+
+
+def test_order_adapts_to_measured_cost_and_rejections():
+    calls = []
+    pipeline = SignalPipeline([
+        make_stage('slow', calls, delay=0.02, cost_ms=1, reject_rate=0.5),
+        make_stage('picky', calls, passes=lambda s: False, cost_ms=1, reject_rate=0.01),
+    ])
+    assert pipeline.order()[0].name == 'slow'
+    for _ in range(30):
+        pipeline.run({})
+    # 'slow' proved expensive and never rejects; 'picky' rejects everything cheaply
+    assert pipeline.order()[0].name == 'picky'
+    assert pipeline.get_stats()['slow']['avg_ms'] > 5
+    print("✅ Adaptive ordering OK")
+
+
+def test_stage_errors_do_not_block_signals():
+    def broken(signal):
+        raise RuntimeError("provider down")
+    pipeline = SignalPipeline([Stage('tp_probability', broken)])
+    assert pipeline.run({})[0]
+    assert pipeline.get_stats()['tp_probability']['errors'] == 1
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_precheck_reuses_session_analysis_without_logging():
+    """The quality precheck previews the session adjustments from the session
+    stage's analysis instead of fetching and logging them a second time"""
+    fetched = []
+    session_analysis = {
+        'multipliers': {'probability_multiplier': 1.2, 'confidence_boost': 0.1},
+        'session_info': {'ny_session_active': True, 'overlap_session_active': False,
+                         'priority_score': 2, 'ny_time': '10:00'},
+        'recommendations': ['Trade the NY open']
+    }
+    patched = {
+        'SESSIONS_AVAILABLE': True,
+        'get_session_multipliers': lambda symbol: fetched.append(symbol) or session_analysis,
+        'should_trade_now': lambda symbol: (True, 'NY session'),
+        'session_manager': type('Sessions', (), {'get_session_info': lambda self: session_analysis['session_info']})()
+    }
+    saved = {name: getattr(smart_signal_filter, name, None) for name in patched}
+    handler = RecordingHandler()
+    signal_filter = SmartSignalFilter()
+    signal_filter.logger.addHandler(handler)
+    signal_filter.logger.setLevel(logging.INFO)
+    try:
+        for name, value in patched.items():
+            setattr(smart_signal_filter, name, value)
+        # 0.6 only clears the 65% confidence threshold with the session boost
+        signal = {'symbol': 'EURUSD', 'side': 'buy', 'confidence': 0.6, 'session_multipliers': session_analysis}
+        assert signal_filter.precheck_signal(signal) == (True, "Pre-checks passed")
+        assert signal['confidence'] == 0.6  # previewed on a copy
+        assert fetched == [] and handler.messages == []
+
+        signal_filter.apply_session_multipliers(signal, signal['session_multipliers'])
+        assert fetched == [] and any('SESSION TIP' in m for m in handler.messages)
+    finally:
+        signal_filter.logger.removeHandler(handler)
+        for name, value in saved.items():
+            setattr(smart_signal_filter, name, value)
+
+
+if __name__ == "__main__":
+    test_cheap_selective_stages_short_circuit_expensive_work()
+    test_order_adapts_to_measured_cost_and_rejections()
+    test_stage_errors_do_not_block_signals()
+    test_precheck_reuses_session_analysis_without_logging()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test for the SQLite signal store and the analytics built on it
+"""
+
+import json
+import os
+import tempfile
+
+from signal_store import SignalStore
+from advanced_analytics import AdvancedSignalAnalytics
+
+
+def make_store(tmp, legacy=None):
+    legacy_file = os.path.join(tmp, 'advanced_signals.json')
+    if legacy is not None:
+        with open(legacy_file, 'w') as f:
+            json.dump(legacy, f)
+    return SignalStore(os.path.join(tmp, 'signals.db'), legacy_file=legacy_file)
+
+
+def test_signals_and_outcomes_round_trip():
+    print("🔍 Testing signal store...")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = make_store(tmp)
+        first = store.add_signal({'symbol': 'BTCUSD', 'side': 'buy', 'entry_price': 100.0, 'stop_loss': 90.0,
+                                  'take_profit': 120.0, 'timeframe': 'M5', 'timestamp': '2025-01-01T00:00:00',
+                                  'status': 'active'})
+        second = store.add_signal({'symbol': 'XAUUSD', 'side': 'sell', 'entry_price': 2000.0,
+                                   'timestamp': '2025-01-02T00:00:00', 'status': 'active'})
+        assert (first, second) == (1, 2)
+        assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+        assert store.record_outcome(first, 'tp_hit', 120.0, 20.0, 30, '2025-01-01T00:30:00')
+        assert not store.record_outcome(first, 'sl_hit', 90.0, -10.0, 40, '2025-01-01T00:40:00')
+        signal = store.get_signal(first)
+        assert signal['status'] == 'closed' and signal['outcome'] == 'tp_hit' and signal['pnl_pips'] == 20.0
+
+        assert [s['id'] for s in store.signals(status='active')] == [second]
+        assert [s['id'] for s in store.signals(symbol='BTCUSD', status='closed')] == [first]
+        assert [s['id'] for s in store.signals(since='2025-01-01T12:00:00')] == [second]
+        assert store.count() == 2 and store.count('closed') == 1
+        assert store.pnl_totals() == (20.0, 0.0)
+        assert store.find_active('XAUUSD', 2000.05, 0.1) == second
+        store.close()
+    print("✅ Signal store OK")
+
+
+def test_legacy_json_is_imported_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = [{'id': 5, 'symbol': 'BTCUSD', 'side': 'buy', 'entry_price': 100.0, 'timestamp': '2025-01-01T00:00:00',
+                   'status': 'closed', 'outcome': 'sl_hit', 'exit_price': 95.0, 'pnl_pips': -5.0},
+                  {'id': 6, 'symbol': 'BTCUSD', 'side': 'sell', 'entry_price': 101.0, 'timestamp': '2025-01-01T01:00:00',
+                   'status': 'active', 'outcome': None}]
+        store = make_store(tmp, legacy)
+        assert [s['id'] for s in store.signals()] == [5, 6]
+        assert store.pnl_totals() == (0.0, 5.0)
+        store.close()
+
+        # A non-empty database never re-imports
+        reopened = make_store(tmp, legacy + [dict(legacy[1], id=7)])
+        assert reopened.count() == 2
+        reopened.close()
+    print("✅ Legacy import OK")
+
+
+def test_analytics_api_on_store():
+    """AdvancedSignalAnalytics keeps its API while writing through the store"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            analytics = AdvancedSignalAnalytics(store=make_store(tmp))
+            signal_id = analytics.add_signal('EURUSD', 'buy', 1.1000, 1.0990, [1.1020, 1.1040], 'M5')
+            assert analytics.get_signal_by_entry_price('EURUSD', 1.1000) == signal_id
+            closed = analytics.update_signal_outcome(signal_id, 'tp_hit', 1.1020)
+            assert closed['pnl_pips'] == 20.0 and closed['status'] == 'closed'
+            assert analytics.update_signal_outcome(signal_id, 'tp_hit', 1.1020) is None
+            assert analytics.stats['win_rate'] == 100.0
+            assert 'Closed Signals: 1' in analytics.get_performance_report()
+            assert not os.path.exists('advanced_signals.json')
+            analytics.store.close()
+        finally:
+            os.chdir(cwd)
+    print("✅ Analytics on signal store OK")
+
+
+if __name__ == "__main__":
+    test_signals_and_outcomes_round_trip()
+    test_legacy_json_is_imported_once()
+    test_analytics_api_on_store()
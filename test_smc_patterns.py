@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test for the vectorized SMC pattern scans
+"""
+
+import numpy as np
+import pandas as pd
+
+from smc_utils import (detect_fvg, detect_smt_es, find_equilibrium_zones, find_fvgs,
+                       find_liquidity_sweeps)
+
+
+def make_frame(bars=400, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 0.3, bars).cumsum()
+    return pd.DataFrame({'open': close, 'high': close + rng.random(bars) * 0.4,
+                         'low': close - rng.random(bars) * 0.4, 'close': close})
+
+
+def reference_smt_es(df, lookback=10):
+    """The original per-row implementation, used as the oracle"""
+    smt_signal = es_zone = None
+    if len(df) < lookback + 2:
+        return smt_signal, es_zone
+    if df['high'].iloc[-1] > max(df['high'].iloc[-lookback - 2:-2]):
+        smt_signal = 'bullish_sweep'
+    elif df['low'].iloc[-1] < min(df['low'].iloc[-lookback - 2:-2]):
+        smt_signal = 'bearish_sweep'
+    range_high = max(df['high'].iloc[-lookback:])
+    range_low = min(df['low'].iloc[-lookback:])
+    if (range_high - range_low) / df['close'].iloc[-1] < 0.01:
+        es_zone = (range_low, range_high)
+    return smt_signal, es_zone
+
+
+def test_full_history_scans_match_per_bar_checks():
+    """One vectorized pass marks the same bars as the per-row checks at every position"""
+    print("🔍 Testing vectorized SMC scans...")
+    df = make_frame()
+    sweep_index, sweep_direction = find_liquidity_sweeps(df)
+    sweeps = dict(zip(sweep_index.tolist(), sweep_direction.tolist()))
+    zone_index, zone_low, zone_high = find_equilibrium_zones(df)
+    zones = {i: (lo, hi) for i, lo, hi in zip(zone_index.tolist(), zone_low, zone_high)}
+    assert sweeps and zones
+
+    for end in range(1, len(df) + 1):
+        smt, es = reference_smt_es(df.iloc[:end])
+        expected = {'bullish_sweep': 1, 'bearish_sweep': -1}.get(smt)
+        assert sweeps.get(end - 1) == expected
+        assert zones.get(end - 1) == (es if end >= 12 else None)
+        assert detect_smt_es(df.iloc[:end]) == (smt, es)
+    print("✅ Sweeps and equilibrium zones OK")
+
+
+def test_fvgs():
+    df = make_frame()
+    index, price, direction = find_fvgs(df)
+    high, low = df['high'].values, df['low'].values
+    for i, p, d in zip(index, price, direction):
+        if d > 0:
+            assert high[i] > low[i - 1] and low[i + 1] > high[i] and p == high[i]
+        else:
+            assert low[i] < high[i - 1] and high[i + 1] < low[i] and p == low[i]
+    assert len(index) and np.all(np.diff(index) >= 0)
+
+    # The legacy wrapper reports the gaps of the last `lookback` candles only
+    recent = detect_fvg(df, lookback=50)
+    assert [s['index'] for s in recent] == [i for i in index.tolist() if i >= len(df) - 50]
+    assert find_fvgs(df.head(2))[0].size == 0
+    print("✅ Fair value gaps OK")
+
+
+if __name__ == "__main__":
+    test_full_history_scans_match_per_bar_checks()
+    test_fvgs()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test for the latency-aware data source router
+"""
+
+import time
+
+from source_router import SourceRouter, OPEN, CLOSED
+
+
+class FakeSource:
+    def __init__(self, name, delay=0.0, healthy=True):
+        self.name = name
+        self.delay = delay
+        self.healthy = healthy
+        self.calls = 0
+
+    def __call__(self, symbol, timeframe, count):
+        self.calls += 1
+        time.sleep(self.delay)
+        if not self.healthy:
+            raise ConnectionError(f"{self.name} down")
+        return {'symbol': symbol, 'price': 1.0, 'source': self.name}
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_failing_source_is_skipped_then_recovers():
+    """After repeated failures a source is bypassed until a background probe succeeds"""
+    print("🔍 Testing source router circuit breaker...")
+    router = SourceRouter(failure_threshold=2, open_seconds=0.05)
+    broken = FakeSource('broken', healthy=False)
+    backup = FakeSource('backup')
+    router.register('broken', broken)
+    router.register('backup', backup)
+
+    for _ in range(2):
+        data, source = router.fetch('BTCUSD', 'M5', 100)
+        assert source == 'backup'
+    assert router.get_stats()['broken']['state'] == OPEN
+
+    # While open, requests never touch the broken source
+    router.fetch('BTCUSD', 'M5', 100)
+    assert broken.calls == 2
+
+    broken.healthy = True
+    time.sleep(0.06)
+    router.fetch('BTCUSD', 'M5', 100)  # schedules the half-open probe
+    assert wait_for(lambda: router.get_stats()['broken']['state'] == CLOSED)
+    assert broken.calls == 3
+    print("✅ Circuit breaker OK")
+
+
+def test_fastest_healthy_source_first():
+    """Once latencies are known, the fastest source is tried first"""
+    router = SourceRouter()
+    slow = FakeSource('slow', delay=0.03)
+    fast = FakeSource('fast')
+    gold_only = FakeSource('gold_only')
+    router.register('slow', slow)
+    router.register('fast', fast)
+    router.register('gold_only', gold_only, supports=lambda symbol: symbol == 'XAUUSD')
+
+    # Unmeasured sources are sampled first, in registration order
+    assert router.fetch('BTCUSD', 'M5', 100)[1] == 'slow'
+    assert router.fetch('BTCUSD', 'M5', 100)[1] == 'fast'
+    assert router.fetch('BTCUSD', 'M5', 100)[1] == 'fast'
+    assert gold_only.calls == 0
+    assert router.get_stats()['slow']['avg_latency_ms'] > router.get_stats()['fast']['avg_latency_ms']
+    print("✅ Latency routing OK")
+
+
+if __name__ == "__main__":
+    test_failing_source_is_skipped_then_recovers()
+    test_fastest_healthy_source_first()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test for the O(1) streaming indicators
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from feature_engine import FeatureEngine, StreamingFeatures, compute_features
+from streaming_indicators import ATR, EMA, RollingMax, RollingMin, WilderRSI
+
+
+def make_frame(bars=300, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, bars).cumsum()
+    return pd.DataFrame({
+        'open_time': np.arange(bars) * 60_000, 'open': close,
+        'high': close + rng.random(bars), 'low': close - rng.random(bars), 'close': close
+    })
+
+
+def test_rolling_extremes_and_ema_match_pandas():
+    """Values agree with pandas at every bar, including after in-progress revisions"""
+    print("🔍 Testing streaming indicators...")
+    df = make_frame()
+    high_max, low_min, ema = RollingMax(20), RollingMin(20), EMA(12)
+    expected_max = df['high'].rolling(20).max().values
+    expected_min = df['low'].rolling(20).min().values
+    expected_ema = df['close'].ewm(span=12, adjust=False).mean().values
+
+    for i, row in enumerate(df.itertuples()):
+        # A provisional tick first, then the final values for the same bar
+        high_max.update(row.open_time, row.high + 50)
+        high_max.update(row.open_time, row.high)
+        low_min.update(row.open_time, row.low)
+        ema.update(row.open_time, row.close - 3)
+        ema.update(row.open_time, row.close)
+        if i >= 19:
+            assert high_max.value == expected_max[i]
+            assert low_min.value == expected_min[i]
+        assert np.isclose(ema.value, expected_ema[i])
+    print("✅ Rolling min/max and EMA OK")
+
+
+def test_wilder_rsi_and_atr():
+    rsi, atr = WilderRSI(14), ATR(14)
+    for t in range(30):
+        rsi.update(t, 100.0 + t)  # only gains
+        atr.update(t, 101.0 + t, 99.0 + t, 100.0 + t)
+    assert rsi.value == 100.0
+    assert np.isclose(atr.value, 2.0)
+    assert np.isnan(WilderRSI(14).update(0, 100.0))
+
+    try:
+        atr.update(5, 1.0, 1.0, 1.0)
+        assert False, "older bars must be rejected"
+    except ValueError:
+        pass
+    print("✅ Wilder RSI and ATR OK")
+
+
+def test_streaming_features_match_batch_and_survive_restart(tmp_path):
+    """Incremental engine output equals the full recomputation, across a save/load"""
+    df = make_frame()
+    stream = StreamingFeatures()
+    for row in df.itertuples():
+        stream.update(row.open_time, row.high, row.low, row.close)
+    streamed, batch = stream.features(), compute_features(df)
+    for name, value in batch.items():
+        assert np.isclose(streamed[name], value), name
+
+    engine = FeatureEngine()
+    engine.get_features('BTCUSD', 'M5', df.head(200))
+    path = str(tmp_path / 'indicator_state.json')
+    engine.save_state(path)
+    json.load(open(path))
+
+    restarted = FeatureEngine()
+    assert restarted.load_state(path)
+    features = restarted.get_features('BTCUSD', 'M5', df.tail(150))
+    assert restarted.stats['incremental'] == 1 and restarted.stats['rebuilt'] == 0
+    for name, value in batch.items():
+        assert np.isclose(features[name], value), name
+    print("✅ Streaming features and restart OK")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+    test_rolling_extremes_and_ema_match_pandas()
+    test_wilder_rsi_and_atr()
+    test_streaming_features_match_batch_and_survive_restart(pathlib.Path(tempfile.mkdtemp()))
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test for the multi-timeframe resampler
+Derived M5/M15 bars must match bars built directly from the M1 series
+"""
+
+import numpy as np
+import pandas as pd
+
+from timeframe_resampler import TimeframeResampler, resample_bars
+
+MINUTE_MS = 60_000
+
+
+def make_m1(count, start_minute=0):
+    rng = np.random.default_rng(7)
+    closes = 100 + np.cumsum(rng.normal(0, 0.5, count))
+    open_times = (np.arange(count) + start_minute) * MINUTE_MS
+    return pd.DataFrame({
+        'open_time': open_times,
+        'open': closes - 0.1, 'high': closes + 0.5, 'low': closes - 0.5,
+        'close': closes, 'volume': np.ones(count)
+    })
+
+
+def test_resample_matches_manual_aggregation():
+    """OHLCV aggregation and epoch alignment"""
+    print("🔍 Testing M1 -> M5 resampling...")
+    base = make_m1(62, start_minute=3)  # starts mid-bucket
+    m5 = resample_bars(base, 5)
+
+    # Partial leading bucket (minutes 3-4) is dropped
+    assert m5['open_time'].iloc[0] == 5 * MINUTE_MS
+    first = base[(base['open_time'] >= 5 * MINUTE_MS) & (base['open_time'] < 10 * MINUTE_MS)]
+    assert m5['open'].iloc[0] == first['open'].iloc[0]
+    assert m5['high'].iloc[0] == first['high'].max()
+    assert m5['low'].iloc[0] == first['low'].min()
+    assert m5['close'].iloc[0] == first['close'].iloc[-1]
+    assert m5['volume'].iloc[0] == 5
+    # Last bucket is the in-progress bar (minutes 60-64)
+    assert m5['open_time'].iloc[-1] == 60 * MINUTE_MS
+    print("✅ Resampling OK")
+
+
+def test_one_base_fetch_serves_all_timeframes():
+    """Only the M1 stream is fetched while history suffices"""
+    base = make_m1(3000)
+    calls = []
+
+    def fetcher(symbol, tf_minutes, bars, start_time=None, end_time=None):
+        calls.append(tf_minutes)
+        df = base
+        if end_time is not None:
+            df = df[df['open_time'] <= end_time]
+        return df.tail(bars).reset_index(drop=True)
+
+    resampler = TimeframeResampler(fetcher, base_bars=3000, min_bars=60)
+    assert resampler.refresh('BTCUSD')
+    for tf in (3, 5, 15):
+        bars = resampler.get_bars('BTCUSD', tf, 100)
+        assert bars is not None and len(bars) >= 60
+    assert set(calls) == {1}
+
+    # H4 needs more history than the base holds - fetched natively
+    resampler.get_bars('BTCUSD', 240, 100)
+    assert calls[-1] == 240
+    print("✅ Single-stream derivation OK")
+
+
+if __name__ == "__main__":
+    test_resample_matches_manual_aggregation()
+    test_one_base_fetch_serves_all_timeframes()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test for the batched TP/SL ladder calculator
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config import RR_MULTIPLIERS, SYMBOL_SETTINGS
+from smc_utils import calculate_realistic_tp_sl, calculate_tp_sl_batch
+
+
+def reference_tp_sl(symbol, entry, side, atr, timeframe):
+    """The original per-signal arithmetic"""
+    config = SYMBOL_SETTINGS.get(symbol, {'max_sl_distance': 100, 'atr_multiplier_sl': 1.0})
+    tf_factor = {'M3': 1, 'M5': 2, 'M15': 3, 'M30': 4, 'H1': 5, 'H4': 6}.get(timeframe, 1)
+    scale = 0.8 + 0.2 * tf_factor
+    point_value = 1.0 if symbol in ['BTCUSD', 'ETHUSD'] else 0.01
+    max_distance = config['max_sl_distance'] * point_value * scale
+    if side == 'buy':
+        sl = max(entry - atr * config['atr_multiplier_sl'] * scale, entry - max_distance)
+    else:
+        sl = min(entry + atr * config['atr_multiplier_sl'] * scale, entry + max_distance)
+    risk = abs(entry - sl)
+    sign = 1 if side == 'buy' else -1
+    rr = RR_MULTIPLIERS.get(symbol, 1.5)
+    return sl, [entry + sign * risk * rr * m * scale for m in [1, 1.5, 2, 2.5, 3]]
+
+
+def test_batch_matches_per_signal_math():
+    print("🔍 Testing batch TP/SL...")
+    rng = np.random.default_rng(7)
+    n = 5000
+    symbols = rng.choice(['BTCUSD', 'XAUUSD', 'EURUSD', 'US30'], n)
+    timeframes = rng.choice(['M3', 'M5', 'M15', 'H1', 'D1'], n)
+    sides = rng.choice(['buy', 'sell'], n)
+    entries = rng.uniform(1000, 100000, n)
+    atrs = rng.uniform(0.1, 500, n)
+
+    sl, tp_levels = calculate_tp_sl_batch(entries, sides, atrs, symbols, timeframes)
+    assert sl.shape == (n,) and tp_levels.shape == (n, 5)
+    for i in range(0, n, 37):
+        ref_sl, ref_tps = reference_tp_sl(symbols[i], entries[i], sides[i], atrs[i], timeframes[i])
+        assert np.isclose(sl[i], ref_sl, atol=1e-5)
+        assert np.allclose(tp_levels[i], ref_tps, atol=1e-5)
+    print("✅ Batch ladders OK")
+
+
+def test_single_signal_takes_explicit_timeframe():
+    """The timeframe is an argument, so calls from worker threads price correctly"""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        m3, h1 = pool.map(lambda tf: calculate_realistic_tp_sl('XAUUSD', 2000.0, 'buy', 5.0, tf), ['M3', 'H1'])
+    assert len(m3['tp_levels']) == 5
+    assert h1['sl'] < m3['sl'] < 2000.0
+    assert h1['tp_levels'][0] > m3['tp_levels'][0]
+    assert calculate_realistic_tp_sl('XAUUSD', 2000.0, 'buy', 5.0) == m3
+    print("✅ Explicit timeframe OK")
+
+
+if __name__ == "__main__":
+    test_batch_matches_per_signal_math()
+    test_single_signal_takes_explicit_timeframe()
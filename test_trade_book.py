@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test for the compact open-trade book
+"""
+
+import json
+
+from level_index import LevelIndex
+from risk_manager import validate_trade_risk
+from trade_book import TradeBook
+
+
+def make_signal(i=0, symbol='BTCUSD', side='buy'):
+    return {'symbol': symbol, 'side': side, 'entry': 100.0 + i, 'sl': 95.0 + i,
+            'tp': [105.0 + i, 110.0 + i, 115.0 + i, 120.0 + i, 125.0 + i], 'tf': 'M5',
+            'position_size': 0.02, 'confidence': 0.9,
+            'session_analysis': {'action': 'TRADE', 'notes': ['x'] * 50},
+            'correlation_advice': {'advice': 'PROCEED', 'adjustments': {}}}
+
+
+def test_records_read_like_signal_dicts(tmp_path):
+    print("🔍 Testing trade book...")
+    book = TradeBook(archive_path=str(tmp_path / 'archive.jsonl'))
+    trade = book.open(make_signal())
+    assert trade['symbol'] == 'BTCUSD' and trade['tp'][0] == 105.0
+    assert trade.get('status') == 'open' and trade.get('position_size') == 0.02
+    assert trade['session_analysis']['action'] == 'TRADE'  # cold metadata
+    assert 'analytics_id' not in trade
+    trade['analytics_id'] = 7
+    assert 'analytics_id' in trade and trade.copy()['confidence'] == 0.9
+
+    # Risk and correlation code iterate the book like the old list
+    ok, _ = validate_trade_risk(make_signal(1, 'XAUUSD'), 10000, book)
+    assert ok in (True, False)
+    assert len(book) == 1 and [t['symbol'] for t in book] == ['BTCUSD']
+
+    index = LevelIndex()
+    index.add(trade)
+    hits = index.update('BTCUSD', 106.0)
+    assert hits == [(trade, 'tp1_hit')]
+    archived = book.close(trade, 'tp1_hit', 106.0)
+    assert archived['status'] == 'tp1_hit' and archived['analytics_id'] == 7
+    assert len(book) == 0 and not book.cold
+
+    # Reads on the finished record don't bring its cold storage back
+    assert trade.get('session_analysis') is None and 'confidence' not in trade
+    assert trade.copy()['status'] == 'tp1_hit'
+    assert not book.cold
+
+    line = json.loads(open(tmp_path / 'archive.jsonl').read().splitlines()[0])
+    assert line['exit_price'] == 106.0 and line['session_analysis']['action'] == 'TRADE'
+    print("✅ Trade records OK")
+
+
+def test_memory_stays_flat_as_trades_finish(tmp_path):
+    book = TradeBook(archive_path=None)
+    for i in range(5000):
+        book.open(make_signal(i % 10))
+        if i >= 5:
+            oldest = next(iter(book))
+            book.close(oldest, 'sl_hit', oldest['sl'])
+    assert len(book) == 5 and len(book.cold) == 5
+    assert book.get_stats() == {'opened': 5000, 'archived': 4995, 'open': 5}
+    print("✅ Finished trades evicted")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+    test_records_read_like_signal_dicts(pathlib.Path(tempfile.mkdtemp()))
+    test_memory_stays_flat_as_trades_finish(None)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Multi-Timeframe Resampler
+Keeps one base M1 kline stream per symbol and derives every other timeframe
+locally, so a symbol costs one fetch per loop instead of one per timeframe
+"""
+
+import logging
+import threading
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from bar_cache import BarCache
+
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60_000
+
+
+def resample_bars(base: pd.DataFrame, tf_minutes: int, base_tf_minutes: int = 1) -> pd.DataFrame:
+    """Aggregate base klines into tf_minutes bars aligned to UTC epoch boundaries
+    (the same alignment Binance uses). A leading bucket that does not start on
+    its boundary is dropped because its open/high/low would be incomplete."""
+    bucket_ms = tf_minutes * MINUTE_MS
+    open_times = base['open_time'].to_numpy(dtype=np.int64)
+    buckets = open_times - (open_times % bucket_ms)
+
+    grouped = pd.DataFrame({
+        'bucket': buckets,
+        'open': base['open'].to_numpy(dtype=float),
+        'high': base['high'].to_numpy(dtype=float),
+        'low': base['low'].to_numpy(dtype=float),
+        'close': base['close'].to_numpy(dtype=float),
+        'volume': base['volume'].to_numpy(dtype=float)
+    }).groupby('bucket', sort=True).agg(
+        open=('open', 'first'), high=('high', 'max'), low=('low', 'min'),
+        close=('close', 'last'), volume=('volume', 'sum')
+    )
+
+    if len(grouped) and open_times[0] != buckets[0]:
+        grouped = grouped.iloc[1:]
+
+    df = grouped.reset_index().rename(columns={'bucket': 'open_time'})
+    df['close_time'] = df['open_time'] + bucket_ms - 1
+    return df
+
+
+class TimeframeResampler:
+    def __init__(self, fetcher, base_tf_minutes: int = 1, base_bars: int = 5000,
+                 max_base_bars: int = 20160, min_bars: int = 60, store=None):
+        """base_bars is the history seeded on the first refresh; the base stream then
+        keeps growing up to max_base_bars so higher timeframes become derivable over
+        time. A timeframe is derived only once at least min_bars of it are available,
+        otherwise it is fetched natively through its own bar cache.
+        store is an optional BarStore shared by both caches for warm starts."""
+        self.base_tf_minutes = base_tf_minutes
+        self.base_bars = base_bars
+        self.min_bars = min_bars
+        self.base_cache = BarCache(fetcher, max_bars=max_base_bars, store=store)
+        self.native_cache = BarCache(fetcher, store=store)
+        self.lock = threading.Lock()
+        self.snapshots: Dict[str, pd.DataFrame] = {}
+        self.stats = {'derived': 0, 'native': 0}
+
+    def refresh(self, symbol: str) -> bool:
+        """Pull new base bars once; every timeframe derived afterwards sees the same snapshot"""
+        base = self.base_cache.get_bars(symbol, self.base_tf_minutes, self.base_bars)
+        if base is None or len(base) == 0:
+            return False
+        history = self.base_cache.get_history(symbol, self.base_tf_minutes)
+        with self.lock:
+            self.snapshots[symbol] = history
+        return True
+
+    def can_derive(self, symbol: str, tf_minutes: int) -> bool:
+        """True when the base snapshot holds at least min_bars of this timeframe"""
+        if tf_minutes % self.base_tf_minutes != 0:
+            return False
+        with self.lock:
+            snapshot = self.snapshots.get(symbol)
+        if snapshot is None:
+            return False
+        return len(snapshot) * self.base_tf_minutes >= tf_minutes * (self.min_bars + 1)
+
+    def get_bars(self, symbol: str, tf_minutes: int, bars: int) -> Optional[pd.DataFrame]:
+        """Latest `bars` bars of tf_minutes, derived from the base stream when possible"""
+        if not self.can_derive(symbol, tf_minutes):
+            self.stats['native'] += 1
+            return self.native_cache.get_bars(symbol, tf_minutes, bars)
+
+        with self.lock:
+            snapshot = self.snapshots[symbol]
+        self.stats['derived'] += 1
+        if tf_minutes == self.base_tf_minutes:
+            return snapshot.tail(bars).reset_index(drop=True)
+        return resample_bars(snapshot, tf_minutes, self.base_tf_minutes).tail(bars).reset_index(drop=True)
+
+    def get_base_bars(self, symbol: str) -> Optional[pd.DataFrame]:
+        """The base stream as of the last refresh, without fetching"""
+        with self.lock:
+            return self.snapshots.get(symbol)
+
+    def get_stats(self) -> Dict:
+        """Derived vs native fetch counters"""
+        return dict(self.stats, base_symbols=len(self.snapshots))
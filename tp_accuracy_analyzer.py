@@ -3,27 +3,27 @@ Take Profit (TP) Accuracy & Probability Analysis Tool
 Analyzes the accuracy, probability, and performance of TP levels
 """
 
-import json
 import pandas as pd
 from datetime import datetime, timedelta
 import statistics
 from typing import Dict, List, Tuple
 import math
 
+from signal_store import signal_store
+
 class TPAccuracyAnalyzer:
-    def __init__(self):
-        self.signals_file = "advanced_signals.json"
+    def __init__(self, store=None):
+        self.store = store or signal_store
         self.load_signals()
     
     def load_signals(self):
-        """Load signal data from JSON file"""
+        """Load signal data from the signal store"""
         try:
-            with open(self.signals_file, 'r') as f:
-                self.signals = json.load(f)
-            print(f"✅ Loaded {len(self.signals)} signals for analysis")
-        except FileNotFoundError:
-            print("⚠️ No signals file found - starting with empty data")
-            self.signals = []
+            self.signals = self.store.signals()
+            if self.signals:
+                print(f"✅ Loaded {len(self.signals)} signals for analysis")
+            else:
+                print("⚠️ No signals stored - starting with empty data")
         except Exception as e:
             print(f"❌ Error loading signals: {e}")
             self.signals = []
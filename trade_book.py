@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Open-Trade Book
+Compact open-trade storage: hot fields live in __slots__ records, bulky signal
+metadata (session, correlation, probability analysis) in a side table, and
+finished trades are evicted to an on-disk archive so memory stays flat over
+long uptimes
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRADE_ARCHIVE_FILE = os.getenv('TRADE_ARCHIVE_FILE', 'trade_archive.jsonl')
+
+
+class TradeRecord:
+    """Hot fields of one trade. Reads and writes like the signal dict it came
+    from; keys that aren't hot fields go to the book's cold metadata table."""
+
+    HOT_FIELDS = ('symbol', 'side', 'entry', 'sl', 'tp', 'status', 'position_size',
+                  'tf', 'analytics_id', 'opened_at', 'exit_price', 'exit_time')
+    __slots__ = HOT_FIELDS + ('trade_id', 'book')
+
+    def __init__(self, trade_id: int, book: 'TradeBook', signal: Dict):
+        self.trade_id = trade_id
+        self.book = book
+        self.symbol = sys.intern(signal['symbol'])
+        self.side = sys.intern(signal['side'])
+        self.entry = float(signal['entry'])
+        self.sl = float(signal['sl'])
+        tp = signal.get('tp')
+        self.tp = tuple(float(p) for p in (tp if isinstance(tp, (list, tuple)) else [tp]) if p is not None)
+        self.status = signal.get('status', 'open')
+        self.position_size = signal.get('position_size', 0.01)
+        self.tf = signal.get('tf')
+        self.analytics_id = signal.get('analytics_id')
+        self.opened_at = signal.get('generated_at') or datetime.now()
+        self.exit_price = None
+        self.exit_time = None
+
+    def __getitem__(self, key):
+        if key in self.HOT_FIELDS:
+            if key == 'tp':
+                return list(self.tp)
+            value = getattr(self, key)
+            if value is None and key in ('analytics_id', 'exit_price', 'exit_time'):
+                raise KeyError(key)
+            return value
+        return self.book.metadata(self.trade_id)[key]
+
+    def __setitem__(self, key, value):
+        if key in self.HOT_FIELDS:
+            setattr(self, key, tuple(value) if key == 'tp' else value)
+        else:
+            self.book.metadata(self.trade_id)[key] = value
+
+    def __contains__(self, key) -> bool:
+        try:
+            self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def copy(self) -> Dict:
+        """Full signal dict: hot fields plus cold metadata while the trade is open"""
+        try:
+            data = dict(self.book.metadata(self.trade_id))
+        except KeyError:
+            data = {}
+        for field in self.HOT_FIELDS:
+            value = getattr(self, field)
+            if value is not None or field not in ('analytics_id', 'exit_price', 'exit_time'):
+                data[field] = list(value) if field == 'tp' else value
+        return data
+
+
+class TradeBook:
+    def __init__(self, archive_path: Optional[str] = TRADE_ARCHIVE_FILE):
+        self.records: Dict[int, TradeRecord] = {}
+        self.cold: Dict[int, Dict] = {}
+        self.archive_path = archive_path
+        self.next_id = 0
+        self.lock = threading.RLock()
+        self.stats = {'opened': 0, 'archived': 0}
+
+    def open(self, signal: Dict) -> TradeRecord:
+        """Add a sent signal as an open trade; the signal's other fields become
+        cold metadata"""
+        with self.lock:
+            trade_id = self.next_id
+            self.next_id += 1
+            record = TradeRecord(trade_id, self, signal)
+            self.records[trade_id] = record
+            self.cold[trade_id] = {k: v for k, v in signal.items() if k not in TradeRecord.HOT_FIELDS}
+            self.stats['opened'] += 1
+        return record
+
+    def metadata(self, trade_id: int) -> Dict:
+        """Cold fields of an open trade; KeyError once it is closed and archived,
+        so lookups on finished trades don't bring evicted storage back"""
+        cold = self.cold.get(trade_id)
+        if cold is None:
+            raise KeyError(f"trade {trade_id} is not open")
+        return cold
+
+    def close(self, record: TradeRecord, status: str, exit_price: float) -> Dict:
+        """Mark a trade finished and evict it to the archive; returns the full
+        trade dict"""
+        record.status = status
+        record.exit_price = exit_price
+        record.exit_time = datetime.now()
+        trade = record.copy()
+        with self.lock:
+            self.records.pop(record.trade_id, None)
+            self.cold.pop(record.trade_id, None)
+            self.stats['archived'] += 1
+        self._archive(trade)
+        return trade
+
+    def _archive(self, trade: Dict):
+        if not self.archive_path:
+            return
+        try:
+            with open(self.archive_path, 'a') as f:
+                f.write(json.dumps(trade, default=str) + '\n')
+        except Exception as e:
+            logger.warning(f"Could not archive trade {trade.get('symbol')}: {e}")
+
+    def __iter__(self) -> Iterator[TradeRecord]:
+        with self.lock:
+            return iter(list(self.records.values()))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def for_symbol(self, symbol: str) -> List[TradeRecord]:
+        return [record for record in self if record.symbol == symbol]
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            return dict(self.stats, open=len(self.records))